@@ -1,13 +1,113 @@
 #!/usr/bin/env python3
-import json
+"""
+Add example responses to every request in a Postman collection.
+
+The command line updates collection files in place, several at once across
+worker processes when given more than one file or a directory. Other tools
+can use it as a library on collections already in memory:
+
+    from add_postman_responses import enrich_collection
+    enriched = enrich_collection(collection)
+
+enrich_collection() never touches disk and leaves its argument unmodified.
+Importing this module is cheap: json, hashlib, argparse and the file helpers
+are imported the first time they are needed, and the rule index is built on
+the first lookup.
+"""
+import os
 import sys
+from functools import lru_cache
+
+DEFAULT_COLLECTION = 'ACE_API_Postman_Collection.json'
+
+# Existing bodies remembered by ExampleStyle.minify_text(); repeats are common
+# (many items share a generated body), distinct ones are not worth keeping
+MINIFIED_CACHE_SIZE = 256
+
+class ExampleStyle:
+    """How generated examples are written.
+
+    compact leaves out originalRequest when it is the item's own request
+    (the field is optional in the v2.1 schema), and minify writes bodies
+    without indentation. Each rule body is serialized once per style and the
+    text is shared by every example that uses it.
+
+    restyle() applies the same options to examples already in a collection.
+    """
+
+    def __init__(self, compact=False, minify=False):
+        self.compact = compact
+        self.minify = minify
+        self.bodies = {}
+        self.minified = {}
 
-# Read the Postman collection
-with open('ACE_API_Postman_Collection.json', 'r') as f:
-    collection = json.load(f)
+    def __reduce__(self):
+        # Workers get the options, not the body texts of the parent
+        return ExampleStyle, (self.compact, self.minify)
+
+    @property
+    def key(self):
+        return ('compact,' if self.compact else '') + ('minify' if self.minify else '')
+
+    def body_text(self, body):
+        entry = self.bodies.get(id(body))
+        if entry is None:
+            import json
+            text = json.dumps(body, separators=(',', ':')) if self.minify else json.dumps(body, indent=2)
+            # Keep body alive so its id is not reused by another object
+            entry = self.bodies[id(body)] = (body, text)
+        return entry[1]
+
+    def minify_text(self, text):
+        """text without indentation if it is a body in the indent=2 layout this script writes, else text"""
+        minified = self.minified.get(text)
+        if minified is None:
+            import json
+            minified = text
+            try:
+                value = json.loads(text)
+            except ValueError:
+                pass
+            else:
+                # Only bodies in exactly the generated layout, so hand-written ones keep their formatting
+                if json.dumps(value, indent=2) == text:
+                    minified = json.dumps(value, separators=(',', ':'))
+            if len(self.minified) >= MINIFIED_CACHE_SIZE:
+                # Bounded so a streamed collection's memory does not grow with its distinct bodies
+                self.minified.clear()
+            self.minified[text] = minified
+        return minified
+
+    def restyle(self, item):
+        """Apply compact and minify to the examples already on item; returns True if any changed.
+
+        The examples are replaced, never modified, so they may be shared with another collection.
+        """
+        if not (self.compact or self.minify) or not item.get('response'):
+            return False
+        changed = False
+        responses = []
+        for response in item['response']:
+            if isinstance(response, dict):
+                restyled = response
+                if self.compact and response.get('originalRequest') == item['request']:
+                    restyled = {key: value for key, value in response.items() if key != 'originalRequest'}
+                body = response.get('body')
+                minified = self.minify_text(body) if self.minify and isinstance(body, str) else body
+                if minified != body:
+                    restyled = dict(restyled, body=minified)
+                changed |= restyled is not response
+                response = restyled
+            responses.append(response)
+        if changed:
+            item['response'] = responses
+        return changed
+
+DEFAULT_STYLE = ExampleStyle()
 
 # Function to add response examples to a request
-def add_response_to_request(item, parent_name=""):
+def add_response_to_request(item, parent_name="", style=None):
+    style = style or DEFAULT_STYLE
     if 'request' in item:
         request = item['request']
         method = request.get('method', 'GET')
@@ -21,9 +121,10 @@ def add_response_to_request(item, parent_name=""):
         response_body = create_response_for_endpoint(name, method, parent_name)
 
         if response_body:
-            item['response'] = [{
-                "name": f"Example Response - {name}",
-                "originalRequest": request.copy(),
+            example = {"name": f"Example Response - {name}"}
+            if not style.compact:
+                example["originalRequest"] = request.copy()
+            example.update({
                 "status": "OK",
                 "code": 200 if method != 'POST' or 'register' in name.lower() or 'create' in name.lower() else 200,
                 "_postman_previewlanguage": "json",
@@ -32,8 +133,9 @@ def add_response_to_request(item, parent_name=""):
                     "value": "application/json"
                 }],
                 "cookie": [],
-                "body": json.dumps(response_body, indent=2)
-            }]
+                "body": style.body_text(response_body)
+            })
+            item['response'] = [example]
 
             # Adjust status code for specific endpoints
             if method == 'POST' and ('register' in name.lower() or 'create' in name.lower()):
@@ -43,568 +145,1387 @@ def add_response_to_request(item, parent_name=""):
                 item['response'][0]['code'] = 200
                 item['response'][0]['status'] = "OK"
 
-def create_response_for_endpoint(name, method, parent_name):
-    """Create appropriate response body based on endpoint name and method"""
+def _when(name=(), parent=(), method=None, not_name=(), name_is=None):
+    """Describe one conjunction of conditions a rule needs to match"""
+    return {
+        'name': tuple(name),
+        'parent': tuple(parent),
+        'method': tuple(method) if method else None,
+        'not_name': tuple(not_name),
+        'name_is': name_is,
+    }
+
+def _combine(guard, when):
+    """AND a section guard with a rule condition"""
+    methods = guard['method']
+    if when['method']:
+        methods = tuple(m for m in when['method'] if not methods or m in methods)
+    return {
+        'name': guard['name'] + when['name'],
+        'parent': guard['parent'] + when['parent'],
+        'method': methods,
+        'not_name': guard['not_name'] + when['not_name'],
+        'name_is': when['name_is'] or guard['name_is'],
+    }
+
+def _alternatives(when):
+    return when if isinstance(when, list) else [when]
 
-    name_lower = name.lower()
-    parent_lower = parent_name.lower()
+def _section(guard, rules):
+    """Apply a guard (or list of alternative guards) to a block of rules"""
+    return [
+        ([_combine(g, w) for g in _alternatives(guard) for w in _alternatives(when)], body)
+        for when, body in rules
+    ]
 
+# Declarative response rules. Each entry is (conditions, body) where the
+# conditions are a _when() or a list of alternative _when()s. Name and parent
+# conditions are lowercase substrings of the item name and of its full folder
+# path (e.g. 'admin/users'); the first matching rule wins.
+RESPONSE_RULES = [
     # Authentication endpoints
-    if 'reset password' in name_lower:
-        return {"message": "Password has been reset successfully"}
-    elif 'send otp' in name_lower or 'verify otp' in name_lower:
-        if 'send' in name_lower:
-            return {"message": "OTP sent successfully to your email"}
-        else:
-            return {"message": "OTP verified successfully", "verified": True}
+    (_when(name=['reset password']), {"message": "Password has been reset successfully"}),
+    ([_when(name=['send otp']), _when(name=['verify otp', 'send'])],
+     {"message": "OTP sent successfully to your email"}),
+    (_when(name=['verify otp']), {"message": "OTP verified successfully", "verified": True}),
 
     # Notification endpoints
-    if 'notification' in parent_lower:
-        if 'get all' in name_lower or 'notification' == name_lower:
-            return {
-                "data": [
-                    {
-                        "id": "1",
-                        "type": "info",
-                        "data": {"message": "New course available", "course_id": 5},
-                        "read_at": None,
-                        "created_at": "2025-12-17T10:00:00.000000Z"
-                    }
-                ],
-                "total": 1,
-                "unread_count": 1
-            }
-        elif 'unread count' in name_lower:
-            return {"unread_count": 5}
-        elif 'mark' in name_lower:
-            return {"message": "Notification(s) marked as read"}
-        elif method == 'DELETE':
-            return {"message": "Notification(s) deleted successfully"}
+    *_section(_when(parent=['notification']), [
+        ([_when(name=['get all']), _when(name_is='notification')], {
+            "data": [
+                {
+                    "id": "1",
+                    "type": "info",
+                    "data": {"message": "New course available", "course_id": 5},
+                    "read_at": None,
+                    "created_at": "2025-12-17T10:00:00.000000Z"
+                }
+            ],
+            "total": 1,
+            "unread_count": 1
+        }),
+        (_when(name=['unread count']), {"unread_count": 5}),
+        (_when(name=['mark']), {"message": "Notification(s) marked as read"}),
+        (_when(method=['DELETE']), {"message": "Notification(s) deleted successfully"}),
+    ]),
 
     # Dashboard/Stats endpoints
-    if 'dashboard' in name_lower or 'stats' in name_lower or 'analytics' in name_lower:
-        return {
-            "total_users": 1250,
-            "total_courses": 85,
-            "total_enrollments": 3420,
-            "total_revenue": 125000,
-            "recent_registrations": 45,
-            "active_teachers": 28,
-            "pending_approvals": 7
-        }
+    ([_when(name=['dashboard']), _when(name=['stats']), _when(name=['analytics'])], {
+        "total_users": 1250,
+        "total_courses": 85,
+        "total_enrollments": 3420,
+        "total_revenue": 125000,
+        "recent_registrations": 45,
+        "active_teachers": 28,
+        "pending_approvals": 7
+    }),
 
     # User endpoints
-    if 'user' in name_lower and 'admin' in parent_lower:
-        if 'get all' in name_lower:
-            return {
-                "data": [{
-                    "id": 1,
-                    "name": "John Doe",
-                    "email": "john@example.com",
-                    "user_type": "university_student",
-                    "status": "active",
-                    "created_at": "2025-12-17T10:00:00.000000Z"
-                }],
-                "current_page": 1,
-                "total": 100
-            }
-        elif method == 'DELETE':
-            return {"message": "User deleted successfully"}
-        elif 'status' in name_lower or 'suspend' in name_lower or 'activate' in name_lower:
-            return {"message": "User status updated successfully"}
-        elif 'create admin' in name_lower:
-            return {
-                "message": "Admin created successfully",
-                "user": {
-                    "id": 10,
-                    "name": "Admin User",
-                    "email": "admin@example.com",
-                    "user_type": "admin"
-                }
-            }
-        else:
-            return {
+    *_section(_when(name=['user'], parent=['admin']), [
+        (_when(name=['get all']), {
+            "data": [{
                 "id": 1,
                 "name": "John Doe",
                 "email": "john@example.com",
                 "user_type": "university_student",
-                "phone": "+201234567890",
                 "status": "active",
                 "created_at": "2025-12-17T10:00:00.000000Z"
+            }],
+            "current_page": 1,
+            "total": 100
+        }),
+        (_when(method=['DELETE']), {"message": "User deleted successfully"}),
+        ([_when(name=['status']), _when(name=['suspend']), _when(name=['activate'])],
+         {"message": "User status updated successfully"}),
+        (_when(name=['create admin']), {
+            "message": "Admin created successfully",
+            "user": {
+                "id": 10,
+                "name": "Admin User",
+                "email": "admin@example.com",
+                "user_type": "admin"
             }
+        }),
+        (_when(), {
+            "id": 1,
+            "name": "John Doe",
+            "email": "john@example.com",
+            "user_type": "university_student",
+            "phone": "+201234567890",
+            "status": "active",
+            "created_at": "2025-12-17T10:00:00.000000Z"
+        }),
+    ]),
 
     # Teacher endpoints
-    if 'teacher' in parent_lower:
-        if 'pending' in name_lower:
-            return {
-                "data": [{
-                    "id": 1,
-                    "name": "Dr. Jane Smith",
-                    "email": "jane@example.com",
-                    "specialization": "Computer Science",
-                    "status": "pending",
-                    "cv_path": "cvs/teacher_1.pdf",
-                    "created_at": "2025-12-17T10:00:00.000000Z"
-                }]
-            }
-        elif 'approve' in name_lower:
-            return {"message": "Teacher approved successfully"}
-        elif 'reject' in name_lower:
-            return {"message": "Teacher rejected successfully"}
-        elif 'cv' in name_lower and method == 'GET':
-            return {"download_url": "http://localhost:8000/storage/cvs/teacher_1.pdf"}
-        elif 'profile' in name_lower and method == 'GET':
-            return {
+    *_section(_when(parent=['teacher']), [
+        (_when(name=['pending']), {
+            "data": [{
                 "id": 1,
                 "name": "Dr. Jane Smith",
                 "email": "jane@example.com",
-                "phone": "+201234567890",
-                "bio": "Experienced educator",
                 "specialization": "Computer Science",
-                "profile_picture": "profile_pictures/teacher_1.jpg"
-            }
-        elif 'profile' in name_lower and method == 'PUT':
-            return {"message": "Profile updated successfully"}
-        elif 'upload' in name_lower:
-            return {"message": "File uploaded successfully", "file_path": "uploads/file_123.jpg"}
-        elif 'stats' in name_lower:
-            return {
-                "total_courses": 12,
-                "total_students": 340,
-                "total_earnings": 45000,
-                "average_rating": 4.7
-            }
+                "status": "pending",
+                "cv_path": "cvs/teacher_1.pdf",
+                "created_at": "2025-12-17T10:00:00.000000Z"
+            }]
+        }),
+        (_when(name=['approve']), {"message": "Teacher approved successfully"}),
+        (_when(name=['reject']), {"message": "Teacher rejected successfully"}),
+        (_when(name=['cv'], method=['GET']),
+         {"download_url": "http://localhost:8000/storage/cvs/teacher_1.pdf"}),
+        (_when(name=['profile'], method=['GET']), {
+            "id": 1,
+            "name": "Dr. Jane Smith",
+            "email": "jane@example.com",
+            "phone": "+201234567890",
+            "bio": "Experienced educator",
+            "specialization": "Computer Science",
+            "profile_picture": "profile_pictures/teacher_1.jpg"
+        }),
+        (_when(name=['profile'], method=['PUT']), {"message": "Profile updated successfully"}),
+        (_when(name=['upload']),
+         {"message": "File uploaded successfully", "file_path": "uploads/file_123.jpg"}),
+        (_when(name=['stats']), {
+            "total_courses": 12,
+            "total_students": 340,
+            "total_earnings": 45000,
+            "average_rating": 4.7
+        }),
+    ]),
 
     # Course endpoints
-    if 'course' in name_lower:
-        if 'get all' in name_lower or method == 'GET' and 'course' == name_lower.strip():
-            return {
-                "data": [{
-                    "id": 1,
-                    "title": "Introduction to Programming",
-                    "description": "Learn programming basics",
-                    "category": "Programming",
-                    "price": 500,
-                    "difficulty_level": "beginner",
-                    "instructor": "Dr. Jane Smith",
-                    "enrolled_count": 120,
-                    "rating": 4.8,
-                    "thumbnail": "thumbnails/course_1.jpg"
-                }],
-                "current_page": 1,
-                "total": 50
-            }
-        elif method == 'POST':
-            return {
-                "message": "Course created successfully",
-                "course": {
-                    "id": 1,
-                    "title": "Introduction to Programming",
-                    "description": "Learn programming basics",
-                    "price": 500,
-                    "created_at": "2025-12-17T10:00:00.000000Z"
-                }
-            }
-        elif method == 'PUT':
-            return {"message": "Course updated successfully"}
-        elif method == 'DELETE':
-            return {"message": "Course deleted successfully"}
-        elif 'view' in name_lower:
-            return {
+    *_section(_when(name=['course']), [
+        ([_when(name=['get all']), _when(method=['GET'], name_is='course')], {
+            "data": [{
                 "id": 1,
                 "title": "Introduction to Programming",
                 "description": "Learn programming basics",
                 "category": "Programming",
                 "price": 500,
                 "difficulty_level": "beginner",
-                "lessons": [
-                    {
-                        "id": 1,
-                        "title": "Lesson 1: Introduction",
-                        "duration": 1800,
-                        "order": 1
-                    }
-                ]
-            }
-        elif 'enroll' in name_lower:
-            return {"message": "Enrolled in course successfully"}
-        elif 'my courses' in name_lower:
-            return {
-                "data": [{
-                    "id": 1,
-                    "title": "Introduction to Programming",
-                    "progress": 45,
-                    "enrolled_at": "2025-12-15T10:00:00.000000Z"
-                }]
+                "instructor": "Dr. Jane Smith",
+                "enrolled_count": 120,
+                "rating": 4.8,
+                "thumbnail": "thumbnails/course_1.jpg"
+            }],
+            "current_page": 1,
+            "total": 50
+        }),
+        (_when(method=['POST']), {
+            "message": "Course created successfully",
+            "course": {
+                "id": 1,
+                "title": "Introduction to Programming",
+                "description": "Learn programming basics",
+                "price": 500,
+                "created_at": "2025-12-17T10:00:00.000000Z"
             }
-
-    # Lesson endpoints
-    if 'lesson' in name_lower:
-        if method == 'POST' and 'progress' not in name_lower:
-            return {
-                "message": "Lesson created successfully",
-                "lesson": {
+        }),
+        (_when(method=['PUT']), {"message": "Course updated successfully"}),
+        (_when(method=['DELETE']), {"message": "Course deleted successfully"}),
+        (_when(name=['view']), {
+            "id": 1,
+            "title": "Introduction to Programming",
+            "description": "Learn programming basics",
+            "category": "Programming",
+            "price": 500,
+            "difficulty_level": "beginner",
+            "lessons": [
+                {
                     "id": 1,
                     "title": "Lesson 1: Introduction",
                     "duration": 1800,
                     "order": 1
                 }
+            ]
+        }),
+        (_when(name=['enroll']), {"message": "Enrolled in course successfully"}),
+        (_when(name=['my courses']), {
+            "data": [{
+                "id": 1,
+                "title": "Introduction to Programming",
+                "progress": 45,
+                "enrolled_at": "2025-12-15T10:00:00.000000Z"
+            }]
+        }),
+    ]),
+
+    # Lesson endpoints
+    *_section(_when(name=['lesson']), [
+        (_when(method=['POST'], not_name=['progress']), {
+            "message": "Lesson created successfully",
+            "lesson": {
+                "id": 1,
+                "title": "Lesson 1: Introduction",
+                "duration": 1800,
+                "order": 1
             }
-        elif method == 'PUT':
-            return {"message": "Lesson updated successfully"}
-        elif method == 'DELETE':
-            return {"message": "Lesson deleted successfully"}
-        elif 'progress' in name_lower:
-            return {"message": "Progress updated successfully", "completed": True}
-        elif 'reorder' in name_lower:
-            return {"message": "Lessons reordered successfully"}
+        }),
+        (_when(method=['PUT']), {"message": "Lesson updated successfully"}),
+        (_when(method=['DELETE']), {"message": "Lesson deleted successfully"}),
+        (_when(name=['progress']), {"message": "Progress updated successfully", "completed": True}),
+        (_when(name=['reorder']), {"message": "Lessons reordered successfully"}),
+    ]),
 
     # Job endpoints
-    if 'job' in name_lower:
-        if 'get all' in name_lower or ('job' in name_lower and method == 'GET'):
-            return {
-                "data": [{
-                    "id": 1,
-                    "title": "Software Engineer",
-                    "description": "We are looking for a talented software engineer",
-                    "location": "Cairo, Egypt",
-                    "job_type": "full-time",
-                    "salary_range": "50000-80000 EGP",
-                    "company_name": "Tech Corp",
-                    "deadline": "2025-12-31",
-                    "created_at": "2025-12-17T10:00:00.000000Z"
-                }],
-                "current_page": 1,
-                "total": 25
-            }
-        elif method == 'POST' and 'apply' not in name_lower:
-            return {
-                "message": "Job created successfully",
-                "job": {
-                    "id": 1,
-                    "title": "Software Engineer",
-                    "created_at": "2025-12-17T10:00:00.000000Z"
-                }
-            }
-        elif method == 'PUT':
-            return {"message": "Job updated successfully"}
-        elif method == 'DELETE':
-            return {"message": "Job deleted successfully"}
-        elif 'apply' in name_lower:
-            return {"message": "Application submitted successfully", "application_id": 1}
-        elif 'test-jsearch' in name_lower:
-            return {
-                "message": "JSearch API connection successful",
-                "jobs_found": 150
+    *_section(_when(name=['job']), [
+        ([_when(name=['get all']), _when(method=['GET'])], {
+            "data": [{
+                "id": 1,
+                "title": "Software Engineer",
+                "description": "We are looking for a talented software engineer",
+                "location": "Cairo, Egypt",
+                "job_type": "full-time",
+                "salary_range": "50000-80000 EGP",
+                "company_name": "Tech Corp",
+                "deadline": "2025-12-31",
+                "created_at": "2025-12-17T10:00:00.000000Z"
+            }],
+            "current_page": 1,
+            "total": 25
+        }),
+        (_when(method=['POST'], not_name=['apply']), {
+            "message": "Job created successfully",
+            "job": {
+                "id": 1,
+                "title": "Software Engineer",
+                "created_at": "2025-12-17T10:00:00.000000Z"
             }
+        }),
+        (_when(method=['PUT']), {"message": "Job updated successfully"}),
+        (_when(method=['DELETE']), {"message": "Job deleted successfully"}),
+        (_when(name=['apply']), {"message": "Application submitted successfully", "application_id": 1}),
+        (_when(name=['test-jsearch']), {
+            "message": "JSearch API connection successful",
+            "jobs_found": 150
+        }),
+    ]),
 
     # Application endpoints
-    if 'application' in name_lower:
-        if 'get all' in name_lower or method == 'GET':
-            return {
-                "data": [{
-                    "id": 1,
-                    "job_title": "Software Engineer",
-                    "applicant_name": "John Doe",
-                    "applicant_email": "john@example.com",
-                    "status": "pending",
-                    "cover_letter": "I am very interested...",
-                    "applied_at": "2025-12-17T10:00:00.000000Z"
-                }],
-                "current_page": 1,
-                "total": 45
-            }
-        elif 'status' in name_lower:
-            return {"message": "Application status updated successfully"}
-        elif 'favorite' in name_lower:
-            return {"message": "Favorite status toggled successfully", "is_favorite": True}
-        elif method == 'DELETE' or 'withdraw' in name_lower:
-            return {"message": "Application withdrawn successfully"}
+    *_section(_when(name=['application']), [
+        ([_when(name=['get all']), _when(method=['GET'])], {
+            "data": [{
+                "id": 1,
+                "job_title": "Software Engineer",
+                "applicant_name": "John Doe",
+                "applicant_email": "john@example.com",
+                "status": "pending",
+                "cover_letter": "I am very interested...",
+                "applied_at": "2025-12-17T10:00:00.000000Z"
+            }],
+            "current_page": 1,
+            "total": 45
+        }),
+        (_when(name=['status']), {"message": "Application status updated successfully"}),
+        (_when(name=['favorite']), {"message": "Favorite status toggled successfully", "is_favorite": True}),
+        ([_when(method=['DELETE']), _when(name=['withdraw'])],
+         {"message": "Application withdrawn successfully"}),
+    ]),
 
     # Company endpoints
-    if 'company' in parent_lower or 'companies' in name_lower:
-        if 'profile' in name_lower and method == 'GET':
-            return {
+    *_section([_when(parent=['company']), _when(name=['companies'])], [
+        (_when(name=['profile'], method=['GET']), {
+            "id": 1,
+            "company_name": "Tech Corp",
+            "email": "contact@techcorp.com",
+            "industry": "Technology",
+            "website": "https://techcorp.com",
+            "description": "Leading tech company",
+            "location": "Cairo, Egypt",
+            "logo": "logos/company_1.jpg",
+            "is_verified": True
+        }),
+        (_when(name=['profile'], method=['PUT']), {"message": "Profile updated successfully"}),
+        (_when(name=['upload']),
+         {"message": "File uploaded successfully", "file_path": "uploads/file_123.jpg"}),
+        (_when(name=['verify']), {"message": "Company verification status updated"}),
+        (_when(name=['get all']), {
+            "data": [{
                 "id": 1,
                 "company_name": "Tech Corp",
                 "email": "contact@techcorp.com",
                 "industry": "Technology",
-                "website": "https://techcorp.com",
-                "description": "Leading tech company",
-                "location": "Cairo, Egypt",
-                "logo": "logos/company_1.jpg",
                 "is_verified": True
-            }
-        elif 'profile' in name_lower and method == 'PUT':
-            return {"message": "Profile updated successfully"}
-        elif 'upload' in name_lower:
-            return {"message": "File uploaded successfully", "file_path": "uploads/file_123.jpg"}
-        elif 'verify' in name_lower:
-            return {"message": "Company verification status updated"}
-        elif 'get all' in name_lower:
-            return {
-                "data": [{
-                    "id": 1,
-                    "company_name": "Tech Corp",
-                    "email": "contact@techcorp.com",
-                    "industry": "Technology",
-                    "is_verified": True
-                }],
-                "current_page": 1,
-                "total": 30
-            }
+            }],
+            "current_page": 1,
+            "total": 30
+        }),
+    ]),
 
     # Profile/Upload endpoints
-    if 'profile' in name_lower:
-        if method == 'GET':
-            return {
-                "id": 1,
-                "name": "John Doe",
-                "email": "john@example.com",
-                "phone": "+201234567890",
-                "profile_picture": "profile_pictures/user_1.jpg",
-                "created_at": "2025-12-17T10:00:00.000000Z"
-            }
-        elif method == 'PUT':
-            return {"message": "Profile updated successfully"}
-
-    if 'upload' in name_lower or 'download' in name_lower:
-        if 'download' in name_lower:
-            return {"download_url": "http://localhost:8000/storage/files/document.pdf"}
-        else:
-            return {"message": "File uploaded successfully", "file_path": "uploads/file_123.jpg"}
+    *_section(_when(name=['profile']), [
+        (_when(method=['GET']), {
+            "id": 1,
+            "name": "John Doe",
+            "email": "john@example.com",
+            "phone": "+201234567890",
+            "profile_picture": "profile_pictures/user_1.jpg",
+            "created_at": "2025-12-17T10:00:00.000000Z"
+        }),
+        (_when(method=['PUT']), {"message": "Profile updated successfully"}),
+    ]),
+    (_when(name=['download']), {"download_url": "http://localhost:8000/storage/files/document.pdf"}),
+    (_when(name=['upload']), {"message": "File uploaded successfully", "file_path": "uploads/file_123.jpg"}),
 
     # Parent/Student specific
-    if 'parent' in parent_lower:
-        if 'search student' in name_lower:
-            return {
-                "found": True,
-                "student": {
-                    "id": 5,
-                    "name": "Student Name",
-                    "email": "student@example.com"
-                }
+    *_section(_when(parent=['parent']), [
+        (_when(name=['search student']), {
+            "found": True,
+            "student": {
+                "id": 5,
+                "name": "Student Name",
+                "email": "student@example.com"
             }
-        elif 'follow' in name_lower:
-            if 'get' in name_lower or method == 'GET':
-                return {
-                    "data": [{
-                        "id": 5,
-                        "name": "Student Name",
-                        "email": "student@example.com",
-                        "grade": "10",
-                        "school": "Cairo High School"
-                    }]
-                }
-            elif method == 'DELETE':
-                return {"message": "Student unfollowed successfully"}
-            else:
-                return {"message": "Follow request sent successfully"}
-        elif 'student' in name_lower and method == 'GET':
-            return {
+        }),
+        ([_when(name=['follow', 'get']), _when(name=['follow'], method=['GET'])], {
+            "data": [{
                 "id": 5,
                 "name": "Student Name",
                 "email": "student@example.com",
                 "grade": "10",
-                "school": "Cairo High School",
-                "courses": []
-            }
+                "school": "Cairo High School"
+            }]
+        }),
+        (_when(name=['follow'], method=['DELETE']), {"message": "Student unfollowed successfully"}),
+        (_when(name=['follow']), {"message": "Follow request sent successfully"}),
+        (_when(name=['student'], method=['GET']), {
+            "id": 5,
+            "name": "Student Name",
+            "email": "student@example.com",
+            "grade": "10",
+            "school": "Cairo High School",
+            "courses": []
+        }),
+    ]),
 
     # Student specific
-    if 'follow request' in name_lower:
-        if method == 'GET':
-            return {
-                "data": [{
-                    "id": 1,
-                    "parent_name": "Parent Name",
-                    "parent_email": "parent@example.com",
-                    "status": "pending",
-                    "created_at": "2025-12-17T10:00:00.000000Z"
-                }]
-            }
-        else:
-            return {"message": "Follow request processed successfully"}
-
-    # Public profiles
-    if 'public profile' in name_lower:
-        return {
+    *_section(_when(name=['follow request']), [
+        (_when(method=['GET']), {
             "data": [{
                 "id": 1,
-                "name": "John Doe",
-                "university": "Cairo University",
-                "major": "Computer Science",
-                "bio": "Passionate student"
+                "parent_name": "Parent Name",
+                "parent_email": "parent@example.com",
+                "status": "pending",
+                "created_at": "2025-12-17T10:00:00.000000Z"
             }]
-        }
+        }),
+        (_when(), {"message": "Follow request processed successfully"}),
+    ]),
+
+    # Public profiles
+    (_when(name=['public profile']), {
+        "data": [{
+            "id": 1,
+            "name": "John Doe",
+            "university": "Cairo University",
+            "major": "Computer Science",
+            "bio": "Passionate student"
+        }]
+    }),
 
     # Payment endpoints
-    if 'payment' in name_lower or 'stripe' in name_lower or 'paypal' in name_lower:
-        if 'create' in name_lower and 'intent' in name_lower:
-            return {
-                "client_secret": "pi_xxxxx_secret_yyyyy",
-                "payment_intent_id": "pi_1234567890"
-            }
-        elif 'create' in name_lower and 'order' in name_lower:
-            return {
-                "order_id": "ORDER123456",
-                "approval_url": "https://www.paypal.com/checkoutnow?token=xxxxx"
-            }
-        elif 'confirm' in name_lower:
-            return {
-                "message": "Payment confirmed successfully",
-                "enrollment_id": 123
-            }
-        elif 'history' in name_lower:
-            return {
-                "data": [{
-                    "id": 1,
-                    "course_title": "Introduction to Programming",
-                    "amount": 500,
-                    "payment_method": "stripe",
-                    "status": "completed",
-                    "created_at": "2025-12-15T10:00:00.000000Z"
-                }]
-            }
-        elif 'webhook' in name_lower:
-            return {"received": True}
+    *_section([_when(name=['payment']), _when(name=['stripe']), _when(name=['paypal'])], [
+        (_when(name=['create', 'intent']), {
+            "client_secret": "pi_xxxxx_secret_yyyyy",
+            "payment_intent_id": "pi_1234567890"
+        }),
+        (_when(name=['create', 'order']), {
+            "order_id": "ORDER123456",
+            "approval_url": "https://www.paypal.com/checkoutnow?token=xxxxx"
+        }),
+        (_when(name=['confirm']), {
+            "message": "Payment confirmed successfully",
+            "enrollment_id": 123
+        }),
+        (_when(name=['history']), {
+            "data": [{
+                "id": 1,
+                "course_title": "Introduction to Programming",
+                "amount": 500,
+                "payment_method": "stripe",
+                "status": "completed",
+                "created_at": "2025-12-15T10:00:00.000000Z"
+            }]
+        }),
+        (_when(name=['webhook']), {"received": True}),
+    ]),
 
     # Live streaming endpoints
-    if 'live' in name_lower or 'session' in name_lower:
-        if 'upcoming' in name_lower:
-            return {
-                "data": [{
-                    "id": 1,
-                    "course_title": "Introduction to Programming",
-                    "title": "Live Session 1",
-                    "scheduled_at": "2025-12-18T14:00:00.000000Z",
-                    "duration": 3600,
-                    "teacher_name": "Dr. Jane Smith"
-                }]
-            }
-        elif 'join' in name_lower or 'start' in name_lower:
-            return {
-                "message": "Joined session successfully",
-                "stream_url": "rtmp://stream.example.com/live/session_1",
-                "session_token": "eyJ0eXAi..."
-            }
-        elif 'end' in name_lower:
-            return {"message": "Session ended successfully"}
-        elif 'next-session' in name_lower:
-            return {
+    *_section([_when(name=['live']), _when(name=['session'])], [
+        (_when(name=['upcoming']), {
+            "data": [{
                 "id": 1,
+                "course_title": "Introduction to Programming",
                 "title": "Live Session 1",
-                "scheduled_at": "2025-12-18T14:00:00.000000Z"
-            }
-        elif 'message' in name_lower:
-            if method == 'GET':
-                return {
-                    "data": [{
-                        "id": 1,
-                        "user_name": "John Doe",
-                        "message": "Hello everyone!",
-                        "created_at": "2025-12-17T10:00:00.000000Z"
-                    }]
-                }
-            else:
-                return {"message": "Message sent successfully", "message_id": 1}
+                "scheduled_at": "2025-12-18T14:00:00.000000Z",
+                "duration": 3600,
+                "teacher_name": "Dr. Jane Smith"
+            }]
+        }),
+        ([_when(name=['join']), _when(name=['start'])], {
+            "message": "Joined session successfully",
+            "stream_url": "rtmp://stream.example.com/live/session_1",
+            "session_token": "eyJ0eXAi..."
+        }),
+        (_when(name=['end']), {"message": "Session ended successfully"}),
+        (_when(name=['next-session']), {
+            "id": 1,
+            "title": "Live Session 1",
+            "scheduled_at": "2025-12-18T14:00:00.000000Z"
+        }),
+        (_when(name=['message'], method=['GET']), {
+            "data": [{
+                "id": 1,
+                "user_name": "John Doe",
+                "message": "Hello everyone!",
+                "created_at": "2025-12-17T10:00:00.000000Z"
+            }]
+        }),
+        (_when(name=['message']), {"message": "Message sent successfully", "message_id": 1}),
+    ]),
 
     # AI Career Mentor endpoints
-    if 'ai-career' in name_lower or 'ai career' in parent_lower:
-        if 'chat' in name_lower and method == 'POST':
-            return {
-                "response": "Based on your profile, I recommend focusing on...",
-                "conversation_id": "conv_123"
-            }
-        elif 'history' in name_lower:
-            if method == 'GET':
-                return {
-                    "data": [{
-                        "id": 1,
-                        "message": "What career path should I follow?",
-                        "response": "Based on your profile...",
-                        "created_at": "2025-12-17T10:00:00.000000Z"
-                    }]
-                }
-            else:
-                return {"message": "Chat history cleared successfully"}
-        elif 'analyze-cv' in name_lower:
-            return {
-                "analysis": {
-                    "strengths": ["Strong technical skills", "Good education background"],
-                    "improvements": ["Add more project details", "Include certifications"],
-                    "overall_score": 78
-                }
-            }
-        elif 'learning-path' in name_lower:
-            return {
-                "path": [{
-                    "phase": 1,
-                    "title": "Fundamentals",
-                    "topics": ["HTML/CSS", "JavaScript Basics"],
-                    "duration": "3 months"
-                }]
-            }
-        elif 'job-recommendations' in name_lower:
-            return {
-                "recommendations": [{
-                    "title": "Junior Frontend Developer",
-                    "company": "Tech Corp",
-                    "match_score": 85,
-                    "location": "Cairo"
-                }]
-            }
-        elif 'skills-gap' in name_lower:
-            return {
-                "missing_skills": ["React", "TypeScript", "Node.js"],
-                "recommendations": ["Take React course", "Learn TypeScript fundamentals"]
+    *_section([_when(name=['ai-career']), _when(parent=['ai career'])], [
+        (_when(name=['chat'], method=['POST']), {
+            "response": "Based on your profile, I recommend focusing on...",
+            "conversation_id": "conv_123"
+        }),
+        (_when(name=['history'], method=['GET']), {
+            "data": [{
+                "id": 1,
+                "message": "What career path should I follow?",
+                "response": "Based on your profile...",
+                "created_at": "2025-12-17T10:00:00.000000Z"
+            }]
+        }),
+        (_when(name=['history']), {"message": "Chat history cleared successfully"}),
+        (_when(name=['analyze-cv']), {
+            "analysis": {
+                "strengths": ["Strong technical skills", "Good education background"],
+                "improvements": ["Add more project details", "Include certifications"],
+                "overall_score": 78
             }
+        }),
+        (_when(name=['learning-path']), {
+            "path": [{
+                "phase": 1,
+                "title": "Fundamentals",
+                "topics": ["HTML/CSS", "JavaScript Basics"],
+                "duration": "3 months"
+            }]
+        }),
+        (_when(name=['job-recommendations']), {
+            "recommendations": [{
+                "title": "Junior Frontend Developer",
+                "company": "Tech Corp",
+                "match_score": 85,
+                "location": "Cairo"
+            }]
+        }),
+        (_when(name=['skills-gap']), {
+            "missing_skills": ["React", "TypeScript", "Node.js"],
+            "recommendations": ["Take React course", "Learn TypeScript fundamentals"]
+        }),
+    ]),
 
     # Didit (Identity Verification)
-    if 'didit' in name_lower:
-        if 'create-session' in name_lower:
-            return {
-                "session_id": "session_abc123",
-                "verification_url": "https://verify.didit.me/session_abc123"
-            }
-        elif 'status' in name_lower:
-            return {
-                "session_id": "session_abc123",
-                "status": "verified",
-                "verified_at": "2025-12-17T10:00:00.000000Z"
-            }
-        elif 'webhook' in name_lower:
-            return {"received": True}
+    *_section(_when(name=['didit']), [
+        (_when(name=['create-session']), {
+            "session_id": "session_abc123",
+            "verification_url": "https://verify.didit.me/session_abc123"
+        }),
+        (_when(name=['status']), {
+            "session_id": "session_abc123",
+            "status": "verified",
+            "verified_at": "2025-12-17T10:00:00.000000Z"
+        }),
+        (_when(name=['webhook']), {"received": True}),
+    ]),
 
     # Video streaming
-    if 'stream' in name_lower and 'lesson' in name_lower:
-        return {"stream_url": "http://localhost:8000/storage/videos/lesson_1.mp4"}
+    (_when(name=['stream', 'lesson']), {"stream_url": "http://localhost:8000/storage/videos/lesson_1.mp4"}),
 
     # Storage
-    if 'storage' in name_lower:
-        return {"file_url": "http://localhost:8000/storage/files/document.pdf"}
-
-    # Default response
-    return {"message": "Operation completed successfully"}
-
-# Recursively process all items
-def process_items(items, parent_name=""):
-    for item in items:
-        if 'item' in item:
-            # This is a folder, process its children
-            process_items(item['item'], item.get('name', ''))
-        elif 'request' in item:
-            # This is a request item
-            add_response_to_request(item, parent_name)
-
-# Process all items in the collection
-for item in collection['item']:
-    if 'item' in item:
-        process_items(item['item'], item.get('name', ''))
-    elif 'request' in item:
-        add_response_to_request(item)
-
-# Write the updated collection back to file
-with open('ACE_API_Postman_Collection.json', 'w') as f:
-    json.dump(collection, f, indent='\t')
-
-print("Successfully added example responses to all endpoints!")
+    (_when(name=['storage']), {"file_url": "http://localhost:8000/storage/files/document.pdf"}),
+]
+
+DEFAULT_RESPONSE = {"message": "Operation completed successfully"}
+
+class RuleIndex:
+    """Rule table compiled into keyword, exact-name and method indexes.
+
+    Every substring a rule tests is stored in a character trie, so one scan
+    of the name and one of the parent finds all keywords they contain no
+    matter how many rules exist. Each rule is filed under a single anchor
+    (its longest keyword, exact name or method) and only rules whose anchor
+    was hit are evaluated, in table order.
+    """
+
+    def __init__(self, rules, default):
+        self.default = default
+        self.rules = []
+        self.trie = {}
+        self.by_name_keyword = {}
+        self.by_parent_keyword = {}
+        self.by_name_is = {}
+        self.by_method = {}
+        self.unanchored = []
+
+        for priority, (when, body) in enumerate(rules):
+            for conditions in _alternatives(when):
+                self._add(priority, conditions, body)
+
+    def _add(self, priority, conditions, body):
+        rule_id = len(self.rules)
+        self.rules.append((priority, conditions, body))
+        for keyword in conditions['name'] + conditions['parent'] + conditions['not_name']:
+            self._add_keyword(keyword)
+
+        if conditions['name']:
+            anchor = max(conditions['name'], key=len)
+            self.by_name_keyword.setdefault(anchor, []).append(rule_id)
+        elif conditions['parent']:
+            anchor = max(conditions['parent'], key=len)
+            self.by_parent_keyword.setdefault(anchor, []).append(rule_id)
+        elif conditions['name_is']:
+            self.by_name_is.setdefault(conditions['name_is'], []).append(rule_id)
+        elif conditions['method']:
+            for method in conditions['method']:
+                self.by_method.setdefault(method, []).append(rule_id)
+        else:
+            self.unanchored.append(rule_id)
+
+    def _add_keyword(self, keyword):
+        node = self.trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[None] = keyword
+
+    def keywords_in(self, text):
+        """Return every indexed keyword that occurs in text"""
+        found = set()
+        trie = self.trie
+        for start in range(len(text)):
+            node = trie
+            for char in text[start:]:
+                node = node.get(char)
+                if node is None:
+                    break
+                if None in node:
+                    found.add(node[None])
+        return found
+
+    def candidates(self, name_lower, method, name_hits, parent_hits):
+        """Return ids of the rules worth evaluating, in table order"""
+        ids = list(self.unanchored)
+        for keyword in name_hits:
+            ids.extend(self.by_name_keyword.get(keyword, ()))
+        for keyword in parent_hits:
+            ids.extend(self.by_parent_keyword.get(keyword, ()))
+        ids.extend(self.by_name_is.get(name_lower.strip(), ()))
+        ids.extend(self.by_method.get(method, ()))
+        ids.sort()
+        return ids
+
+    def matches(self, conditions, name_lower, method, name_hits, parent_hits):
+        if conditions['method'] and method not in conditions['method']:
+            return False
+        if conditions['name_is'] and conditions['name_is'] != name_lower.strip():
+            return False
+        for keyword in conditions['name']:
+            if keyword not in name_hits:
+                return False
+        for keyword in conditions['parent']:
+            if keyword not in parent_hits:
+                return False
+        for keyword in conditions['not_name']:
+            if keyword in name_hits:
+                return False
+        return True
+
+    def explain(self, name, method, parent_name):
+        """(id of the matching rule or None for the default, number of rules evaluated)"""
+        name_lower = name.lower()
+        parent_lower = parent_name.lower()
+        name_hits = self.keywords_in(name_lower)
+        parent_hits = self.keywords_in(parent_lower)
+        candidates = self.candidates(name_lower, method, name_hits, parent_hits)
+        for evaluated, rule_id in enumerate(candidates, 1):
+            if self.matches(self.rules[rule_id][1], name_lower, method, name_hits, parent_hits):
+                return rule_id, evaluated
+        return None, len(candidates)
+
+    def lookup(self, name, method, parent_name):
+        rule_id, _ = self.explain(name, method, parent_name)
+        return self.default if rule_id is None else self.rules[rule_id][2]
+
+    def describe(self, rule_id):
+        """Readable label of a rule, e.g. '#41 parent:company name:job method:GET' ('default' for None)"""
+        if rule_id is None:
+            return 'default'
+        priority, conditions, _ = self.rules[rule_id]
+        parts = [f'#{priority}']
+        if conditions['parent']:
+            parts.append('parent:' + '+'.join(conditions['parent']))
+        if conditions['name']:
+            parts.append('name:' + '+'.join(conditions['name']))
+        if conditions['name_is']:
+            parts.append(f"name={conditions['name_is']}")
+        if conditions['not_name']:
+            parts.append('not:' + '+'.join(conditions['not_name']))
+        if conditions['method']:
+            parts.append('method:' + '|'.join(conditions['method']))
+        return ' '.join(parts)
+
+@lru_cache(maxsize=None)
+def rule_index():
+    """RESPONSE_RULES compiled into a RuleIndex, built on first use"""
+    return RuleIndex(RESPONSE_RULES, DEFAULT_RESPONSE)
+
+@lru_cache(maxsize=4096)
+def create_response_for_endpoint(name, method, parent_name):
+    """Create appropriate response body based on endpoint name and method.
+
+    The returned dict is shared between calls and must not be mutated.
+    """
+    return rule_index().lookup(name, method, parent_name)
+
+# Incremental re-runs: a sidecar manifest remembers a content hash for every
+# request item so unchanged items are skipped and an unchanged collection is
+# not rewritten at all.
+
+# What the rules' parent conditions are matched against; part of rules_version()
+# because changing it changes the generated examples
+PARENT_CONTEXT = 'folder path'
+
+@lru_cache(maxsize=None)
+def rules_version():
+    """Fingerprint of the response rules, so a rule change invalidates the manifest"""
+    import hashlib
+    import json
+    table = json.dumps([RESPONSE_RULES, DEFAULT_RESPONSE, PARENT_CONTEXT], sort_keys=True)
+    return hashlib.sha1(table.encode('utf-8')).hexdigest()[:12]
+
+def manifest_path_for(collection_path):
+    directory, name = os.path.split(os.path.abspath(collection_path))
+    return os.path.join(directory, f'.{name}.manifest.json')
+
+def _file_fingerprint(path):
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def _file_sha256(path):
+    import hashlib
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ResponseManifest:
+    """Per-item content hashes from the previous run of this script"""
+
+    def __init__(self, path, style=None):
+        self.path = path
+        self.style = style or DEFAULT_STYLE
+        # Output written in another style does not count as up to date
+        self.version = rules_version() + (f'+{self.style.key}' if self.style.key else '')
+        self.previous = {}
+        self.file = None
+        self.items = {}
+        self.seen = {}
+        if os.path.exists(path):
+            import json
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.previous = data.get('items', {})
+                if data.get('rules_version') == self.version:
+                    self.file = data.get('file')
+            except (OSError, ValueError):
+                pass
+
+    def is_current(self, collection_path):
+        """True if collection_path is exactly what the last run wrote, under the same rules"""
+        if not self.file or not os.path.exists(collection_path):
+            return False
+        fingerprint = _file_fingerprint(collection_path)
+        if fingerprint == {'size': self.file['size'], 'mtime_ns': self.file['mtime_ns']}:
+            return True
+        # Touched but possibly identical (e.g. after a git checkout)
+        return fingerprint['size'] == self.file['size'] and _file_sha256(collection_path) == self.file['sha256']
+
+    def item_key(self, path, item):
+        key = '/'.join(path + (item.get('name', 'Request'),))
+        count = self.seen.get(key, 0) + 1
+        self.seen[key] = count
+        return key if count == 1 else f'{key}#{count}'
+
+    def item_hash(self, item):
+        import hashlib
+        import json
+        request = item['request']
+        url = request.get('url', '')
+        content = [
+            request.get('method', 'GET'),
+            url.get('raw', url.get('path')) if isinstance(url, dict) else url,
+            request.get('body'),
+            self.version,
+        ]
+        return hashlib.sha1(json.dumps(content, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def enrich(self, item, parent_name, path):
+        """Add an example to item unless it is unchanged since the last run"""
+        key = self.item_key(path, item)
+        digest = self.item_hash(item)
+        entry = self.previous.get(key)
+        if entry and entry['hash'] == digest and item.get('response'):
+            self.items[key] = entry
+            return False
+
+        changed = False
+        generated_name = f"Example Response - {item.get('name', 'Request')}"
+        if entry and entry.get('generated') and item.get('response'):
+            # The request or the rules changed since we generated this example
+            kept = [r for r in item['response'] if r.get('name') != generated_name]
+            changed = len(kept) != len(item['response'])
+            item['response'] = kept
+
+        before = item.get('response')
+        add_response_to_request(item, parent_name, self.style)
+        added = item.get('response') is not before
+        changed |= self.style.restyle(item)
+        self.items[key] = {
+            'hash': digest,
+            'generated': added or bool(entry and entry.get('generated') and not changed),
+        }
+        return changed or added
+
+    def save(self, collection_path):
+        import json
+        from postman_collection import atomic_write
+        fingerprint = _file_fingerprint(collection_path)
+        fingerprint['sha256'] = _file_sha256(collection_path)
+        data = {'rules_version': self.version, 'file': fingerprint, 'items': self.items}
+        atomic_write(self.path, lambda f: json.dump(data, f, separators=(',', ':')))
+
+def enrich_item(item, parent_name="", cache=None, path=(), style=None):
+    """Add an example response to one request item; returns True if it changed.
+
+    With a cache, the examples are written in the cache's style.
+    """
+    if cache is not None:
+        return cache.enrich(item, parent_name, path)
+    style = style or DEFAULT_STYLE
+    before = item.get('response')
+    add_response_to_request(item, parent_name, style)
+    changed = item.get('response') is not before
+    return style.restyle(item) or changed
+
+def folder_context(path):
+    """Parent context the rules see for a request under path, e.g. 'University Student/Profile'"""
+    return '/'.join(path)
+
+def _enrich_at(item, path, cache, style, on_item):
+    """enrich_item() for a request under path, reporting it to on_item(path, item, parent_name, changed, seconds)"""
+    parent_name = folder_context(path)
+    if on_item is None:
+        return enrich_item(item, parent_name, cache, path, style)
+    import time
+    started = time.perf_counter()
+    changed = enrich_item(item, parent_name, cache, path, style)
+    on_item(path, item, parent_name, changed, time.perf_counter() - started)
+    return changed
+
+def enrich_requests(requests, cache=None, style=None, on_item=None):
+    """Yield (folder path, item) with an example response added to every request item.
+
+    A pipeline stage over iter_requests() or any other iterable of pairs:
+    changed items are copies, the rest are passed through, one at a time.
+    """
+    for path, item in requests:
+        copy = dict(item)
+        yield path, copy if _enrich_at(copy, path, cache, style, on_item) else item
+
+# Changed items and the folders above them are copies, everything else is
+# shared with the input. Folders are walked with an explicit stack, like
+# iter_requests(), so the nesting depth is not bounded by the recursion limit.
+def enrich_items(items, cache=None, path=(), style=None, on_item=None):
+    """Return items with example responses added, or items itself if none changed"""
+    # One frame per open folder: [items, next position, folder path, copy of items[:position] or None]
+    stack = [[items, 0, path, None]]
+    while True:
+        frame = stack[-1]
+        items, position, path, enriched = frame
+        if position == len(items):
+            # Folder done: hand its (possibly new) item list to the folder item above it
+            stack.pop()
+            children = items if enriched is None else enriched
+            if not stack:
+                return children
+            frame = stack[-1]
+            items, position, path, enriched = frame
+            folder = items[position]
+            result = folder if children is folder['item'] else dict(folder, item=children)
+        else:
+            item = result = items[position]
+            if 'item' in item:
+                # This is a folder, process its children first
+                stack.append([item['item'], 0, path + (item.get('name', ''),), None])
+                continue
+            if 'request' in item:
+                copy = dict(item)
+                if _enrich_at(copy, path, cache, style, on_item):
+                    result = copy
+        if result is not items[position] and enriched is None:
+            enriched = frame[3] = items[:position]
+        if enriched is not None:
+            enriched.append(result)
+        frame[1] = position + 1
+
+def enrich_collection(collection, cache=None, style=None, on_item=None):
+    """Return collection with example responses added to every request.
+
+    The input is not modified: changed items are copies and everything else
+    is shared with it. If nothing needed a response, collection itself is
+    returned, so `enrich_collection(c) is not c` tells whether it changed.
+
+    on_item(path, item, parent_name, changed, seconds), if given, is called
+    after every request item (Profiler.on_item uses it).
+    """
+    original = collection.get('item', [])
+    items = enrich_items(original, cache, (), style, on_item)
+    return collection if items is original else dict(collection, item=items)
+
+def process_collection(collection, cache=None, style=None):
+    """Add example responses to every request in a loaded collection, in place.
+
+    Returns True if any item was modified.
+    """
+    enriched = enrich_collection(collection, cache, style)
+    collection.update(enriched)
+    return enriched is not collection
+
+# Streaming mode: the collection is read and written one item at a time so
+# peak memory depends on the largest request, not on the collection size.
+
+class JsonStreamReader:
+    """Pull parser that decodes one JSON value at a time from a text file"""
+
+    def __init__(self, f, chunk_size=1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        import json
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        if self.pos > self.chunk_size and self.pos * 2 > len(self.buf):
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        # Read at least as much as is buffered so retrying a large value stays linear
+        chunk = self.f.read(max(self.chunk_size, len(self.buf) - self.pos))
+        if chunk:
+            self.buf += chunk
+        else:
+            self.eof = True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if self.eof:
+                return ''
+            self._fill()
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} but found {found!r} in collection stream")
+        self.pos += 1
+
+    def value(self):
+        """Decode and consume the next complete JSON value"""
+        import json
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # A number or literal at the end of the buffer may continue in the next chunk
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            self._fill()
+
+def _dump_value(value, depth):
+    """Serialize value exactly as json.dump(indent='\t') would at the given depth"""
+    import json
+    return json.dumps(value, indent='\t').replace('\n', '\n' + '\t' * depth)
+
+def _write_member(out, key, value_text, depth, first):
+    import json
+    out.write(('' if first else ',') + '\n' + '\t' * depth + json.dumps(key) + ': ' + value_text)
+
+_OBJECT, _ARRAY = 'object', 'array'
+
+class CollectionStream:
+    """Copies a collection from a JsonStreamReader to out, enriching request items"""
+
+    def __init__(self, reader, out, cache=None, style=None, on_item=None):
+        self.reader = reader
+        self.out = out
+        self.cache = cache
+        self.style = style
+        self.on_item = on_item
+        self.changed = False
+
+    def run(self):
+        """Copy the collection, streaming every nested 'item' array.
+
+        Objects without an 'item' array are request items (or other small
+        values) and are decoded whole so a response can be added before
+        writing. Open objects and arrays are kept on an explicit stack, so
+        any folder depth works.
+        """
+        reader, out = self.reader, self.out
+        reader.expect('{')
+        # Object frames: [OBJECT, depth, folder path, is_item, pending members, streaming]
+        # Array frames: [ARRAY, depth, folder path, elements written]
+        stack = [[_OBJECT, 0, (), False, {}, False]]
+        while stack:
+            frame = stack[-1]
+            if frame[0] is _ARRAY:
+                _, depth, path, count = frame
+                if count:
+                    if reader.peek() != ',':
+                        reader.expect(']')
+                        out.write('\n' + '\t' * depth + ']')
+                        stack.pop()
+                        # Back in the object that holds this array
+                        if reader.peek() == ',':
+                            reader.pos += 1
+                        continue
+                    reader.pos += 1
+                out.write(('' if count == 0 else ',') + '\n' + '\t' * (depth + 1))
+                frame[3] = count + 1
+                if reader.peek() == '{':
+                    reader.pos += 1
+                    stack.append([_OBJECT, depth + 1, path, True, {}, False])
+                else:
+                    out.write(_dump_value(reader.value(), depth + 1))
+                continue
+
+            _, depth, path, is_item, pending, streaming = frame
+            if reader.peek() == '}':
+                reader.pos += 1
+                stack.pop()
+                if streaming:
+                    out.write('\n' + '\t' * depth + '}')
+                else:
+                    if is_item and 'request' in pending:
+                        self.changed |= _enrich_at(pending, path, self.cache, self.style, self.on_item)
+                    out.write(_dump_value(pending, depth))
+                continue
+            key = reader.value()
+            reader.expect(':')
+            if key == 'item' and reader.peek() == '[':
+                # Folder (or the collection root): flush what we have and stream the children
+                if not streaming:
+                    out.write('{')
+                    for i, (pending_key, pending_value) in enumerate(pending.items()):
+                        _write_member(out, pending_key, _dump_value(pending_value, depth + 1), depth + 1, i == 0)
+                _write_member(out, key, '', depth + 1, not streaming and not pending)
+                frame[5] = True
+                reader.pos += 1
+                if reader.peek() != ']':
+                    out.write('[')
+                    stack.append([_ARRAY, depth + 1, path + (pending.get('name', ''),) if is_item else path, 0])
+                    continue
+                reader.pos += 1
+                out.write('[]')
+            else:
+                value = reader.value()
+                if streaming:
+                    _write_member(out, key, _dump_value(value, depth + 1), depth + 1, False)
+                else:
+                    pending[key] = value
+            if reader.peek() == ',':
+                reader.pos += 1
+        if reader.peek() != '':
+            raise ValueError("Unexpected data after the end of the collection")
+
+def is_collection_file(path):
+    """Whether path holds a JSON object with an 'item' array, reading only up to that key.
+
+    The streaming counterpart of the check enrich_file() makes on a loaded
+    file; invalid JSON raises ValueError as json.load() would.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = JsonStreamReader(f)
+        if reader.peek() != '{':
+            reader.value()
+            return False
+        reader.pos += 1
+        while reader.peek() != '}':
+            key = reader.value()
+            reader.expect(':')
+            if key == 'item':
+                return reader.peek() == '['
+            reader.value()
+            if reader.peek() == ',':
+                reader.pos += 1
+        return False
+
+def stream_collection(input_path, output_path, cache=None, style=None, on_item=None):
+    """Add example responses without loading the whole collection into memory.
+
+    Returns whether output_path was written; an in-place run that changes
+    nothing leaves the file untouched.
+    """
+    from postman_collection import atomic_write
+    in_place = os.path.abspath(input_path) == os.path.abspath(output_path)
+    with open(input_path, 'r', encoding='utf-8') as f:
+        def write(out):
+            stream = CollectionStream(JsonStreamReader(f), out, cache, style, on_item)
+            stream.run()
+            return stream.changed or not in_place
+
+        return atomic_write(output_path, write)
+
+# Profiling (--profile): phase timings, and which rule produced each item's
+# example and how many rules were evaluated to find it. Nothing here runs
+# unless a Profiler is passed to enrich_file().
+
+# In stream mode reading, parsing, serialization and writing are interleaved
+# with the traversal and timed together as this phase
+STREAM_PHASE = 'stream'
+
+class _Phase:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        import time
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc):
+        import time
+        phases = self.profiler.phases
+        phases[self.name] = phases.get(self.name, 0.0) + time.perf_counter() - self.started
+
+class Profiler:
+    """Collects the timings and rule matches of one enrich_file() run"""
+
+    def __init__(self):
+        self.phases = {}
+        self.items = []
+        self.overhead = 0.0
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def on_item(self, path, item, parent_name, changed, seconds):
+        """The on_item hook of enrich_collection() / stream_collection(): records the item's time and rule.
+
+        Only changed items are matched against the rules; items that already
+        had examples (or were skipped by the manifest) are counted as kept.
+        """
+        import time
+        started = time.perf_counter()
+        rule_id = evaluated = None
+        if changed:
+            request = item['request']
+            rule_id, evaluated = rule_index().explain(item.get('name', 'Request'), request.get('method', 'GET'),
+                                                      parent_name)
+        self.items.append((path, item, rule_id, evaluated, changed, seconds))
+        # Explaining the match is not part of the run being measured
+        self.overhead += time.perf_counter() - started
+
+    def report(self, collection_path):
+        """JSON-ready report: phases, hit count per rule, fallback items and every item's rule"""
+        from postman_collection import endpoint_key
+        index = rule_index()
+        generation = sum(item[5] for item in self.items)
+        phases = {}
+        for name, seconds in self.phases.items():
+            if name in ('traversal', STREAM_PHASE):
+                phases[name] = max(0.0, seconds - generation - self.overhead)
+                phases['generation'] = generation
+            else:
+                phases[name] = seconds
+        hits = {}
+        items = []
+        for path, item, rule_id, evaluated, changed, seconds in self.items:
+            label = index.describe(rule_id) if changed else None
+            if changed:
+                hits[label] = hits.get(label, 0) + 1
+            items.append({'endpoint': endpoint_key(path, item), 'rule': label, 'evaluated': evaluated,
+                          'generated': changed, 'us': round(seconds * 1e6, 1)})
+        generated = [item for item in items if item['generated']]
+        return {
+            'collection': collection_path,
+            'rules': len(index.rules),
+            'phases': {name: round(seconds, 6) for name, seconds in phases.items()},
+            'total': round(sum(phases.values()), 6),
+            'rule_hits': sorted(hits.items(), key=lambda hit: (-hit[1], hit[0])),
+            'kept': len(items) - len(generated),
+            'fallback': [item['endpoint'] for item in generated if item['rule'] == 'default'],
+            'mean_evaluated': round(sum(item['evaluated'] for item in generated) / len(generated), 2) if generated else 0,
+            'items': items,
+        }
+
+    def folded_stacks(self):
+        """Lines for flamegraph.pl / speedscope: 'frame;frame;... microseconds'"""
+        def frame(name):
+            return name.replace(';', ',').replace('\n', ' ') or '(unnamed)'
+
+        index = rule_index()
+        stacks = {}
+        generation = 0.0
+        walk = STREAM_PHASE if STREAM_PHASE in self.phases else 'traversal'
+        for path, item, rule_id, _, changed, seconds in self.items:
+            leaf = frame(index.describe(rule_id)) if changed else 'kept'
+            stack = ';'.join(['add_postman_responses', walk] + [frame(p) for p in path] + ['generation', leaf])
+            stacks[stack] = stacks.get(stack, 0.0) + seconds
+            generation += seconds
+        for name, seconds in self.phases.items():
+            if name in ('traversal', STREAM_PHASE):
+                seconds = max(0.0, seconds - generation - self.overhead)
+            stacks[f'add_postman_responses;{name}'] = seconds
+        return [f'{stack} {round(seconds * 1e6)}' for stack, seconds in stacks.items() if round(seconds * 1e6)]
+
+    def write(self, prefix, collection_path):
+        """Write prefix.json and prefix.folded; returns the report"""
+        import json
+        report = self.report(collection_path)
+        with open(prefix + '.json', 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        with open(prefix + '.folded', 'w', encoding='utf-8') as f:
+            f.write('\n'.join(self.folded_stacks()) + '\n')
+        return report
+
+PROFILE_PREFIX = 'add_postman_responses.profile'
+
+def print_profile(report, prefix, top=10):
+    print(f"\nProfile of {report['collection']} ({report['total'] * 1000:.1f} ms):")
+    for name, seconds in report['phases'].items():
+        note = '  (reading, parsing, serialization and writing; interleaved)' if name == STREAM_PHASE else ''
+        print(f"  {name:<14} {seconds * 1000:>9.2f} ms{note}")
+    generated = len(report['items']) - report['kept']
+    print(f"\n{len(report['items'])} items: {generated} generated or restyled, {report['kept']} kept as they were.")
+    if generated:
+        print(f"{report['mean_evaluated']} of {report['rules']} rules evaluated per generated item on average. "
+              f"Most matched rules:")
+        for label, hits in report['rule_hits'][:top]:
+            print(f"  {hits:>6}  {label}")
+    if report['fallback']:
+        print(f"\n{len(report['fallback'])} items got the default response:")
+        for endpoint in report['fallback'][:top]:
+            print(f"  {endpoint}")
+        if len(report['fallback']) > top:
+            print(f"  ... and {len(report['fallback']) - top} more")
+    print(f"\nWrote {prefix}.json and {prefix}.folded")
+
+def enrich_file(input_path, output_path=None, stream=False, use_cache=True, style=None, profiler=None):
+    """Add example responses to one collection file.
+
+    Returns 'updated' if output_path was written, 'unchanged' if an in-place
+    run had nothing to add, 'current' if the manifest shows the file is what
+    the last run wrote, or 'skipped' for a JSON file that is not a collection.
+    """
+    import json
+    from contextlib import nullcontext
+    from postman_collection import atomic_write
+
+    phase = profiler.phase if profiler is not None else lambda name: nullcontext()
+    if stream and not is_collection_file(input_path):
+        # Before the manifest, so none is written next to e.g. package.json
+        return 'skipped'
+    output_path = output_path or input_path
+    in_place = os.path.abspath(output_path) == os.path.abspath(input_path)
+    cache = None
+    if use_cache:
+        with phase('manifest'):
+            cache = ResponseManifest(manifest_path_for(output_path), style)
+            if in_place and cache.is_current(output_path):
+                return 'current'
+
+    on_item = profiler.on_item if profiler is not None else None
+    if stream:
+        with phase(STREAM_PHASE):
+            written = stream_collection(input_path, output_path, cache, style, on_item)
+    else:
+        with phase('load'), open(input_path, 'r', encoding='utf-8') as f:
+            collection = json.load(f)
+        if not isinstance(collection, dict) or not isinstance(collection.get('item'), list):
+            return 'skipped'
+        with phase('traversal'):
+            enriched = enrich_collection(collection, cache, style, on_item)
+        written = enriched is not collection or not in_place
+        if written and profiler is None:
+            atomic_write(output_path, lambda out: json.dump(enriched, out, indent='\t'))
+        elif written:
+            # Serialized up front, so encoding and disk time are reported apart
+            with phase('serialization'):
+                text = json.dumps(enriched, indent='\t')
+            with phase('write'):
+                atomic_write(output_path, lambda out: out.write(text))
+
+    if cache is not None:
+        with phase('manifest'):
+            cache.save(output_path)
+    return 'updated' if written else 'unchanged'
+
+# Batch mode: many collection files (per environment, per role, ...) are
+# enriched in place across a process pool, one file per task. A file that
+# fails is reported and the others carry on.
+
+ENVIRONMENT_SUFFIX = '.postman_environment.json'
+
+def find_collections(paths):
+    """Collection files named by paths; directories are searched recursively for *.json"""
+    files = []
+    for path in paths:
+        if not os.path.isdir(path):
+            files.append(os.path.normpath(path))
+            continue
+        for directory, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith('.') and d != 'node_modules')
+            files += [os.path.normpath(os.path.join(directory, filename)) for filename in sorted(filenames)
+                      if filename.endswith('.json') and not filename.startswith('.')
+                      and not filename.endswith(ENVIRONMENT_SUFFIX)]
+    return list(dict.fromkeys(files))
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+def _enrich_job(job):
+    """Worker: (path, stream, use cache, style) -> (path, status, error message, seconds)"""
+    import time
+    path, stream, use_cache, style = job
+    started = time.perf_counter()
+    try:
+        return path, enrich_file(path, None, stream, use_cache, style), None, time.perf_counter() - started
+    except Exception as e:
+        return path, 'error', f"{type(e).__name__}: {e}", time.perf_counter() - started
+
+def enrich_files(paths, jobs=1, stream=False, use_cache=True, progress=None, style=None):
+    """Enrich many collection files in place, in parallel when jobs > 1.
+
+    Returns {path: (status, error message)} in the order of paths. progress,
+    if given, is called as progress(done, total, path, status, error, seconds)
+    as each file finishes.
+    """
+    # Built before the pool forks, so every worker inherits the index instead of building its own
+    rule_index()
+    rules_version()
+    # Largest first, so a big collection does not start last and run alone
+    work = [(path, stream, use_cache, style) for path in sorted(paths, key=_file_size, reverse=True)]
+    results = {}
+
+    def record(path, status, error, seconds):
+        results[path] = (status, error)
+        if progress is not None:
+            progress(len(results), len(work), path, status, error, seconds)
+
+    if jobs > 1 and len(work) > 1:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(max_workers=min(jobs, len(work))) as pool:
+            futures = {pool.submit(_enrich_job, job): job[0] for job in work}
+            for future in as_completed(futures):
+                try:
+                    record(*future.result())
+                except Exception as e:
+                    # The worker process itself died (e.g. killed for memory)
+                    record(futures[future], 'error', f"{type(e).__name__}: {e}", 0.0)
+    else:
+        for job in work:
+            record(*_enrich_job(job))
+    return {path: results[path] for path in paths}
+
+BATCH_LABELS = {
+    'updated': ('✓', 'updated'),
+    'unchanged': ('-', 'unchanged'),
+    'current': ('-', 'unchanged since the last run'),
+    'skipped': ('-', 'not a collection'),
+    'error': ('✗', 'failed'),
+}
+
+def print_progress(done, total, path, status, error, seconds):
+    symbol, label = BATCH_LABELS[status]
+    line = f"[{done}/{total}] {symbol} {label.capitalize()}: {path}"
+    print(f"{line}: {error}" if error else f"{line} ({seconds:.2f} s)", flush=True)
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Add example responses to every request in Postman collections")
+    parser.add_argument('collection', nargs='*', default=[DEFAULT_COLLECTION],
+                        help="collection files, or directories searched for *.json collections, to update")
+    parser.add_argument('-o', '--output',
+                        help="write the result here instead of overwriting the input (one collection only)")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="worker processes when updating several collections (default: CPU count)")
+    parser.add_argument('--stream', action='store_true',
+                        help="process the collection item by item with bounded memory (for very large collections)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore and do not update the sidecar manifest of the previous run")
+    parser.add_argument('--compact', action='store_true',
+                        help="leave out each example's originalRequest where it is the same as the item's request")
+    parser.add_argument('--minify-bodies', action='store_true', help="write example bodies without indentation")
+    parser.add_argument('--profile', nargs='?', const=PROFILE_PREFIX, metavar='PREFIX',
+                        help="record phase timings and the rule each item matched in PREFIX.json, "
+                             f"and flame graph stacks in PREFIX.folded (default: {PROFILE_PREFIX})")
+    args = parser.parse_args(argv)
+    style = ExampleStyle(args.compact, args.minify_bodies)
+
+    if len(args.collection) == 1 and not os.path.isdir(args.collection[0]):
+        path = args.collection[0]
+        profiler = Profiler() if args.profile else None
+        status = enrich_file(path, args.output, args.stream, not args.no_cache, style, profiler)
+        if status == 'current':
+            print("Collection unchanged since the last run, nothing to do"
+                  + (" (use --no-cache to profile it)" if profiler else ""))
+        elif status == 'skipped':
+            print(f"{path} is not a Postman collection, left unchanged")
+        elif status == 'updated':
+            print("Successfully added example responses to all endpoints!")
+        else:
+            print("All endpoints already have example responses, collection left unchanged")
+        if profiler is not None and status != 'current':
+            print_profile(profiler.write(args.profile, path), args.profile)
+        return 0
+
+    if args.output:
+        parser.error("--output needs a single collection file")
+    if args.profile:
+        parser.error("--profile needs a single collection file")
+    files = find_collections(args.collection)
+    started = time.perf_counter()
+    results = enrich_files(files, args.jobs, args.stream, not args.no_cache, print_progress, style)
+    elapsed = time.perf_counter() - started
+
+    counts = {}
+    for status, _ in results.values():
+        counts[status] = counts.get(status, 0) + 1
+    summary = ', '.join(f"{counts[status]} {label}" for status, (_, label) in BATCH_LABELS.items() if status in counts)
+    print(f"\n{len(files)} collections in {elapsed:.2f} s ({len(files) / elapsed if elapsed else 0:.1f}/s): {summary}")
+    return 1 if counts.get('error') else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
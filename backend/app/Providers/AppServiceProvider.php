@@ -3,6 +3,9 @@
 namespace App\Providers;
 use App\Models\User;
 use App\Observers\UserObserver;
+use Illuminate\Database\Events\QueryExecuted;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Log;
 use Illuminate\Support\ServiceProvider;
 
 class AppServiceProvider extends ServiceProvider
@@ -21,5 +24,34 @@ public function register(): void
     public function boot(): void
     {
         User::observe(UserObserver::class);
+
+        if (config('logging.query_log')) {
+            $this->logQueries();
+        }
+    }
+
+    /**
+     * Log every query with the request it belongs to (see postman_query_log.py).
+     */
+    private function logQueries(): void
+    {
+        DB::listen(function (QueryExecuted $query) {
+            $request = request();
+
+            // Providers boot once per worker under Octane and queue:work, so the id is kept on the request
+            $requestId = $request->attributes->get('query_log_id');
+            if ($requestId === null) {
+                $requestId = $request->header('X-Replay-Id') ?: $request->header('X-Request-Id') ?: uniqid('', true);
+                $request->attributes->set('query_log_id', $requestId);
+            }
+
+            Log::channel('queries')->debug('query', [
+                'request_id' => $requestId,
+                'request' => $request->method() . ' /' . ltrim($request->path(), '/'),
+                'sql' => $query->sql,
+                'bindings' => $query->bindings,
+                'time' => $query->time,
+            ]);
+        });
     }
 }
@@ -127,6 +127,25 @@
             'path' => storage_path('logs/laravel.log'),
         ],
 
+        'queries' => [
+            'driver' => 'single',
+            'path' => storage_path('logs/queries.log'),
+            'level' => 'debug',
+        ],
+
     ],
 
+    /*
+    |--------------------------------------------------------------------------
+    | SQL Query Log
+    |--------------------------------------------------------------------------
+    |
+    | When enabled, every executed query is written to the "queries" channel
+    | together with the request it ran for. postman_query_log.py replays the
+    | Postman collection and reads this log to find N+1 queries.
+    |
+    */
+
+    'query_log' => env('DB_QUERY_LOG', false),
+
 ];
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Throughput of add_postman_responses.py in batch mode as worker processes are added.
+
+Writes a set of seeded synthetic collections (see corpus.py) and
+enriches a fresh copy of it with 1, 2, 4, ... processes, up to --jobs.
+
+    python benchmarks/bench_batch_collections.py --collections 300 --requests 500 --jobs 8
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(BENCHMARKS), BENCHMARKS]
+
+import add_postman_responses  # noqa: E402
+import corpus  # noqa: E402
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark batch enrichment of many collections")
+    parser.add_argument('--collections', type=int, default=300)
+    parser.add_argument('--requests', type=int, default=500, help="requests per collection")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="largest worker count to try")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'source')
+        os.makedirs(source)
+        corpus.write_collection(os.path.join(source, 'collection-0.json'), args.requests, args.seed)
+        for i in range(1, args.collections):
+            shutil.copyfile(os.path.join(source, 'collection-0.json'), os.path.join(source, f'collection-{i}.json'))
+        print(f"{args.collections} collections of {args.requests} requests, {os.cpu_count()} CPUs\n")
+
+        print(f"{'jobs':>5} {'seconds':>8} {'files/s':>8} {'speedup':>8}")
+        counts = [1]
+        while counts[-1] * 2 <= args.jobs:
+            counts.append(counts[-1] * 2)
+        if counts[-1] != args.jobs:
+            counts.append(args.jobs)
+        serial = None
+        for jobs in counts:
+            work = os.path.join(tmp, f'run-{jobs}')
+            shutil.copytree(source, work)
+            files = add_postman_responses.find_collections([work])
+            started = time.perf_counter()
+            results = add_postman_responses.enrich_files(files, jobs, use_cache=False)
+            seconds = time.perf_counter() - started
+            assert all(status == 'updated' for status, _ in results.values())
+            serial = serial or seconds
+            print(f"{jobs:>5} {seconds:>8.2f} {len(files) / seconds:>8.1f} {serial / seconds:>7.2f}x")
+            shutil.rmtree(work)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Wall-clock time of frontend/update_all_pages.py over a synthetic tree of components.
+
+Most files in a real tree need nothing: they have no Arabic text or already
+import the useLanguage hook. The seeded tree (see corpus.py) mixes those with
+a share of files that do need the codemod. The first three runs are
+--dry-run so the tree is reused:
+
+  decode all    Path.glob per pattern, every file decoded and checked by
+                should_update_file (the old main loop)
+  prefilter     single pruned walk and byte prefilter, one process
+  parallel      the same with a process pool (--jobs)
+  manifest      a re-run after the codemod was applied, with nothing changed since
+
+    python benchmarks/bench_codemod_tree.py --files 10000 --jobs 8
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS)
+sys.path[:0] = [os.path.join(ROOT, 'frontend'), BENCHMARKS]
+
+import corpus  # noqa: E402
+import update_all_pages  # noqa: E402
+
+LOCALE = os.path.join(ROOT, 'frontend', 'locales', 'ar.json')
+
+def decode_all(root, include):
+    """The old main loop: a Path.glob per pattern, decoding every file before deciding whether it needs work"""
+    engine = update_all_pages.default_engine(LOCALE)
+    changed = 0
+    for pattern in include:
+        for file_path in root.glob(pattern):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            if update_all_pages.should_update_file(content):
+                changed += update_all_pages.update_file(file_path, engine, write=False, base_path=root)
+    return changed
+
+def timed(func, *args):
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        result = func(*args)
+    return time.perf_counter() - started, result, output.getvalue()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark update_all_pages.py on a synthetic component tree")
+    parser.add_argument('--files', type=int, default=10000)
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--pending', type=float, default=0.05, help="share of files that need the codemod")
+    parser.add_argument('--converted', type=float, default=0.25, help="share already importing useLanguage")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pending = corpus.write_page_tree(tmp, args.files, args.seed, args.pending, args.converted)
+        include = ['app/**/*.tsx', 'components/**/*.tsx']
+        print(f"{args.files} files, {pending} need the codemod\n")
+
+        root = Path(tmp)
+        decode_all(root, include)  # warm the page cache
+        baseline, changed, _ = timed(decode_all, root, include)
+        cli = ['--root', tmp, '--dry-run', '--locale', LOCALE]
+        cli += [arg for pattern in include for arg in ('--include', pattern)]
+        serial, _, serial_output = timed(update_all_pages.main, cli + ['--jobs', '1'])
+        parallel, _, parallel_output = timed(update_all_pages.main, cli + ['--jobs', str(args.jobs)])
+        assert changed == pending and serial_output == parallel_output
+        # Apply the codemod once so the manifest is written, then time a run with nothing changed
+        timed(update_all_pages.main, cli[:2] + cli[3:] + ['--jobs', '1'])
+        rerun, _, _ = timed(update_all_pages.main, cli[:2] + cli[3:] + ['--jobs', '1'])
+
+        print(f"{'mode':<28} {'seconds':>8} {'speedup':>8}")
+        for label, seconds in (('decode all', baseline), ('prefilter', serial),
+                               (f'prefilter + {args.jobs} processes', parallel), ('manifest, nothing changed', rerun)):
+            print(f"{label:<28} {seconds:>8.2f} {baseline / seconds:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
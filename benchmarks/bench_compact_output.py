@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Output size of add_postman_responses.py with --compact and --minify-bodies.
+
+Three inputs are enriched in each mode:
+
+  collection   ACE_API_Postman_Collection.json as committed (examples already
+               present, so only the restyling of existing examples applies)
+  regenerated  the same collection with its examples removed first
+  synthetic    a seeded synthetic collection of --requests requests (see corpus.py)
+
+    python benchmarks/bench_compact_output.py --requests 20000
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS)
+sys.path[:0] = [ROOT, BENCHMARKS]
+
+import add_postman_responses  # noqa: E402
+import corpus  # noqa: E402
+from postman_collection import iter_requests, load_collection, save_collection  # noqa: E402
+
+MODES = [
+    ('default', False, False),
+    ('--compact', True, False),
+    ('--minify-bodies', False, True),
+    ('both', True, True),
+]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare collection sizes across the compact output options")
+    parser.add_argument('--requests', type=int, default=20000, help="requests in the synthetic collection")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs = {'collection': os.path.join(ROOT, 'ACE_API_Postman_Collection.json')}
+        collection = load_collection(inputs['collection'])
+        for _, item in iter_requests(collection['item']):
+            item.pop('response', None)
+        inputs['regenerated'] = os.path.join(tmp, 'regenerated.json')
+        save_collection(collection, inputs['regenerated'])
+        inputs['synthetic'] = os.path.join(tmp, 'synthetic.json')
+        corpus.write_collection(inputs['synthetic'], args.requests, args.seed)
+
+        print(f"{'input':<12} {'mode':<16} {'bytes':>12} {'reduction':>10} {'seconds':>8}")
+        for label, path in inputs.items():
+            baseline = None
+            for mode, compact, minify in MODES:
+                output = os.path.join(tmp, 'out.json')
+                shutil.copyfile(path, output)
+                style = add_postman_responses.ExampleStyle(compact, minify)
+                started = time.perf_counter()
+                add_postman_responses.enrich_file(output, use_cache=False, style=style)
+                seconds = time.perf_counter() - started
+                size = os.path.getsize(output)
+                with open(output, 'r', encoding='utf-8') as f:
+                    json.load(f)
+                baseline = baseline or size
+                print(f"{label:<12} {mode:<16} {size:>12,} {1 - size / baseline:>9.1%} {seconds:>8.2f}")
+
+if __name__ == '__main__':
+    main()
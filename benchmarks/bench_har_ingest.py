@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Throughput and peak memory of postman_har_ingest.py as HAR captures grow.
+
+Writes a seeded synthetic collection (see corpus.py) and HAR files of
+--entries entries against it, with list responses of varying length, then
+ingests each capture in a fresh process. Peak RSS should stay flat while
+the capture grows.
+
+    python benchmarks/bench_har_ingest.py --requests 2000 --entries 10000 50000 200000
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS)
+sys.path[:0] = [ROOT, BENCHMARKS]
+
+import corpus  # noqa: E402
+from postman_collection import iter_requests, request_method, request_segments  # noqa: E402
+
+def write_har(path, collection, entries, seed=0):
+    """A HAR file of `entries` GET/POST/... entries whose URLs match items of collection"""
+    rng = random.Random(seed)
+    requests = [(request_method(item), request_segments(item)) for _, item in iter_requests(collection['item'])]
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"log": {"version": "1.2", "creator": {"name": "bench_har_ingest"}, "entries": [\n')
+        for index in range(entries):
+            method, segments = requests[rng.randrange(len(requests))]
+            url = 'http://localhost:8000/api/' + '/'.join(str(rng.randint(1, 999)) if s.startswith((':', '{'))
+                                                          else s for s in segments)
+            status = 200 if rng.random() < 0.9 else rng.choice([401, 404, 422])
+            body = {'data': [{'id': i, 'email': f'user{i}@ace.test', 'title': 'Item ' * rng.randint(1, 20),
+                              'access_token': 'secret'} for i in range(rng.randint(1, 40))]}
+            entry = {
+                'startedDateTime': '2026-01-01T00:00:00.000Z',
+                'request': {'method': method, 'url': url, 'headers': []},
+                'response': {'status': status, 'headers': [{'name': 'Content-Type', 'value': 'application/json'}],
+                             'content': {'mimeType': 'application/json', 'text': json.dumps(body)}},
+            }
+            f.write((',\n' if index else '') + json.dumps(entry, indent=2))
+        f.write('\n]}}\n')
+
+def measure(collection_path, har_path):
+    """Ingest one capture in this process: (seconds, peak RSS in MB)"""
+    sys.path.insert(0, ROOT)
+    import contextlib
+    import io
+    import postman_har_ingest
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        postman_har_ingest.main([har_path, '--collection', collection_path, '--dry-run'])
+    seconds = time.perf_counter() - started
+    with open('/proc/self/status', 'r') as f:
+        rss = next(int(line.split()[1]) / 1024 for line in f if line.startswith('VmHWM:'))
+    return seconds, rss
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark HAR ingestion by capture size")
+    parser.add_argument('--requests', type=int, default=2000, help="requests in the synthetic collection")
+    parser.add_argument('--entries', type=int, nargs='+', default=[10000, 50000, 200000], help="HAR entries")
+    parser.add_argument('--child', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure(*args.child)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        collection_path = os.path.join(tmp, 'collection.json')
+        corpus.write_collection(collection_path, args.requests)
+        collection = corpus.collection(args.requests)
+        print(f"{'entries':>9} {'HAR MB':>8} {'seconds':>8} {'entries/s':>10} {'RSS MB':>8}")
+        for entries in args.entries:
+            har_path = os.path.join(tmp, f'capture-{entries}.har')
+            write_har(har_path, collection, entries)
+            child = [sys.executable, os.path.abspath(__file__), '--child', collection_path, har_path]
+            seconds, rss = json.loads(subprocess.run(child, check=True, capture_output=True, text=True).stdout)
+            size = os.path.getsize(har_path) / (1 << 20)
+            print(f"{entries:>9} {size:>8.1f} {seconds:>8.2f} {entries / seconds:>10.0f} {rss:>8.1f}")
+            os.unlink(har_path)
+
+if __name__ == '__main__':
+    main()
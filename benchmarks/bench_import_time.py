@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Import time of add_postman_responses and the cost of one enrich_collection()
+call on ACE_API_Postman_Collection.json.
+
+Each import is timed in a fresh interpreter with -X importtime, after a
+warm-up run that writes the bytecode cache to a temporary pycache prefix,
+so the numbers are those of an installed module rather than a first compile.
+
+    python benchmarks/bench_import_time.py --runs 20
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODULE = 'add_postman_responses'
+
+def import_us(prefix):
+    """Cumulative import time of MODULE in microseconds, in a fresh process"""
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-X', f'pycache_prefix={prefix}',
+                             '-c', f'import {MODULE}'],
+                            cwd=ROOT, env=env, check=True, capture_output=True, text=True)
+    line = next(line for line in result.stderr.splitlines() if line.rstrip().endswith(f'| {MODULE}'))
+    return int(line.split('|')[1])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time importing add_postman_responses and enriching a collection")
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as prefix:
+        import_us(prefix)
+        samples = sorted(import_us(prefix) / 1000 for _ in range(args.runs))
+    print(f"import {MODULE}: median {statistics.median(samples):.1f} ms, "
+          f"min {samples[0]:.1f} ms, max {samples[-1]:.1f} ms over {args.runs} processes")
+
+    import add_postman_responses
+    from postman_collection import iter_requests
+    with open(os.path.join(ROOT, 'ACE_API_Postman_Collection.json'), 'r', encoding='utf-8') as f:
+        collection = json.load(f)
+    # Drop the examples so every request gets one
+    for _, item in iter_requests(collection['item']):
+        item.pop('response', None)
+    started = time.perf_counter()
+    add_postman_responses.enrich_collection(collection)
+    first = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(args.runs):
+        add_postman_responses.enrich_collection(collection)
+    warm = (time.perf_counter() - started) / args.runs
+    print(f"enrich_collection: first call {first * 1000:.1f} ms (builds the rule index), "
+          f"then {warm * 1000:.1f} ms per call")
+
+if __name__ == '__main__':
+    main()
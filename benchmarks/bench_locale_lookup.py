@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Cost of a t() lookup: the nested walk LanguageContext used to do versus the
+flat tables written by frontend/build_locale_tables.py.
+
+The workload is every static t() reference in the frontend source (each
+render of a page repeats roughly its share of these), looked up in both
+languages. The same comparison runs in Python and, when `node` is on the
+PATH, in JavaScript against the real generated tables, since that is where
+t() runs.
+
+    python benchmarks/bench_locale_lookup.py --rounds 200
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FRONTEND = os.path.join(ROOT, 'frontend')
+sys.path.insert(0, FRONTEND)
+
+from build_locale_tables import flat_table  # noqa: E402
+from translation_keys import LANGUAGES, load_locale, scan_tree  # noqa: E402
+
+NODE_SCRIPT = r"""
+const fs = require("fs");
+const [nestedPaths, flatPaths, keys, rounds] = JSON.parse(fs.readFileSync(0, "utf8"));
+const nested = nestedPaths.map((p) => JSON.parse(fs.readFileSync(p, "utf8")));
+const flat = flatPaths.map((p) => Object.freeze(JSON.parse(fs.readFileSync(p, "utf8"))));
+
+function walk(translations, key) {
+  let value = translations;
+  for (const k of key.split(".")) {
+    if (value && typeof value === "object" && k in value) value = value[k];
+    else return key;
+  }
+  return typeof value === "string" ? value : key;
+}
+function lookup(table, key) {
+  const value = table[key];
+  return typeof value === "string" ? value : key;
+}
+function time(fn, tables) {
+  let best = Infinity, sink = 0;
+  for (let r = 0; r < 5; r++) {
+    const started = process.hrtime.bigint();
+    for (let i = 0; i < rounds; i++)
+      for (const table of tables) for (const key of keys) sink += fn(table, key).length;
+    best = Math.min(best, Number(process.hrtime.bigint() - started) / 1e6);
+  }
+  return [best, sink];
+}
+const [nestedMs, a] = time(walk, nested);
+const [flatMs, b] = time(lookup, flat);
+if (a !== b) throw new Error("results differ");
+console.log(JSON.stringify({ nested: nestedMs, flat: flatMs }));
+"""
+
+def nested_walk(locale, key):
+    """The lookup LanguageContext's t() did before the flat tables"""
+    value = locale
+    for part in key.split('.'):
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            return key
+    return value if isinstance(value, str) else key
+
+def flat_lookup(table, key):
+    value = table.get(key)
+    return value if isinstance(value, str) else key
+
+def best_of(repeat, func, tables, keys, rounds):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for table in tables:
+                for key in keys:
+                    func(table, key)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark nested versus flat translation lookups")
+    parser.add_argument('--rounds', type=int, default=100, help="passes over the used keys per timing")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--no-node', action='store_true', help="skip the JavaScript comparison")
+    args = parser.parse_args(argv)
+
+    nested_paths = [os.path.join(FRONTEND, 'locales', f'{lang}.json') for lang in LANGUAGES]
+    flat_paths = [os.path.join(FRONTEND, 'locales', 'flat', f'{lang}.json') for lang in LANGUAGES]
+    nested = [load_locale(path)[0] for path in nested_paths]
+    flat = [flat_table(locale) for locale in nested]
+    known = {key for table in flat for key in table}
+    usages, _, _ = scan_tree(FRONTEND, known)
+    keys = [usage.key for usage in usages if usage.kind == 't']
+    for table, locale in zip(flat, nested):
+        assert [flat_lookup(table, k) for k in keys] == [nested_walk(locale, k) for k in keys]
+
+    lookups = args.rounds * len(keys) * len(LANGUAGES)
+    print(f"{len(keys)} t() references ({len(set(keys))} distinct keys), {lookups:,} lookups per timing\n")
+    print(f"{'runtime':<10} {'nested ms':>10} {'flat ms':>9} {'flat ns':>10} {'speedup':>8}")
+    results = [('python', best_of(args.repeat, nested_walk, nested, keys, args.rounds),
+                best_of(args.repeat, flat_lookup, flat, keys, args.rounds))]
+    node = shutil.which('node')
+    if node and not args.no_node:
+        if not all(os.path.exists(path) for path in flat_paths):
+            raise SystemExit("Run frontend/build_locale_tables.py first")
+        payload = json.dumps([nested_paths, flat_paths, keys, args.rounds])
+        output = subprocess.run([node, '-e', NODE_SCRIPT], input=payload, capture_output=True, text=True, check=True)
+        timings = json.loads(output.stdout)
+        results.append(('node', timings['nested'], timings['flat']))
+    for runtime, nested_ms, flat_ms in results:
+        print(f"{runtime:<10} {nested_ms:>10.1f} {flat_ms:>9.1f} {flat_ms * 1e6 / lookups:>10.1f} "
+              f"{nested_ms / flat_ms:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
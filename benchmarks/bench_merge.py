@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Scaling of postman_merge.py with collection size.
+
+For each size a seeded synthetic collection (see corpus.py) with examples is
+the base; ours changes request bodies and adds requests, theirs changes
+examples, deletes requests and adds a folder, and a few items are edited on
+both sides so they conflict. Merge time per item should stay flat as the
+collections grow.
+
+    python benchmarks/bench_merge.py --sizes 1000 10000 50000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.dirname(BENCHMARKS), BENCHMARKS]
+
+import corpus  # noqa: E402
+from add_postman_responses import enrich_collection  # noqa: E402
+from postman_collection import iter_requests  # noqa: E402
+from postman_merge import merge_collections  # noqa: E402
+
+def _new_request(name, path):
+    return {'name': name, 'request': {'method': 'GET', 'url': {'raw': '{{base_url}}/' + path, 'path': path.split('/')}}}
+
+def versions(size, seed):
+    """(base, ours, theirs) collections of size requests with about 1% of the items edited on each side"""
+    base, ours, theirs = (enrich_collection(corpus.collection(size, seed)) for _ in range(3))
+    rng = random.Random(seed)
+    edits = max(size // 100, 1)
+    our_items = [item for _, item in iter_requests(ours['item'])]
+    their_items = [item for _, item in iter_requests(theirs['item'])]
+    for position in rng.sample(range(size), edits):
+        our_items[position]['request'] = dict(our_items[position]['request'], body={'mode': 'raw', 'raw': '{}'})
+    for position in rng.sample(range(size), edits):
+        their_items[position]['response'] = their_items[position]['response'] + [{'name': 'Error', 'code': 422}]
+    for position in rng.sample(range(size), max(edits // 10, 1)):
+        our_items[position]['name'] += ' (ours)'
+        their_items[position]['name'] += ' (theirs)'
+    ours['item'][0]['item'] += [_new_request(f'Ours {i}', f'ours/{i}') for i in range(edits)]
+    theirs['item'].append({'name': 'Theirs', 'item': [_new_request(f'Theirs {i}', f'theirs/{i}') for i in range(edits)]})
+    doomed = {id(their_items[position]) for position in rng.sample(range(size), edits // 2)}
+    stack = [theirs['item']]
+    while stack:
+        items = stack.pop()
+        items[:] = [item for item in items if id(item) not in doomed]
+        stack.extend(item['item'] for item in items if 'item' in item)
+    return base, ours, theirs
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark three-way collection merges by size")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000], help="requests per collection")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per size; the fastest is kept")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'requests':>9} {'seconds':>8} {'us/item':>8} {'merged':>8} {'conflicts':>9}")
+    for size in args.sizes:
+        base, ours, theirs = versions(size, args.seed)
+        best = None
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            merged, conflicts = merge_collections(base, ours, theirs)
+            seconds = time.perf_counter() - started
+            best = seconds if best is None else min(best, seconds)
+        count = sum(1 for _ in iter_requests(merged['item']))
+        print(f"{size:>9} {best:>8.3f} {best / size * 1e6:>8.1f} {count:>8} {len(conflicts):>9}")
+
+if __name__ == '__main__':
+    main()
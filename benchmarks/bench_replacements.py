@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Throughput of the i18n codemod's replacement step in frontend/update_all_pages.py.
+
+Compares the old per-key loop (two re.sub passes and a split per key) with
+the single-scan ReplacementEngine. Dictionaries are taken from the flattened
+frontend/locales/ar.json, up to the full locale. Seeded synthetic pages of
+growing size (see corpus.py) mix JSX text nodes, attribute literals and
+plain code. The
+engine's time per KB should stay flat as both the file and the dictionary
+grow.
+
+    python benchmarks/bench_replacements.py --keys 60 500 2000 --sizes 16 64 256 1024
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS)
+sys.path[:0] = [os.path.join(ROOT, 'frontend'), BENCHMARKS]
+
+import corpus  # noqa: E402
+import update_all_pages  # noqa: E402
+
+def locale_dictionary(path):
+    """Flatten ar.json into {arabic text: dotted key}, first key wins"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    flat = {}
+    stack = [('', data)]
+    while stack:
+        prefix, node = stack.pop()
+        for key, value in reversed(list(node.items())):
+            dotted = f'{prefix}.{key}' if prefix else key
+            if isinstance(value, dict):
+                stack.append((dotted, value))
+            elif isinstance(value, str) and value and '"' not in value and '<' not in value and '>' not in value:
+                flat.setdefault(value, dotted)
+    return flat
+
+def legacy_replace(content, replacements):
+    """The replacement loop update_file used before the single-scan engine"""
+    for arabic, key in replacements.items():
+        pattern1 = f'>{re.escape(arabic)}<'
+        replacement1 = f'>{{t("{key}")}}<'
+        content = re.sub(pattern1, replacement1, content)
+        pattern2 = f'"{re.escape(arabic)}"'
+        replacement2 = f'{{t("{key}")}}'
+        if '>' in content.split(pattern2)[0][-50:]:
+            content = re.sub(pattern2, replacement2, content)
+    return content
+
+def best_of(repeat, func, *args):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the codemod's replacement step")
+    parser.add_argument('--locale', default=os.path.join(ROOT, 'frontend', 'locales', 'ar.json'))
+    parser.add_argument('--keys', type=int, nargs='+', default=[60, 500, 2000])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[16, 64, 256, 1024], help="file sizes in KB")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--legacy-budget', type=float, default=2e8,
+                        help="skip the old loop when keys x bytes exceeds this (it is quadratic-ish)")
+    args = parser.parse_args(argv)
+
+    locale = locale_dictionary(args.locale)
+    print(f"{len(locale)} distinct strings in {os.path.relpath(args.locale, ROOT)}\n")
+    print(f"{'keys':>6} {'file KB':>8} {'compile ms':>11} {'engine ms':>10} {'us/KB':>7} {'legacy ms':>10} {'speedup':>8}")
+    for keys in args.keys:
+        dictionary = dict(list(locale.items())[:keys])
+        started = time.perf_counter()
+        engine = update_all_pages.compile_replacements(dictionary)
+        compile_ms = (time.perf_counter() - started) * 1000
+        texts = [(key, text) for text, key in dictionary.items()]
+        for size_kb in args.sizes:
+            source = corpus.page_source(texts, size_kb, args.seed)
+            engine_s = best_of(args.repeat, update_all_pages.apply_replacements, source, engine)
+            if len(dictionary) * len(source) <= args.legacy_budget:
+                legacy_s = best_of(1, legacy_replace, source, dictionary)
+                assert legacy_replace(source, dictionary).count('{t("') >= 1
+                legacy = f'{legacy_s * 1000:>10.1f} {legacy_s / engine_s:>7.0f}x'
+            else:
+                legacy = f"{'-':>10} {'-':>8}"
+            print(f"{len(dictionary):>6} {size_kb:>8} {compile_ms:>11.1f} {engine_s * 1000:>10.2f} "
+                  f"{engine_s * 1e6 / size_kb:>7.2f} {legacy}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Peak memory of add_postman_responses.py in-memory vs --stream mode.
+
+Builds seeded synthetic collections of growing size (see corpus.py) and
+runs each mode in a fresh process so ru_maxrss reflects that run alone.
+
+    python benchmarks/bench_stream_memory.py --requests 1000 10000 100000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS)
+sys.path.insert(0, BENCHMARKS)
+
+import corpus  # noqa: E402
+
+CHILD = """
+import resource, sys
+sys.path.insert(0, {root!r})
+import add_postman_responses as m
+if {stream!r}:
+    m.stream_collection({src!r}, {dst!r})
+else:
+    m.main([{src!r}, '-o', {dst!r}])
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+def peak_rss_kb(src, dst, stream):
+    code = CHILD.format(root=ROOT, src=src, dst=dst, stream=stream)
+    result = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True)
+    return int(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'requests':>10} {'input MB':>10} {'in-memory MB':>14} {'stream MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for requests in args.requests:
+            src = os.path.join(tmp, 'collection.json')
+            dst = os.path.join(tmp, 'out.json')
+            corpus.write_collection(src, requests, args.seed)
+            size_mb = os.path.getsize(src) / 1e6
+            in_memory = peak_rss_kb(src, dst, False) / 1024
+            streamed = peak_rss_kb(src, dst, True) / 1024
+            print(f"{requests:>10} {size_mb:>10.1f} {in_memory:>14.1f} {streamed:>10.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for add_postman_responses.py and frontend/update_all_pages.py.
+
+Generates seeded synthetic inputs (see corpus.py) and measures each stage
+of both tools per input size:
+
+  collection.load       json.load of the collection file
+  collection.enrich     enrich_collection() on the loaded collection
+  collection.dump       writing the enriched collection
+  collection.stream     stream_collection() from file to file
+  codemod.scan          file discovery and the byte prefilter over the tree
+  codemod.transform     update_content() on every file that needs it
+  codemod.run           the whole CLI in --dry-run mode, one process
+
+Every stage runs in a fresh process after its setup, so one stage's memory
+does not leak into the next. The suite records:
+
+- wall time (best of --repeat runs);
+- peak RSS during the stage (VmHWM, reset after setup);
+- peak allocated memory under tracemalloc, measured in a separate run.
+
+Results can be saved as a baseline and compared with one later:
+
+    python benchmarks/bench_suite.py --save
+    python benchmarks/bench_suite.py --compare --threshold 0.10
+    python benchmarks/bench_suite.py --collections 1000 --trees 500 --stages collection.enrich codemod.run
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS)
+DEFAULT_BASELINE = '.bench_baseline.json'
+LOCALE = os.path.join(ROOT, 'frontend', 'locales', 'ar.json')
+INCLUDE = ['app/**/*.tsx', 'components/**/*.tsx']
+
+# Stages: setup(input path) -> run(), a function that performs the stage once
+
+def _load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def collection_load(path):
+    return lambda: _load(path)
+
+def collection_enrich(path):
+    import add_postman_responses
+    collection = _load(path)
+    return lambda: add_postman_responses.enrich_collection(collection)
+
+def collection_dump(path):
+    import add_postman_responses
+    enriched = add_postman_responses.enrich_collection(_load(path))
+    output = path + '.out'
+
+    def run():
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(enriched, f, indent='\t')
+    return run
+
+def collection_stream(path):
+    import add_postman_responses
+    return lambda: add_postman_responses.stream_collection(path, path + '.out')
+
+def codemod_scan(root):
+    import update_all_pages
+    return lambda: [relative for relative in update_all_pages.find_files(Path(root), INCLUDE, [])
+                    if update_all_pages.may_need_update(os.path.join(root, relative))]
+
+def codemod_transform(root):
+    import update_all_pages
+    from jsx_index import is_jsx, lex
+    engine = update_all_pages.default_engine(LOCALE)
+    sources = []
+    for relative in update_all_pages.find_files(Path(root), INCLUDE, []):
+        with open(os.path.join(root, relative), 'r', encoding='utf-8') as f:
+            content = f.read()
+        if update_all_pages.should_update_file(content):
+            sources.append((relative, content))
+
+    def run():
+        # lex() rather than index_for(), whose cache would make a second run free
+        for relative, content in sources:
+            namespaces = update_all_pages.route_namespaces(relative, engine.namespaces)
+            update_all_pages.update_content(content, engine, namespaces, lex(content, is_jsx(relative)))
+    return run
+
+def codemod_run(root):
+    import update_all_pages
+    argv = ['--root', root, '--dry-run', '--no-manifest', '--jobs', '1', '--locale', LOCALE]
+    argv += [arg for pattern in INCLUDE for arg in ('--include', pattern)]
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            update_all_pages.main(argv)
+    return run
+
+STAGES = {
+    'collection.load': collection_load,
+    'collection.enrich': collection_enrich,
+    'collection.dump': collection_dump,
+    'collection.stream': collection_stream,
+    'codemod.scan': codemod_scan,
+    'codemod.transform': codemod_transform,
+    'codemod.run': codemod_run,
+}
+
+# Measurement, in the child process
+
+def _peak_rss_mb():
+    with open('/proc/self/status', 'r') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _reset_peak_rss():
+    """Make VmHWM start again from the current RSS (Linux); elsewhere the peak includes setup"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+def measure(stage, path, trace=False):
+    sys.path[:0] = [ROOT, os.path.join(ROOT, 'frontend')]
+    run = STAGES[stage](path)
+    if trace:
+        import tracemalloc
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {'alloc_mb': peak / (1 << 20)}
+    _reset_peak_rss()
+    started = time.perf_counter()
+    run()
+    return {'wall_s': time.perf_counter() - started, 'rss_mb': _peak_rss_mb()}
+
+# Suite, in the parent process
+
+def run_child(stage, path, trace=False):
+    argv = [sys.executable, os.path.abspath(__file__), '--child', stage, path] + (['--trace'] if trace else [])
+    result = subprocess.run(argv, check=True, capture_output=True, text=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def run_suite(collections, trees, stages, repeat, seed, trace=True, log=None):
+    """{'stage@size': {'wall_s', 'rss_mb', 'alloc_mb'}} for every stage and input size"""
+    import corpus
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs = []
+        for size in collections:
+            path = os.path.join(tmp, f'collection-{size}.json')
+            corpus.write_collection(path, size, seed)
+            inputs += [(stage, size, path) for stage in stages if stage.startswith('collection.')]
+        for size in trees:
+            root = os.path.join(tmp, f'tree-{size}')
+            corpus.write_page_tree(root, size, seed)
+            inputs += [(stage, size, root) for stage in stages if stage.startswith('codemod.')]
+        for stage, size, path in inputs:
+            runs = [run_child(stage, path) for _ in range(repeat)]
+            row = min(runs, key=lambda r: r['wall_s'])
+            if trace:
+                row.update(run_child(stage, path, trace=True))
+            results[f'{stage}@{size}'] = row
+            if log is not None:
+                log(f'{stage}@{size}', row)
+    return results
+
+COLUMNS = (('wall_s', 's', '{:>9.3f}'), ('rss_mb', 'RSS MB', '{:>9.1f}'), ('alloc_mb', 'alloc MB', '{:>9.1f}'))
+
+def format_header(baseline=False):
+    header = f"{'stage@size':<30}"
+    for _, label, _ in COLUMNS:
+        header += f" {label:>9}" + (f" {'vs base':>8}" if baseline else '')
+    return header
+
+def format_row(name, row, base=None, threshold=None):
+    line = f"{name:<30}"
+    regressed = False
+    for metric, _, fmt in COLUMNS:
+        value = row.get(metric)
+        line += ' ' + (fmt.format(value) if value is not None else f"{'-':>9}")
+        if base is not None:
+            old = base.get(metric)
+            if value is None or not old:
+                line += f" {'-':>8}"
+                continue
+            change = value / old - 1
+            regressed |= change > threshold
+            line += f" {change:>+7.1%}{'!' if change > threshold else ' '}"
+    return line + ('  REGRESSION' if regressed else ''), regressed
+
+def current_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short=12', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark add_postman_responses.py and update_all_pages.py stages")
+    parser.add_argument('--collections', type=int, nargs='*', default=[1000, 10000, 100000],
+                        help="collection sizes in requests (default: 1000 10000 100000)")
+    parser.add_argument('--trees', type=int, nargs='*', default=[1000, 10000],
+                        help="page tree sizes in files (default: 1000 10000)")
+    parser.add_argument('--stages', nargs='+', choices=sorted(STAGES), default=list(STAGES))
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per stage; the fastest is kept")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-trace', action='store_true', help="skip the tracemalloc runs")
+    parser.add_argument('--save', nargs='?', const=DEFAULT_BASELINE, metavar='PATH',
+                        help=f"save the results as a baseline (default: {DEFAULT_BASELINE})")
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, metavar='PATH',
+                        help="compare with a saved baseline; exit with status 1 on a regression")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="relative increase of any metric that counts as a regression (default: 0.10)")
+    parser.add_argument('--child', nargs=2, metavar=('STAGE', 'INPUT'), help=argparse.SUPPRESS)
+    parser.add_argument('--trace', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure(args.child[0], args.child[1], args.trace)))
+        return 0
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"Baseline: {args.compare} (commit {baseline['commit']}, {baseline['created_at']})\n")
+
+    print(format_header())
+    results = run_suite(args.collections, args.trees, args.stages, args.repeat, args.seed, not args.no_trace,
+                        log=lambda name, row: print(format_row(name, row)[0], flush=True))
+
+    status = 0
+    if baseline is not None:
+        print('\n' + format_header(baseline=True))
+        for name, row in results.items():
+            base = baseline['results'].get(name)
+            line, regressed = format_row(name, row, base or {}, args.threshold)
+            print(line if base else f"{line}  (not in baseline)")
+            status |= regressed
+    if args.save:
+        data = {
+            'commit': current_commit(),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'machine': f'{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs',
+            'results': results,
+        }
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        print(f"\nSaved baseline to {args.save}")
+    return status
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Seeded generators for synthetic benchmark inputs.
+
+collection(requests, seed) builds a Postman collection shaped like
+ACE_API_Postman_Collection.json. It has the same 15 top-level folders and
+their subfolders, with requests spread over them in the same proportions,
+and the same mix of methods, auth headers and JSON bodies.
+
+write_page_tree(root, pages, seed) writes a Next.js tree shaped like
+frontend/app: role/section/[id] pages and components, mixing English
+markup, Arabic text from frontend/locales/ar.json (some of it already
+converted to t() calls) and Arabic text the locale does not have.
+page_source(texts, size_kb, seed) is one such page of a given size.
+
+The same arguments always give byte-identical output.
+
+    python benchmarks/corpus.py collection 10000 /tmp/collection.json
+    python benchmarks/corpus.py pages 1000 /tmp/tree
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (folder, requests in the real collection, subfolders)
+FOLDERS = [
+    ('Authentication', 9, []),
+    ('Notifications', 6, []),
+    ('Admin', 21, ['Dashboard', 'Users', 'Teachers', 'Courses', 'Companies', 'Profile']),
+    ('Company', 17, ['Dashboard', 'Profile', 'Jobs', 'Applications']),
+    ('University Student', 18, ['Profile', 'CV Management', 'Courses', 'Jobs', 'Applications']),
+    ('Teacher', 14, ['Profile', 'Courses', 'Lessons']),
+    ('Parent', 8, ['Profile', 'Students']),
+    ('Student', 9, ['Profile', 'Courses', 'Follow Requests']),
+    ('Courses (Public)', 1, []),
+    ('Payments', 6, ['Stripe', 'PayPal']),
+    ('Live Streaming', 7, ['Student', 'Teacher', 'Chat']),
+    ('AI Career Mentor', 7, []),
+    ('Didit (Identity Verification)', 3, []),
+    ('Video Streaming', 1, []),
+    ('Storage', 1, []),
+]
+
+# (method, name pattern, path suffix, has body), close to the real mix of
+# 43% POST, 40% GET, 9% PUT and 8% DELETE
+ACTIONS = [
+    ('GET', 'Get All {plural}', '', False),
+    ('GET', 'Get {singular} By ID', '/:id', False),
+    ('GET', 'Get {singular} Details', '/:id/details', False),
+    ('GET', 'Get {singular} Stats', '/stats', False),
+    ('POST', 'Create {singular}', '', True),
+    ('POST', 'Upload {singular} File', '/:id/upload', True),
+    ('POST', 'Approve {singular}', '/:id/approve', True),
+    ('POST', 'Send {singular} Request', '/:id/request', True),
+    ('PUT', 'Update {singular}', '/:id', True),
+    ('DELETE', 'Delete {singular}', '/:id', False),
+]
+AUTH_ACTIONS = [
+    ('POST', 'Register', '/register', True),
+    ('POST', 'Login', '/login', True),
+    ('POST', 'Logout', '/logout', False),
+    ('GET', 'Get Current User', '/me', False),
+    ('POST', 'Forgot Password', '/forgot-password', True),
+    ('POST', 'Verify OTP', '/verify-otp', True),
+]
+FIELDS = ['title', 'description', 'email', 'name', 'phone', 'status', 'price', 'duration', 'level',
+          'category', 'location', 'salary', 'start_date', 'notes', 'url', 'rating']
+
+def _slug(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+def _singular(name):
+    return name[:-1] if name.endswith('s') and not name.endswith('ss') else name
+
+def _request(rng, action, folder, resource, index):
+    method, pattern, suffix, has_body = action
+    singular = f'{_singular(resource)} {index}'
+    name = pattern.format(singular=singular, plural=f'{resource} {index}')
+    path = [_slug(folder)] + ([_slug(resource), str(index)] if resource != folder else [str(index)])
+    path += [s for s in suffix.split('/') if s]
+    request = {'method': method, 'header': [{'key': 'Content-Type', 'value': 'application/json'}]}
+    if folder == 'Authentication':
+        request = {'auth': {'type': 'noauth'}, **request}
+    else:
+        request['header'].append({'key': 'Authorization', 'value': 'Bearer {{token}}'})
+    if has_body:
+        fields = rng.sample(FIELDS, rng.randint(3, 8))
+        body = {field: f'{field.replace("_", " ").title()} {rng.randint(1, 999)}' for field in fields}
+        request['body'] = {'mode': 'raw', 'raw': json.dumps(body, indent=2)}
+    request['url'] = {'raw': '{{base_url}}/' + '/'.join(path), 'host': ['{{base_url}}'], 'path': path}
+    return {'name': name, 'request': request}
+
+def collection(requests, seed=0):
+    """A collection of `requests` request items without examples"""
+    rng = random.Random(seed)
+    total = sum(count for _, count, _ in FOLDERS)
+    # Requests per folder in the real proportions; the rounding remainder goes to the largest folders
+    counts = [requests * count // total for _, count, _ in FOLDERS]
+    for position in sorted(range(len(FOLDERS)), key=lambda i: -FOLDERS[i][1])[:requests - sum(counts)]:
+        counts[position] += 1
+
+    items = []
+    for (folder, _, subfolders), count in zip(FOLDERS, counts):
+        actions = AUTH_ACTIONS if folder == 'Authentication' else ACTIONS
+        groups = subfolders or [folder]
+        children = [[] for _ in groups]
+        for index in range(count):
+            group = index % len(groups)
+            action = actions[rng.randrange(len(actions))]
+            children[group].append(_request(rng, action, folder, groups[group], index // len(groups) + 1))
+        if subfolders:
+            items.append({'name': folder, 'item': [{'name': name, 'item': child}
+                                                   for name, child in zip(subfolders, children)]})
+        else:
+            items.append({'name': folder, 'item': children[0]})
+    return {
+        'info': {
+            'name': f'Synthetic ({requests} requests, seed {seed})',
+            'schema': 'https://schema.getpostman.com/json/collection/v2.1.0/collection.json',
+        },
+        'item': items,
+        'variable': [{'key': 'base_url', 'value': 'http://localhost:8000/api'}, {'key': 'token', 'value': ''}],
+    }
+
+def write_collection(path, requests, seed=0):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(collection(requests, seed), f, indent='\t')
+
+# Page trees
+
+ROLES = {
+    'admin': ['dashboard', 'users', 'teachers', 'courses', 'companies'],
+    'company': ['dashboard', 'profile', 'jobs', 'jobs/new', 'applications', 'ai-mentor'],
+    'university_student': ['dashboard', 'profile', 'jobs', 'courses', 'applications', 'payment'],
+    'teacher': ['dashboard', 'profile', 'courses', 'courses/create', 'analytics', 'live-class'],
+    'parent': ['dashboard', 'profile', 'students'],
+    'student': ['dashboard', 'profile', 'my-courses', 'my-sessions', 'follow-requests', 'payment'],
+}
+COMPONENTS = ['Nav', 'Popup', 'Pagination', 'NotificationDropdown', 'Chatbot', 'LanguageSwitcher', 'Card', 'Table']
+ENGLISH = ['Loading...', 'Dashboard', 'Save changes', 'Total students', 'Recent activity', 'View all',
+           'No results found', 'Upcoming sessions', 'Edit profile', 'Course progress']
+# Arabic words for text the locale does not have (so the codemod also sees misses)
+ARABIC_WORDS = ['الطلاب', 'الدورات', 'جديد', 'تفاصيل', 'الملف', 'الشخصي', 'المدرس', 'الوظائف', 'اليوم',
+                'التقرير', 'الشهري', 'عرض', 'المزيد', 'الحالة', 'المتاحة', 'الدفع']
+
+PAGE = '''{directive}import {{ useState, useEffect }} from "react";
+import {{ useRouter }} from "next/navigation";
+import styles from "./{name}.module.css";
+{hook_import}
+interface Item {{
+  id: number;
+  title: string;
+  status: string;
+}}
+
+export default function {name}() {{
+{hook}  const router = useRouter();
+  const [items, setItems] = useState<Item[]>([]);
+  const [loading, setLoading] = useState(true);
+
+  useEffect(() => {{
+    const token = localStorage.getItem("token");
+    if (!token) {{
+      router.push("/login");
+      return;
+    }}
+    setLoading(false);
+  }}, []);
+
+  if (loading) {{
+    return <div className={{styles.loading}}>{loading_text}</div>;
+  }}
+
+  return (
+    <div className={{styles.container}}>
+{body}
+    </div>
+  );
+}}
+'''
+
+def _locale_texts():
+    """(dotted key, text) for every Arabic text in frontend/locales/ar.json that the codemod can use"""
+    with open(os.path.join(ROOT, 'frontend', 'locales', 'ar.json'), 'r', encoding='utf-8') as f:
+        locale = json.load(f)
+    texts = []
+    stack = [('', locale)]
+    while stack:
+        prefix, node = stack.pop()
+        for key, value in node.items():
+            dotted = f'{prefix}.{key}' if prefix else key
+            if isinstance(value, dict):
+                stack.append((dotted, value))
+            elif isinstance(value, str) and re.search('[\u0600-\u06ff]', value) and not re.search('[<>{}"]', value):
+                texts.append((dotted, value))
+    return texts
+
+def _block(rng, texts, kind, index):
+    """A few lines of JSX; kind is 'english', 'arabic' (needs the codemod) or 'converted'"""
+    def text():
+        if kind == 'english':
+            return rng.choice(ENGLISH)
+        if kind == 'converted':
+            return '{t("%s")}' % rng.choice(texts)[0]
+        if rng.random() < 0.8:
+            return rng.choice(texts)[1]
+        return ' '.join(rng.choice(ARABIC_WORDS) for _ in range(rng.randint(2, 4)))
+
+    placeholder = 'placeholder=' + ('{t("%s")}' % rng.choice(texts)[0] if kind == 'converted' else
+                                    '"%s"' % (rng.choice(texts)[1] if kind == 'arabic' else 'Search...'))
+    return '\n'.join([
+        f'      <section className={{styles.section}} key="section-{index}">',
+        f'        <h2 className={{styles.title}}>{text()}</h2>',
+        f'        <p>{text()}</p>',
+        f'        <input type="text" {placeholder} />',
+        f'        {{items.length === 0 && <span className={{styles.empty}}>{text()}</span>}}',
+        f'        <button onClick={{() => router.push("/section/{index}")}}>{text()}</button>',
+        '      </section>',
+    ])
+
+def page_source(texts, size_kb, seed=0):
+    """One page of about size_kb KB in the layout write_page_tree() uses.
+
+    texts is a list of (locale key, Arabic text); about 60% of the sections
+    use them, the rest are English.
+    """
+    rng = random.Random(seed)
+    blocks = []
+    size = len(PAGE)
+    while size < size_kb * 1024:
+        block = _block(rng, texts, 'arabic' if rng.random() < 0.6 else 'english', len(blocks))
+        blocks.append(block)
+        size += len(block.encode('utf-8')) + 1
+    return PAGE.format(directive='"use client";\n\n', name='Page', hook_import='', hook='',
+                       loading_text='Loading...', body='\n'.join(blocks))
+
+def write_page_tree(root, pages, seed=0, arabic_share=0.3, converted_share=0.4):
+    """Write `pages` files under root/app and root/components; returns the number with Arabic to convert.
+
+    A share of the files contains Arabic text that needs the codemod, a share
+    is already converted (imports the hook and calls t()), the rest is English.
+    """
+    rng = random.Random(seed)
+    texts = _locale_texts()
+    pending = 0
+    roles = sorted(ROLES)
+    for index in range(pages):
+        if index % 5 == 4:
+            component = COMPONENTS[index % len(COMPONENTS)]
+            name = f'{component}{index}'
+            directory = os.path.join(root, 'components', component)
+            filename = f'{name}.tsx'
+        else:
+            role = roles[index % len(roles)]
+            section = ROLES[role][(index // len(roles)) % len(ROLES[role])]
+            directory = os.path.join(root, 'app', role, section, *(['[id]'] if index % 3 == 0 else []),
+                                     str(index))
+            name = f'{role.title().replace("_", "")}Page{index}'
+            filename = 'page.tsx'
+        roll = rng.random()
+        kind = 'arabic' if roll < arabic_share else 'converted' if roll < arabic_share + converted_share else 'english'
+        kinds = [kind if rng.random() < 0.6 else 'english' for _ in range(rng.randint(3, 12))]
+        # A page drawn as 'arabic' can still end up with English blocks only
+        pending += 'arabic' in kinds
+        blocks = [_block(rng, texts, block_kind, n) for n, block_kind in enumerate(kinds)]
+        converted = kind == 'converted'
+        content = PAGE.format(
+            directive='"use client";\n\n' if rng.random() < 0.7 else '',
+            name=name,
+            hook_import='import { useLanguage } from "@/hooks/useLanguage";\n' if converted else '',
+            hook='  const { t } = useLanguage();\n' if converted else '',
+            loading_text='{t("common.loading")}' if converted else 'Loading...',
+            body='\n'.join(blocks),
+        )
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, filename), 'w', encoding='utf-8') as f:
+            f.write(content)
+    return pending
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic collection or page tree")
+    parser.add_argument('kind', choices=['collection', 'pages'])
+    parser.add_argument('size', type=int, help="requests in the collection, or files in the tree")
+    parser.add_argument('output', help="collection file, or tree root directory")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.kind == 'collection':
+        write_collection(args.output, args.size, args.seed)
+        print(f"Wrote {args.output} ({os.path.getsize(args.output):,} bytes)")
+    else:
+        pending = write_page_tree(args.output, args.size, args.seed)
+        print(f"Wrote {args.size} files under {args.output}, {pending} with Arabic text to convert")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Split the locale dictionaries into per-route chunks.
+
+For every app/**/page.tsx the script follows the page's imports (and the
+layouts above it) through the component tree, collects the translation keys
+passed to t("..."), and writes one chunk per route and language holding
+only those keys, in the same flat {"dotted.key": "text"} form as the
+tables LanguageContext reads (see build_locale_tables.py). Chunks are
+content-addressed, so routes that use the same keys share one file. A
+manifest maps each route to its chunk:
+
+    public/locales/chunks/manifest.json
+    {"languages": ["ar", "en"],
+     "routes": {"/student/my-sessions": {"keys": 42, "chunk": "3f9c1a2b"}, ...}}
+    public/locales/chunks/<lang>/<chunk>.json
+
+so a provider can fetch `/locales/chunks/<lang>/<chunk>.json` for the
+current route instead of bundling both whole dictionaries.
+
+Dynamic keys are handled conservatively: t(`grades.${grade}`) keeps the
+whole `grades` subtree, and a file that calls t() with a variable keeps
+every string literal in it that names a locale key.
+
+    python build_locale_chunks.py
+    python build_locale_chunks.py --report-only
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+from functools import lru_cache
+
+from build_locale_tables import flat_table
+from jsx_index import IndexCache, is_jsx
+from postman_collection import umask_mode
+from translation_keys import INDEX_CACHE, LANGUAGES, load_locale, scan_source
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SOURCE_EXTENSIONS = ('.tsx', '.ts', '.jsx', '.js')
+
+def _minified_size(data):
+    return len(json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+def subset(table, keys):
+    """The entries of a flat table needed for keys (a key naming an object keeps all entries under it)"""
+    result = {}
+    for key, text in table.items():
+        parts = key.split('.')
+        if any('.'.join(parts[:end]) in keys for end in range(1, len(parts) + 1)):
+            result[key] = text
+    return result
+
+class SourceGraph:
+    """Translation keys and local imports of source files, each file parsed once"""
+
+    def __init__(self, root, known_keys):
+        self.root = root
+        self.known_keys = known_keys
+        self.files = {}
+        self.index_cache = IndexCache(os.path.join(root, INDEX_CACHE))
+
+    @lru_cache(maxsize=None)
+    def resolve(self, specifier, importer_dir):
+        """Path of a local module ('@/...' or relative), or None for packages and assets"""
+        if specifier.startswith('@/'):
+            base = os.path.join(self.root, specifier[2:])
+        elif specifier.startswith('.'):
+            base = os.path.normpath(os.path.join(importer_dir, specifier))
+        else:
+            return None
+        candidates = [base] if base.endswith(SOURCE_EXTENSIONS) else []
+        candidates += [base + ext for ext in SOURCE_EXTENSIONS]
+        candidates += [os.path.join(base, 'index' + ext) for ext in SOURCE_EXTENSIONS]
+        for candidate in candidates:
+            if os.path.isfile(candidate):
+                return candidate
+        return None
+
+    def parse(self, path):
+        """(keys used directly in the file, local files it imports)"""
+        parsed = self.files.get(path)
+        if parsed is not None:
+            return parsed
+        with open(path, 'r', encoding='utf-8') as f:
+            source = f.read()
+        index = self.index_cache.get(source, is_jsx(path))
+        usages = []
+        dynamic = []
+        scan_source(source, path, self.known_keys, usages, dynamic, index)
+        keys = {usage.key for usage in usages if usage.kind in ('t', 'prefix')}
+        if dynamic:
+            # t(labelKey) and friends: keep any literal elsewhere in the file that names a key
+            keys.update(usage.key for usage in usages if usage.kind == 'literal')
+        directory = os.path.dirname(path)
+        imports = set()
+        for _, _, specifier, _ in index.imports:
+            resolved = self.resolve(specifier, directory)
+            if resolved is not None:
+                imports.add(resolved)
+        parsed = self.files[path] = (keys, imports)
+        return parsed
+
+    def keys_for(self, entries):
+        """All keys used by the entry files and everything they import, transitively"""
+        keys = set()
+        seen = set()
+        stack = list(entries)
+        while stack:
+            path = stack.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            file_keys, imports = self.parse(path)
+            keys |= file_keys
+            stack.extend(imports - seen)
+        return keys, seen
+
+def find_routes(app_dir):
+    """{route: [page file, layout files from the root down]} for every page under app_dir"""
+    routes = {}
+    for directory, dirnames, filenames in os.walk(app_dir):
+        dirnames[:] = sorted(d for d in dirnames if d not in ('api', 'node_modules'))
+        page = next((f for f in (f'page{ext}' for ext in SOURCE_EXTENSIONS) if f in filenames), None)
+        if page is None:
+            continue
+        relative = os.path.relpath(directory, app_dir)
+        segments = [] if relative == '.' else relative.split(os.sep)
+        # Route groups "(auth)" and parallel slots "@modal" do not appear in the URL
+        route = '/' + '/'.join(s for s in segments if not s.startswith(('(', '@')))
+        layouts = []
+        for depth in range(len(segments) + 1):
+            layout_dir = os.path.join(app_dir, *segments[:depth])
+            layout = next((os.path.join(layout_dir, f'layout{ext}') for ext in SOURCE_EXTENSIONS
+                           if os.path.isfile(os.path.join(layout_dir, f'layout{ext}'))), None)
+            if layout:
+                layouts.append(layout)
+        routes[route] = [os.path.join(directory, page)] + layouts
+    return routes
+
+def build_chunks(root, locales, out_dir, write=True):
+    """Split the flat tables in locales ({lang: table}) per route; write the chunks and manifest and return report rows"""
+    known_keys = set()
+    for table in locales.values():
+        for key in table:
+            parts = key.split('.')
+            known_keys.update('.'.join(parts[:end]) for end in range(1, len(parts) + 1))
+    graph = SourceGraph(root, frozenset(known_keys))
+    routes = find_routes(os.path.join(root, 'app'))
+    full_sizes = {lang: _minified_size(locale) for lang, locale in locales.items()}
+
+    manifest = {'languages': sorted(locales), 'routes': {}}
+    chunks = {}
+    rows = []
+    for route in sorted(routes):
+        keys, files = graph.keys_for(routes[route])
+        payloads = {lang: json.dumps(subset(locale, keys), ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+                    for lang, locale in locales.items()}
+        chunk_id = hashlib.sha1(''.join(payloads[lang] for lang in sorted(payloads)).encode('utf-8')).hexdigest()[:8]
+        chunks[chunk_id] = payloads
+        manifest['routes'][route] = {'keys': len(keys), 'chunk': chunk_id}
+        rows.append({
+            'route': route,
+            'files': len(files),
+            'keys': len(keys),
+            'before': dict(full_sizes),
+            'after': {lang: len(payload.encode('utf-8')) for lang, payload in payloads.items()},
+        })
+
+    graph.index_cache.save()
+    if write:
+        write_chunk_dir(out_dir, locales, chunks, manifest)
+    return rows, len(chunks)
+
+def write_chunk_dir(out_dir, languages, chunks, manifest):
+    """Write the chunks and manifest to a temp directory next to out_dir and swap it into place.
+
+    The old directory is only removed once the new one is complete, so an
+    interrupted build leaves the previous chunks in place.
+    """
+    parent, name = os.path.split(os.path.abspath(out_dir))
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix=f'.{name}.', suffix='.tmp')
+    old_dir = None
+    try:
+        # mkdtemp creates the directory as 0700; give it the mode os.makedirs would
+        os.chmod(tmp_dir, umask_mode(0o777))
+        for lang in languages:
+            os.makedirs(os.path.join(tmp_dir, lang))
+        for chunk_id, payloads in chunks.items():
+            for lang, payload in payloads.items():
+                with open(os.path.join(tmp_dir, lang, f'{chunk_id}.json'), 'w', encoding='utf-8') as f:
+                    f.write(payload)
+        with open(os.path.join(tmp_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        if os.path.isdir(out_dir):
+            old_dir = tempfile.mkdtemp(dir=parent, prefix=f'.{name}.', suffix='.old')
+            os.replace(out_dir, os.path.join(old_dir, name))
+        os.replace(tmp_dir, out_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if old_dir is not None and not os.path.exists(out_dir):
+            os.replace(os.path.join(old_dir, name), out_dir)
+        raise
+    finally:
+        if old_dir is not None:
+            shutil.rmtree(old_dir, ignore_errors=True)
+
+def print_report(rows):
+    print(f"{'route':<48} {'files':>5} {'keys':>5} {'before (ar+en)':>15} {'after ar':>9} {'after en':>9} {'saved':>7}")
+    for row in rows:
+        before = sum(row['before'].values())
+        # A page only ever loads the chunk of the active language
+        after = max(row['after'].values())
+        print(f"{row['route'][:48]:<48} {row['files']:>5} {row['keys']:>5} {before:>15,} "
+              f"{row['after'].get('ar', 0):>9,} {row['after'].get('en', 0):>9,} {1 - after / before:>6.1%}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write per-route translation chunks and a manifest")
+    parser.add_argument('--root', default=ROOT, help="frontend directory (default: this script's directory)")
+    parser.add_argument('--locales', default='locales', help="directory with <lang>.json, relative to --root")
+    parser.add_argument('--out', default=os.path.join('public', 'locales', 'chunks'),
+                        help="output directory, relative to --root")
+    parser.add_argument('--report-only', action='store_true', help="print the size report without writing chunks")
+    args = parser.parse_args(argv)
+
+    root = os.path.abspath(args.root)
+    locales = {lang: flat_table(load_locale(os.path.join(root, args.locales, f'{lang}.json'))[0]) for lang in LANGUAGES}
+    out_dir = os.path.join(root, args.out)
+    rows, chunk_count = build_chunks(root, locales, out_dir, write=not args.report_only)
+
+    print_report(rows)
+    print(f"\n{len(rows)} routes, {chunk_count} distinct chunks per language")
+    if not args.report_only:
+        print(f"Wrote {os.path.relpath(out_dir, root)}/manifest.json")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Generate flat translation tables for LanguageContext.
+
+t() used to split every key on "." and walk the nested locale on each call.
+This flattens locales/<lang>.json into locales/flat/<lang>.json, a single
+{"dotted.key": "text"} object per language, so t() is one property lookup.
+It also checks every key the source passes to t() against the tables, so a
+key that would fall back to the raw key at runtime is caught at build time.
+
+The tables are committed next to the locales, so `next dev` and `next
+build` need no Python: rerun this after editing a locale. CI runs `npm run
+locales:check`, which fails when the tables are out of date (add --strict to
+also fail on used keys that do not resolve):
+
+    python build_locale_tables.py
+    python build_locale_tables.py --check --strict
+"""
+import argparse
+import json
+import os
+import sys
+
+from translation_keys import LANGUAGES, load_locale, scan_tree
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+FLAT_DIR = os.path.join('locales', 'flat')
+
+def flat_table(locale):
+    """{dotted key: text} for every text in a nested locale, in file order (lists are not t() values)"""
+    table = {}
+    stack = [('', iter(locale.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for key, value in items:
+            dotted = f'{prefix}.{key}' if prefix else key
+            if isinstance(value, dict):
+                stack.append((dotted, iter(value.items())))
+                break
+            if isinstance(value, str):
+                table[dotted] = value
+        else:
+            stack.pop()
+    return table
+
+def render_table(table):
+    # One entry per line keeps diffs of the generated file readable
+    return json.dumps(table, ensure_ascii=False, indent=0) + '\n'
+
+def generated_files(tables):
+    """{relative path: content} of everything this script writes"""
+    return {os.path.join(FLAT_DIR, f'{lang}.json'): render_table(table) for lang, table in tables.items()}
+
+def unresolved_keys(root, tables):
+    """{key: (languages without it, first usage)} for static t() keys that a table cannot answer"""
+    known = set()
+    for table in tables.values():
+        for key in table:
+            parts = key.split('.')
+            known.update('.'.join(parts[:end]) for end in range(1, len(parts) + 1))
+    usages, _, sources = scan_tree(root, known)
+    unresolved = {}
+    for usage in usages:
+        if usage.kind != 't':
+            continue
+        languages = [lang for lang, table in sorted(tables.items()) if usage.key not in table]
+        if languages and usage.key not in unresolved:
+            line = sources[usage.file].count('\n', 0, usage.offset) + 1
+            unresolved[usage.key] = (languages, f'{usage.file}:{line}')
+    return unresolved
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Flatten the locales into lookup tables for t()")
+    parser.add_argument('--root', default=ROOT, help="frontend directory (default: this script's directory)")
+    parser.add_argument('--check', action='store_true',
+                        help="do not write; exit with status 1 if the generated files are out of date")
+    parser.add_argument('--strict', action='store_true', help="exit with status 1 if a used key is missing")
+    args = parser.parse_args(argv)
+    root = os.path.abspath(args.root)
+
+    tables = {lang: flat_table(load_locale(os.path.join(root, 'locales', f'{lang}.json'))[0]) for lang in LANGUAGES}
+    status = 0
+    for relative, content in generated_files(tables).items():
+        path = os.path.join(root, relative)
+        current = None
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                current = f.read()
+        if current == content:
+            continue
+        if args.check:
+            print(f"{relative} is out of date: run build_locale_tables.py")
+            status = 1
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        print(f"Wrote {relative}")
+
+    print(', '.join(f"{lang}: {len(table)} keys" for lang, table in tables.items()))
+    unresolved = unresolved_keys(root, tables)
+    if unresolved:
+        print(f"\n{len(unresolved)} keys passed to t() are missing from a table (t() returns the key itself):")
+        for key, (languages, where) in sorted(unresolved.items()):
+            print(f"  {key:<50} {'/'.join(languages):<6} {where}")
+        if args.strict:
+            status = 1
+    return status
+
+if __name__ == '__main__':
+    sys.exit(main())
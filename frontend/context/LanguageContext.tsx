@@ -1,8 +1,9 @@
 "use client";
 
 import { createContext, useContext, useState, useEffect, ReactNode } from "react";
-import arTranslations from "@/locales/ar.json";
-import enTranslations from "@/locales/en.json";
+// Flat {"dotted.key": "text"} tables generated from locales/*.json by build_locale_tables.py
+import arTranslations from "@/locales/flat/ar.json";
+import enTranslations from "@/locales/flat/en.json";
 
 type Language = "ar" | "en";
 
@@ -17,9 +18,9 @@ const LanguageContext = createContext<LanguageContextType | undefined>(
   undefined
 );
 
-const translations = {
-  ar: arTranslations,
-  en: enTranslations,
+const translations: Record<Language, Readonly<Record<string, string>>> = {
+  ar: Object.freeze(arTranslations),
+  en: Object.freeze(enTranslations),
 };
 
 export function LanguageProvider({ children }: { children: ReactNode }) {
@@ -53,20 +54,12 @@ export function LanguageProvider({ children }: { children: ReactNode }) {
 
   // Translation function
   const t = (key: string): string => {
-    const keys = key.split(".");
-    // eslint-disable-next-line @typescript-eslint/no-explicit-any
-    let value: any = translations[language];
-
-    for (const k of keys) {
-      if (value && typeof value === "object" && k in value) {
-        value = value[k];
-      } else {
-        console.warn(`Translation key not found: ${key}`);
-        return key;
-      }
+    const value = translations[language][key];
+    if (typeof value !== "string") {
+      console.warn(`Translation key not found: ${key}`);
+      return key;
     }
-
-    return typeof value === "string" ? value : key;
+    return value;
   };
 
   const dir = language === "ar" ? "rtl" : "ltr";
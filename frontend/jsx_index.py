@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Span index of a TSX/TS source file, shared by the i18n tooling.
+
+One lexer pass records where things are instead of what they look like
+nearby: JSX text nodes, string literals (and whether they sit in a JSX
+attribute, inside a JSX expression, as a call argument or in plain code),
+template literals, comments, import/export-from statements, t("...") calls
+and the default-export function component with its body. The codemod
+(update_all_pages.py) turns the index into splices; the key analyzers
+(translation_keys.py, build_locale_chunks.py) read t() calls, literals and
+imports from it.
+
+The lexer follows JSX nesting with a stack of frames (code, tag, children,
+template), so "<" after an identifier is a comparison or a type argument,
+text between tags is only text inside an element, and quotes in JSX text
+are not strings. It does not parse TypeScript: `<T extends U>` generic
+arrows in .tsx files are mistaken for elements, as they are by most editors.
+
+Indexes are cached per content sha1, in memory and, through IndexCache, on
+disk between runs.
+
+    python jsx_index.py app/student/dashboard/page.tsx
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import OrderedDict
+
+# The repository root holds postman_collection.py, whose atomic_write the frontend tools share
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from postman_collection import atomic_write  # noqa: E402
+
+# Every alternative starts with one of these characters, so the search skips
+# everything else without trying each alternative at each position
+_CODE = re.compile(r'''(?=[/"'`{}()\[\]<\n])(?:
+    (?P<line_comment> //[^\n]* )
+  | (?P<block_comment> /\*.*?(?:\*/|\Z) )
+  | (?P<quote> ["'] )
+  | (?P<template> ` )
+  | (?P<open> [{(\[] )
+  | (?P<close> [})\]] )
+  | (?P<slash> / )
+  | (?P<lt> < )
+  | (?P<statement> \n[ \t]*(?:import|export)\s )
+)''', re.VERBOSE | re.DOTALL)
+_FIRST_STATEMENT = re.compile(r'(?P<statement>[ \t]*(?:import|export)\s)')
+_TAG = re.compile(r'(?P<line_comment>//[^\n]*)|(?P<block_comment>/\*.*?(?:\*/|\Z))|(?P<quote>["\'])'
+                  r'|(?P<open>\{)|(?P<self_close>/>)|(?P<end>>)', re.DOTALL)
+_CHILDREN = re.compile(r'[{<]')
+_TEMPLATE = re.compile(r'\\.|`|\$\{', re.DOTALL)
+
+_STRING = {'"': re.compile(r'"(?:[^"\\\n]|\\.)*"'), "'": re.compile(r"'(?:[^'\\\n]|\\.)*'")}
+_REGEX_LITERAL = re.compile(r'/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[a-z]*')
+_JSX_START = re.compile(r'<(?:[A-Za-z_$][\w$.:-]*(?=[\s/>])|>)')
+_IMPORT = re.compile(r'''[ \t]*(?:import|export)\s+(?:type\s+)?(?:([^;"'`]*?)\s*\bfrom\s*)?(["'])([^"'\n]*)\2[ \t]*;?''')
+_COMPONENT = re.compile(r'[ \t]*export\s+default\s+(?:async\s+)?function\s*([\w$]*)\s*(?=\()')
+_TEMPLATE_HEAD = re.compile(r'`([^`\\$]*)(\$\{)?')
+_SPACE = re.compile(r'\s*')
+
+# A '/' or '<' after one of these starts a regex literal or a JSX element rather than an operator
+_EXPRESSION_START = set('(,=:[!&|?{};+-*%<>~^')
+_EXPRESSION_KEYWORDS = ('return', 'yield', 'default', 'case', 'await', 'else', 'typeof', 'void', 'in', 'of')
+_WORD_BEFORE = re.compile(r'([\w$]+)\Z')
+_IDENTIFIER = re.compile(r'[\w$]')
+
+class SpanIndex:
+    """Spans of one file; offsets index the source string, ends are exclusive.
+
+    strings        (start, end, context) with the quotes; context is 'attr'
+                   (JSX attribute value), 'expr' (code inside a JSX
+                   expression), 'call' (argument of t() or import()) or 'code'
+    templates      (start, end) of template literals, backticks included
+    text_nodes     (start, end) of JSX text between tags and expressions
+    comments       (start, end)
+    imports        (start, end, source, clause); clause is the text between
+                   import/export and from, '' for a side-effect import and
+                   None for a dynamic import()
+    t_calls        (offset, kind, value); kind 'key' (t("a.b")), 'prefix'
+                   (t(`a.${x}`), value 'a.') or 'dynamic' (value None)
+    directives     values of the leading "use client"-style directives
+    first_code     offset of the first token that is not a comment
+    directive_end  offset just past the directive prologue (0 without one)
+    component      (name, body open brace, body close brace) of
+                   `export default function`, or None
+    """
+    FIELDS = ('strings', 'templates', 'text_nodes', 'comments', 'imports', 't_calls',
+              'directives', 'first_code', 'directive_end', 'component')
+    __slots__ = FIELDS
+
+    def __init__(self, **fields):
+        for name in self.FIELDS:
+            setattr(self, name, fields[name])
+
+    def to_json(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    @classmethod
+    def from_json(cls, data):
+        fields = {name: data[name] for name in cls.FIELDS}
+        for name in ('strings', 'templates', 'text_nodes', 'comments', 'imports', 't_calls'):
+            fields[name] = [tuple(span) for span in fields[name]]
+        fields['component'] = tuple(fields['component']) if fields['component'] else None
+        return cls(**fields)
+
+    def string_value(self, source, span):
+        return source[span[0] + 1:span[1] - 1]
+
+    def in_component(self, offset):
+        return self.component is not None and self.component[1] < offset < self.component[2]
+
+def _previous(source, position):
+    """Index of the last non-space character before position, or -1"""
+    i = position - 1
+    while i >= 0 and source[i] in ' \t\r\n':
+        i -= 1
+    return i
+
+def _callee(source, paren):
+    """(name, offset) when the '(' at paren calls t or import, else None"""
+    i = _previous(source, paren)
+    window = max(0, i - 7)
+    word = _WORD_BEFORE.search(source, window, i + 1)
+    if word is None or word.group(1) not in ('t', 'import') or (word.start() == window and window > 0
+                                                               and _IDENTIFIER.match(source[window - 1])):
+        return None
+    return word.group(1), word.start()
+
+def _starts_expression(source, position):
+    i = _previous(source, position)
+    if i < 0 or source[i] in _EXPRESSION_START:
+        return True
+    word = _WORD_BEFORE.search(source, max(0, i - 10), i + 1)
+    return word is not None and word.group(1) in _EXPRESSION_KEYWORDS
+
+def lex(source, jsx=True):
+    """Build the SpanIndex of source in one left-to-right pass (jsx=False for .ts/.js files)"""
+    strings = []
+    templates = []
+    text_nodes = []
+    comments = []
+    imports = []
+    t_calls = []
+    pairs = {}
+    brackets = []
+    component = None
+
+    # Frames: [kind, bracket depth]; a code frame pushed by '{' or '${' ends at its unmatched '}'
+    stack = [['code', 0]]
+    jsx_frames = 0
+    argument = None      # (name, offset, argument position) of a t/import call whose argument is a literal
+    template_starts = []
+    position = 0
+    length = len(source)
+
+    while position < length:
+        frame = stack[-1]
+        kind = frame[0]
+
+        if kind == 'children':
+            match = _CHILDREN.search(source, position)
+            end = match.start() if match else length
+            if end > position:
+                text_nodes.append((position, end))
+            if match is None:
+                break
+            if match.group() == '{':
+                stack.append(['code', 0])
+                position = end + 1
+            elif source.startswith('</', end):
+                # Closing tag: the element is done
+                close = source.find('>', end)
+                position = length if close < 0 else close + 1
+                stack.pop()
+                jsx_frames -= 1
+            elif source.startswith('<>', end):
+                stack.append(['children', 0])
+                jsx_frames += 1
+                position = end + 2
+            else:
+                stack.append(['tag', 0])
+                jsx_frames += 1
+                position = end + 1
+            continue
+
+        if kind == 'template':
+            match = _TEMPLATE.search(source, position)
+            if match is None:
+                break
+            position = match.end()
+            token = match.group()
+            if token == '`':
+                stack.pop()
+                templates.append((template_starts.pop(), position))
+            elif token == '${':
+                stack.append(['code', 0])
+            continue
+
+        if kind == 'tag':
+            match = _TAG.search(source, position)
+            if match is None:
+                break
+            token = match.lastgroup
+            start = match.start()
+            position = match.end()
+            if token in ('line_comment', 'block_comment'):
+                comments.append((start, position))
+            elif token == 'quote':
+                string = _STRING[match.group()].match(source, start)
+                if string is not None:
+                    position = string.end()
+                    strings.append((start, position, 'attr'))
+            elif token == 'open':
+                stack.append(['code', 0])
+            elif token == 'self_close':
+                stack.pop()
+                jsx_frames -= 1
+            else:
+                frame[0] = 'children'
+            continue
+
+        # Code
+        match = _FIRST_STATEMENT.match(source) if position == 0 else None
+        if match is None:
+            match = _CODE.search(source, position)
+        if match is None:
+            break
+        token = match.lastgroup
+        start = match.start()
+        position = match.end()
+
+        if token in ('line_comment', 'block_comment'):
+            comments.append((start, position))
+        elif token == 'quote' or token == 'template':
+            context = 'expr' if jsx_frames else 'code'
+            if argument is not None and argument[2] == start:
+                context = 'call'
+            if token == 'quote':
+                string = _STRING[match.group()].match(source, start)
+                if string is None:
+                    continue
+                position = string.end()
+                strings.append((start, position, context))
+                value = source[start + 1:position - 1]
+                if context == 'call':
+                    _record_argument(source, argument, value, False, position, t_calls, imports)
+            else:
+                if context == 'call':
+                    head = _TEMPLATE_HEAD.match(source, start)
+                    _record_argument(source, argument, head.group(1), head.group(2) is not None,
+                                     None, t_calls, imports)
+                stack.append(['template', 0])
+                template_starts.append(start)
+            argument = None
+        elif token == 'open':
+            frame[1] += 1
+            brackets.append(start)
+            callee = _callee(source, start) if match.group() == '(' else None
+            if callee is not None:
+                following = _SPACE.match(source, position).end()
+                if following < length and source[following] in '"\'`':
+                    argument = (callee[0], callee[1], following)
+                elif callee[0] == 't' and source[following:following + 1] != ')':
+                    t_calls.append((callee[1], 'dynamic', None))
+        elif token == 'close':
+            if frame[1] == 0:
+                if len(stack) > 1:
+                    stack.pop()
+                continue
+            frame[1] -= 1
+            if brackets:
+                pairs[brackets.pop()] = start
+        elif token == 'statement':
+            start += source[start] == '\n'
+            statement = _IMPORT.match(source, start)
+            if statement is not None and len(stack) == 1:
+                clause = statement.group(1)
+                imports.append((match.end() - len(match.group().lstrip()), statement.end(),
+                                statement.group(3), clause.strip() if clause else ''))
+                position = statement.end()
+                continue
+            declaration = _COMPONENT.match(source, start)
+            if declaration is not None and component is None and len(stack) == 1:
+                component = (declaration.group(1), declaration.end())
+                position = declaration.end()
+            else:
+                # Only the keyword; the rest of the statement is lexed as usual
+                position = match.end() - 1
+        elif token == 'slash':
+            if _starts_expression(source, start):
+                regex = _REGEX_LITERAL.match(source, start)
+                if regex is not None:
+                    position = regex.end()
+        elif token == 'lt':
+            if jsx and _starts_expression(source, start):
+                element = _JSX_START.match(source, start)
+                if element is not None:
+                    if element.group() == '<>':
+                        stack.append(['children', 0])
+                    else:
+                        stack.append(['tag', 0])
+                    jsx_frames += 1
+                    position = element.end()
+
+    if component is not None:
+        name, paren = component
+        params_close = pairs.get(paren)
+        body = source.find('{', params_close) if params_close is not None else -1
+        component = (name, body, pairs[body]) if body >= 0 and body in pairs else None
+
+    directives, first_code, directive_end = _prologue(source, strings, comments)
+    return SpanIndex(strings=strings, templates=templates, text_nodes=text_nodes, comments=comments,
+                     imports=imports, t_calls=t_calls, directives=directives, first_code=first_code,
+                     directive_end=directive_end, component=component)
+
+def _record_argument(source, argument, value, interpolated, end, t_calls, imports):
+    name, offset, _ = argument
+    if name == 'import':
+        if not interpolated:
+            imports.append((offset, end or offset, value, None))
+        return
+    if interpolated:
+        t_calls.append((offset, 'prefix' if value else 'dynamic', value or None))
+        return
+    # t("a" + b) is not a static key
+    following = _SPACE.match(source, end).end() if end is not None else None
+    if end is not None and source[following:following + 1] not in (')', ','):
+        t_calls.append((offset, 'dynamic', None))
+    else:
+        t_calls.append((offset, 'key', value))
+
+def _prologue(source, strings, comments):
+    """(directive values, first non-comment offset, offset after the directives)"""
+    comment_ends = {start: end for start, end in comments}
+    string_ends = {start: end for start, end, _ in strings}
+
+    def skip(position):
+        while True:
+            position = _SPACE.match(source, position).end()
+            if position not in comment_ends:
+                return position
+            position = comment_ends[position]
+
+    first_code = skip(0)
+    directives = []
+    directive_end = 0
+    position = first_code
+    while position in string_ends and source[position] in '"\'':
+        end = string_ends[position]
+        after = _SPACE.match(source, end).end()
+        if source[after:after + 1] == ';':
+            end = after + 1
+        elif after < len(source) and '\n' not in source[end:after]:
+            # "use client".length is an expression, not a directive
+            break
+        directives.append(source[position + 1:string_ends[position] - 1])
+        directive_end = end
+        position = skip(end)
+    return directives, first_code, directive_end
+
+# Caching
+
+def content_hash(source):
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()
+
+_INDEXES = OrderedDict()
+_INDEX_CACHE_SIZE = 512
+
+def index_for(source, jsx=True, digest=None):
+    """SpanIndex of source, cached in memory per content hash"""
+    key = (digest or content_hash(source), jsx)
+    index = _INDEXES.get(key)
+    if index is None:
+        index = _INDEXES[key] = lex(source, jsx)
+        if len(_INDEXES) > _INDEX_CACHE_SIZE:
+            _INDEXES.popitem(last=False)
+    else:
+        _INDEXES.move_to_end(key)
+    return index
+
+def is_jsx(path):
+    return str(path).endswith(('.tsx', '.jsx'))
+
+class IndexCache:
+    """Indexes kept on disk between runs, keyed by content sha1.
+
+    The cache is tied to this lexer's source: editing jsx_index.py
+    invalidates it. save() keeps only the entries used since load.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.version = lexer_version()
+        self.entries = {}
+        self.used = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.version:
+                self.entries = data.get('files', {})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, source, jsx=True):
+        digest = content_hash(source)
+        key = f'{digest}:{int(jsx)}'
+        data = self.used.get(key) or self.entries.get(key)
+        if data is not None:
+            index = SpanIndex.from_json(data)
+            _INDEXES[(digest, jsx)] = index
+        else:
+            index = index_for(source, jsx, digest)
+            data = index.to_json()
+        self.used[key] = data
+        return index
+
+    def save(self):
+        if self.used == self.entries:
+            return
+        # A unique temp file per run, so concurrent runs never write into each other's
+        try:
+            atomic_write(self.path, lambda f: json.dump({'version': self.version, 'files': self.used}, f,
+                                                        separators=(',', ':')))
+        except OSError:
+            pass
+
+def lexer_version():
+    with open(os.path.abspath(__file__), 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print the span index of a source file")
+    parser.add_argument('file')
+    args = parser.parse_args(argv)
+    with open(args.file, 'r', encoding='utf-8') as f:
+        source = f.read()
+    index = lex(source, is_jsx(args.file))
+
+    def line(offset):
+        return source.count('\n', 0, offset) + 1
+
+    print(f"directives: {index.directives}")
+    if index.component:
+        name, body_open, body_close = index.component
+        print(f"component: {name} (body lines {line(body_open)}-{line(body_close)})")
+    for start, end, source_path, clause in index.imports:
+        print(f"import {line(start):>5}  {source_path}" + ('' if clause is not None else '  (dynamic)'))
+    for offset, kind, value in index.t_calls:
+        print(f"t()    {line(offset):>5}  {kind:<8} {value or ''}")
+    for start, end in index.text_nodes:
+        text = source[start:end].strip()
+        if text:
+            print(f"text   {line(start):>5}  {text[:70]}")
+    for start, end, context in index.strings:
+        if context in ('attr', 'expr'):
+            print(f"{context:<6} {line(start):>5}  {source[start:end][:70]}")
+    print(f"\n{len(index.strings)} strings, {len(index.templates)} templates, "
+          f"{len(index.text_nodes)} text nodes, {len(index.comments)} comments")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
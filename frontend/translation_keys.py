@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Find unused, missing and unpaired translation keys, and prune the locales.
+
+Every source file under the frontend is lexed once into a span index
+(jsx_index.py), cached per content hash between runs. The analysis reads
+t("a.b") calls, t(`a.${x}`) prefixes, string literals that name a locale key
+(keys handed around as data, e.g. { labelKey: "categories.math" }), and
+property chains on locale JSON imported directly (translations.faq.faqItems).
+Comments never count.
+The report then lists:
+
+  missing   keys used in the code that a locale does not define (today these
+            only surface as the console.warn in LanguageContext's t())
+  unused    locale entries nothing refers to
+  parity    entries defined in one language only, or as a text in one and
+            an object in the other
+  duplicate object keys repeated in a locale file (JSON.parse keeps the last)
+
+With --prune the unused entries are dropped and the duplicates collapsed, and
+the result is written to locales/ and to the public/locales/ copy, so both
+stay identical.
+
+    python translation_keys.py
+    python translation_keys.py --unused --json keys.json
+    python translation_keys.py --prune --keep notifications
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+from jsx_index import IndexCache, index_for, is_jsx
+from postman_collection import atomic_write
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+LANGUAGES = ('ar', 'en')
+LOCALE_DIRS = ('locales', os.path.join('public', 'locales'))
+SOURCE_EXTENSIONS = ('.tsx', '.ts', '.jsx', '.js')
+SKIP_DIRS = {'node_modules', '.next', 'public', 'locales', 'out', 'build'}
+
+INDEX_CACHE = '.jsx_index.cache.json'
+
+_LOCALE_IMPORT = re.compile(r'(?:^|/)locales/[\w-]+\.json\Z')
+_DEFAULT_BINDING = re.compile(r'[\w$]+')
+_KEY_LIKE = re.compile(r'[A-Za-z_][\w-]*(?:\.[\w-]+)+\Z')
+
+# Locale loading
+
+def load_locale(path):
+    """(data, duplicate dotted keys) of a locale file"""
+    duplicates = []
+
+    def pairs_hook(pairs):
+        node = dict(pairs)
+        seen = set()
+        for key, _ in pairs:
+            if key in seen:
+                duplicates.append((node, key))
+            seen.add(key)
+        return node
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f, object_pairs_hook=pairs_hook)
+    if duplicates:
+        # The hook only sees the object holding the key; find where it sits in the tree
+        paths = {id(node): prefix for prefix, node in _objects(data)}
+        duplicates = [f'{paths[id(node)]}.{key}' if paths[id(node)] else key for node, key in duplicates]
+    return data, duplicates
+
+def _objects(node, prefix=''):
+    yield prefix, node
+    for key, value in node.items():
+        if isinstance(value, dict):
+            yield from _objects(value, f'{prefix}.{key}' if prefix else key)
+
+def leaf_entries(node, prefix=''):
+    """{dotted key: value} of every text (or list) in a nested locale"""
+    leaves = {}
+    stack = [(prefix, node)]
+    while stack:
+        prefix, node = stack.pop()
+        for key, value in node.items():
+            dotted = f'{prefix}.{key}' if prefix else key
+            if isinstance(value, dict):
+                stack.append((dotted, value))
+            else:
+                leaves[dotted] = value
+    return leaves
+
+def lookup(locale, key):
+    node = locale
+    for part in key.split('.'):
+        if not isinstance(node, dict) or part not in node:
+            return None
+        node = node[part]
+    return node
+
+# Source scan
+
+class Usage:
+    """Where a key is referenced: file, offset and how (t, prefix, literal or import)"""
+    __slots__ = ('key', 'file', 'offset', 'kind')
+
+    def __init__(self, key, file, offset, kind):
+        self.key = key
+        self.file = file
+        self.offset = offset
+        self.kind = kind
+
+def iter_sources(root):
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.'))
+        for filename in sorted(filenames):
+            if filename.endswith(SOURCE_EXTENSIONS) and not filename.endswith('.d.ts'):
+                yield os.path.join(directory, filename)
+
+def scan_source(source, relative, known_keys, usages, dynamic, index=None):
+    """Append a Usage per key reference in one file, read from its span index"""
+    index = index or index_for(source, is_jsx(relative))
+    for offset, kind, value in index.t_calls:
+        if kind == 'key':
+            usages.append(Usage(value, relative, offset, 't'))
+        elif kind == 'prefix' and value.rstrip('.'):
+            usages.append(Usage(value.rstrip('.'), relative, offset, 'prefix'))
+        else:
+            dynamic.append((relative, offset))
+    literals = [(start, end) for start, end, context in index.strings if context != 'call']
+    for start, end in literals + index.templates:
+        text = source[start + 1:end - 1]
+        if text in known_keys and _KEY_LIKE.match(text):
+            usages.append(Usage(text, relative, start, 'literal'))
+    bindings = [_DEFAULT_BINDING.match(clause).group() for _, _, path, clause in index.imports
+                if clause and _LOCALE_IMPORT.search(path) and _DEFAULT_BINDING.match(clause)]
+    if bindings:
+        _scan_locale_imports(source, relative, bindings, usages)
+
+def _scan_locale_imports(source, relative, bindings, usages):
+    """Property chains on directly imported locale JSON, including simple aliases of it"""
+    names = set(bindings)
+    alias = re.compile(r'\b(?:const|let|var)\s+([\w$]+)\s*=\s*[^;\n]*\b(?:%s)\b' % '|'.join(map(re.escape, bindings)))
+    names.update(alias.findall(source))
+    chain = re.compile(r'\b(?:%s)((?:\??\.[\w$]+)+)' % '|'.join(map(re.escape, sorted(names))))
+    for match in chain.finditer(source):
+        usages.append(Usage(match.group(1).replace('?', '').lstrip('.'), relative, match.start(), 'import'))
+
+def scan_tree(root, known_keys, cache=True):
+    """(usages, dynamic t() call sites, sources) across every source file under root.
+
+    Span indexes are reused from root/.jsx_index.cache.json for files whose
+    content has not changed since the last run (unless cache is False).
+    """
+    usages = []
+    dynamic = []
+    sources = {}
+    index_cache = IndexCache(os.path.join(root, INDEX_CACHE)) if cache else None
+    for path in iter_sources(root):
+        relative = os.path.relpath(path, root).replace(os.sep, '/')
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            source = sources[relative] = f.read()
+        index = index_cache.get(source, is_jsx(relative)) if index_cache else index_for(source, is_jsx(relative))
+        scan_source(source, relative, known_keys, usages, dynamic, index)
+    if index_cache:
+        index_cache.save()
+    return usages, dynamic, sources
+
+def line_of(sources, relative, offset):
+    # Only needed for the few locations that are printed
+    return sources[relative].count('\n', 0, offset) + 1
+
+# Analysis
+
+def _resolve_chain(locales, key):
+    """Longest prefix of a property chain that names a locale entry (the rest is .map, .length, ...)"""
+    parts = key.split('.')
+    for end in range(len(parts), 0, -1):
+        candidate = '.'.join(parts[:end])
+        if any(lookup(locale, candidate) is not None for locale in locales.values()):
+            return candidate
+    return parts[0]
+
+def analyze(locales, usages, keep=()):
+    """Report dict: used keys, missing, unused and parity gaps"""
+    leaves = {lang: leaf_entries(locale) for lang, locale in locales.items()}
+    used = set(keep)
+    missing = {}
+    for usage in usages:
+        if usage.kind == 'import':
+            usage.key = _resolve_chain(locales, usage.key)
+        used.add(usage.key)
+        for lang, locale in locales.items():
+            value = lookup(locale, usage.key)
+            # t() only returns texts; a prefix or an import may name a whole object
+            if value is None or (usage.kind == 't' and not isinstance(value, str)):
+                missing.setdefault(usage.key, {'languages': set(), 'usages': []})['languages'].add(lang)
+        if usage.key in missing:
+            missing[usage.key]['usages'].append(usage)
+
+    def is_used(key):
+        parts = key.split('.')
+        return any('.'.join(parts[:end]) in used for end in range(1, len(parts) + 1))
+
+    all_leaves = set().union(*leaves.values())
+    unused = sorted(key for key in all_leaves if not is_used(key))
+    parity = []
+    languages = sorted(leaves)
+    for key in sorted(all_leaves):
+        present = [lang for lang in languages if key in leaves[lang]]
+        if len(present) < len(languages):
+            # A key that is a text in one language may be an object in another
+            kinds = {lang: ('text' if key in leaves[lang] else 'object' if isinstance(lookup(locales[lang], key), dict)
+                            else 'absent') for lang in languages}
+            parity.append((key, kinds))
+    return {
+        'leaves': {lang: len(entries) for lang, entries in leaves.items()},
+        'used': used,
+        'missing': missing,
+        'unused': unused,
+        'parity': parity,
+    }
+
+def prune(node, keep, prefix=''):
+    """Copy of a nested locale with only the entries keep(dotted key) accepts, order preserved"""
+    result = {}
+    for key, value in node.items():
+        dotted = f'{prefix}.{key}' if prefix else key
+        if keep(dotted):
+            result[key] = value
+        elif isinstance(value, dict):
+            child = prune(value, keep, dotted)
+            if child:
+                result[key] = child
+    return result
+
+def _dump(data):
+    # Same layout as the files in the repo: two-space indent, no trailing newline
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+def write_pruned(root, locales, used, dry_run=False):
+    """Write the pruned locales to every locale directory; return [(path, before, after bytes)]
+
+    Each file is replaced atomically, so the dev server never loads a half-written locale.
+    """
+    def keep(key):
+        parts = key.split('.')
+        return any('.'.join(parts[:end]) in used for end in range(1, len(parts) + 1))
+
+    written = []
+    for lang, locale in sorted(locales.items()):
+        text = _dump(prune(locale, keep))
+        for directory in LOCALE_DIRS:
+            path = os.path.join(root, directory, f'{lang}.json')
+            if not os.path.exists(path):
+                continue
+            before = os.path.getsize(path)
+            if not dry_run:
+                atomic_write(path, lambda f: f.write(text))
+            written.append((os.path.relpath(path, root), before, len(text.encode('utf-8'))))
+    return written
+
+# Output
+
+def print_report(report, duplicates, divergent, dynamic, sources, args):
+    missing = report['missing']
+    print(f"{len(missing)} missing keys")
+    for key in sorted(missing):
+        entry = missing[key]
+        where = ', '.join(f"{u.file}:{line_of(sources, u.file, u.offset)}" for u in entry['usages'][:3])
+        more = f" (+{len(entry['usages']) - 3})" if len(entry['usages']) > 3 else ''
+        print(f"  {key:<50} {'/'.join(sorted(entry['languages'])):<6} {where}{more}")
+
+    print(f"\n{len(report['parity'])} keys not defined in every language")
+    for key, kinds in report['parity']:
+        print(f"  {key:<50} " + '  '.join(f"{lang}={kind}" for lang, kind in sorted(kinds.items())))
+
+    for lang, keys in sorted(duplicates.items()):
+        if keys:
+            print(f"\n{len(keys)} duplicate keys in {lang}.json (the last value wins): {', '.join(keys)}")
+    for lang in divergent:
+        print(f"\npublic/locales/{lang}.json differs from locales/{lang}.json")
+
+    unused = report['unused']
+    print(f"\n{len(unused)} unused entries" + ('' if args.unused else " (--unused to list them)"))
+    if args.unused:
+        for key in unused:
+            print(f"  {key}")
+    if dynamic:
+        print(f"\n{len(dynamic)} t() calls with a computed key; keys they may reach are kept only if some "
+              "literal names them (--keep PREFIX for the rest):")
+        for relative, offset in dynamic:
+            print(f"  {relative}:{line_of(sources, relative, offset)}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report unused, missing and unpaired translation keys")
+    parser.add_argument('--root', default=ROOT, help="frontend directory (default: this script's directory)")
+    parser.add_argument('--unused', action='store_true', help="list every unused entry")
+    parser.add_argument('--keep', action='append', default=[],
+                        help="treat this key or prefix as used, e.g. one only reached by a computed key (repeatable)")
+    parser.add_argument('--prune', action='store_true',
+                        help="rewrite locales/ and public/locales/ without the unused entries and duplicates")
+    parser.add_argument('--dry-run', action='store_true', help="with --prune, report sizes without writing")
+    parser.add_argument('--json', help="also write the report to this file")
+    parser.add_argument('--fail', action='store_true', help="exit with status 1 when keys are missing")
+    args = parser.parse_args(argv)
+    root = os.path.abspath(args.root)
+
+    started = time.perf_counter()
+    locales = {}
+    duplicates = {}
+    divergent = []
+    for lang in LANGUAGES:
+        locales[lang], duplicates[lang] = load_locale(os.path.join(root, 'locales', f'{lang}.json'))
+        public = os.path.join(root, 'public', 'locales', f'{lang}.json')
+        if os.path.exists(public) and load_locale(public)[0] != locales[lang]:
+            divergent.append(lang)
+    known_keys = set()
+    for locale in locales.values():
+        for key in leaf_entries(locale):
+            parts = key.split('.')
+            known_keys.update('.'.join(parts[:end]) for end in range(1, len(parts) + 1))
+    usages, dynamic, sources = scan_tree(root, known_keys)
+    report = analyze(locales, usages, args.keep)
+    elapsed = time.perf_counter() - started
+
+    print_report(report, duplicates, divergent, dynamic, sources, args)
+    distinct = len({u.key for u in usages})
+    leaves = ', '.join(f"{lang} {count}" for lang, count in sorted(report['leaves'].items()))
+    print(f"\nScanned {len(sources)} files in {elapsed * 1000:.0f} ms: {len(usages)} references to "
+          f"{distinct} keys; locale entries: {leaves}")
+
+    if args.prune:
+        for path, before, after in write_pruned(root, locales, report['used'], args.dry_run):
+            print(f"{'Would write' if args.dry_run else 'Wrote'} {path}: {before:,} -> {after:,} bytes "
+                  f"({1 - after / before:.0%} smaller)")
+        if not args.dry_run:
+            print("Run build_locale_tables.py to regenerate the flat tables")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'missing': {key: {'languages': sorted(entry['languages']),
+                                  'usages': [f"{u.file}:{line_of(sources, u.file, u.offset)}" for u in entry['usages']]}
+                            for key, entry in sorted(report['missing'].items())},
+                'unused': report['unused'],
+                'parity': [{'key': key, **kinds} for key, kinds in report['parity']],
+                'duplicates': duplicates,
+                'dynamic': [f"{relative}:{line_of(sources, relative, offset)}" for relative, offset in dynamic],
+            }, f, indent=2, ensure_ascii=False)
+    return 1 if args.fail and report['missing'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,11 +1,280 @@
 #!/usr/bin/env python3
 """
 Comprehensive script to add i18n support to all remaining pages
+
+    python update_all_pages.py --dry-run
+    python update_all_pages.py --include 'components/**/*.tsx' --include 'app/**/*.ts' --jobs 8
 """
+import argparse
+import hashlib
+import json
+import mmap
 import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from jsx_index import index_for, is_jsx, lexer_version
+from postman_collection import atomic_write
+
+# Common Arabic text replacements
+REPLACEMENTS = {
+    # Common UI
+    'تحميل': 'common.loading',
+    'حفظ': 'common.save',
+    'إلغاء': 'common.cancel',
+    'حذف': 'common.delete',
+    'تعديل': 'common.edit',
+    'إرسال': 'common.submit',
+    'بحث': 'common.search',
+    'تأكيد': 'common.confirm',
+    'رجوع': 'common.back',
+    'التالي': 'common.next',
+    'السابق': 'common.previous',
+    'إغلاق': 'common.close',
+    'عرض': 'common.view',
+    'التفاصيل': 'common.details',
+    'المزيد': 'common.more',
+    'الكل': 'common.all',
+    'نشط': 'common.active',
+    'الاسم': 'common.name',
+    'البريد الإلكتروني': 'common.email',
+    'رقم الهاتف': 'common.phone',
+    'العنوان': 'common.address',
+    'التاريخ': 'common.date',
+    'الوقت': 'common.time',
+    'الوصف': 'common.description',
+    'رفع': 'common.upload',
+    'تحديث': 'common.update',
+    'إضافة': 'common.add',
+    'إزالة': 'common.remove',
+
+    # Profile
+    'الملف الشخصي': 'common.profile',
+    'تسجيل الخروج': 'common.logout',
+    'لوحة التحكم': 'common.dashboard',
+    'الإعدادات': 'common.settings',
+    'الإشعارات': 'common.notifications',
+    'عرض جميع الإشعارات': 'common.showAllNotifications',
+
+    # Student
+    'الطالب': 'auth.student',
+    'الطلاب': 'teacher.students',
+    'كورساتي': 'student.myCourses',
+    'دوراتي': 'student.myCourses',
+    'الكورسات': 'student.myCourses',
+    'الدورات': 'student.myCourses',
+    'التقدم': 'student.myProgress',
+    'جلساتي': 'student.mySessions',
+    'الجلسات': 'student.mySessions',
+    'تسجيل الآن': 'landing.registerNow',
+    'استكمل المشاهدة': 'student.continueWatching',
+    'ابدأ الدورة': 'student.startCourse',
+    'عرض الدورة': 'student.viewCourse',
+
+    # Teacher
+    'المحاضر': 'auth.teacher',
+    'المحاضرين': 'landing.teachers',
+    'إنشاء دورة جديدة': 'teacher.createCourse',
+    'إنشاء كورس جديد': 'teacher.createCourse',
+    'الأرباح': 'teacher.earnings',
+    'الإحصائيات': 'teacher.statistics',
+    'الجدول': 'landing.schedule',
+
+    # Company
+    'الشركة': 'auth.company',
+    'الوظائف': 'company.myJobs',
+    'الطلبات': 'company.applications',
+    'نشر وظيفة': 'company.postJob',
+    'إنشاء وظيفة': 'company.postJob',
+
+    # General
+    'مرحباً': 'common.welcome',
+    'مرحبا': 'common.welcome',
+    'نعم': 'common.yes',
+    'لا': 'common.no',
+    'خطأ': 'common.error',
+    'نجح': 'common.success',
+}
+
+# Locale the reverse index is built from, relative to the frontend root
+DEFAULT_LOCALE = os.path.join('locales', 'ar.json')
+
+def _flatten_locale(node, prefix=''):
+    for key, value in node.items():
+        dotted = f'{prefix}.{key}' if prefix else key
+        if isinstance(value, dict):
+            yield from _flatten_locale(value, dotted)
+        elif isinstance(value, str):
+            yield dotted, value
+
+def build_reverse_index(locale):
+    """{Arabic text: [locale keys holding it, in file order]} for texts the scan can match"""
+    index = {}
+    for key, text in _flatten_locale(locale):
+        # Text with a delimiter or a JSX expression brace is never a whole static node or literal
+        if text and not any(c in text for c in '<>"{}'):
+            index.setdefault(text, []).append(key)
+    return index
+
+def load_reverse_index(locale_path):
+    """Reverse index of a locale file, cached next to it as .<name>.index.json.
+
+    The cache is keyed by the locale's sha1 and rebuilt only when it changes.
+    Returns (index, locale sha1).
+    """
+    with open(locale_path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha1(data).hexdigest()
+    directory, name = os.path.split(os.path.abspath(locale_path))
+    cache_path = os.path.join(directory, f'.{name}.index.json')
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('locale_sha1') == digest:
+            return cache['index'], digest
+    except (OSError, ValueError):
+        pass
+    index = build_reverse_index(json.loads(data))
+    try:
+        text = json.dumps({'locale_sha1': digest, 'index': index}, ensure_ascii=False)
+        atomic_write(cache_path, lambda f: f.write(text))
+    except OSError:
+        pass
+    return index, digest
+
+def _camel(name):
+    """'university_student' / 'follow-requests' -> 'universityStudent' / 'followRequests'"""
+    words = [w for w in re.split(r'[_\-\s]+', name.strip('[]()')) if w]
+    return words[0][:1].lower() + words[0][1:] + ''.join(w[:1].upper() + w[1:] for w in words[1:]) if words else ''
+
+def route_namespaces(relative, namespaces):
+    """Locale namespaces a file's route suggests, most specific first.
+
+    app/company/jobs/page.tsx -> ('companyJobs', 'company'); a segment pair is
+    tried as one namespace before the segments on their own.
+    """
+    parts = [_camel(p) for p in relative.split('/')[:-1]]
+    found = []
+    for i in range(len(parts) - 1, -1, -1):
+        if i + 1 < len(parts) and parts[i + 1]:
+            pair = parts[i] + parts[i + 1][:1].upper() + parts[i + 1][1:]
+            if pair in namespaces and pair not in found:
+                found.append(pair)
+        if parts[i] in namespaces and parts[i] not in found:
+            found.append(parts[i])
+    return tuple(found)
+
+class ReplacementEngine:
+    """Arabic text -> translation key lookup for one run.
+
+    Candidates come from the locale's reverse index plus the hand-kept
+    REPLACEMENTS. The key chosen for a text prefers, in order: a namespace
+    suggested by the file's route, the REPLACEMENTS entry, a common.* key and
+    then the first key in the locale.
+    """
+
+    def __init__(self, replacements, index=None):
+        self.replacements = dict(replacements)
+        self.candidates = {text: list(keys) for text, keys in (index or {}).items()}
+        for text, key in self.replacements.items():
+            keys = self.candidates.setdefault(text, [])
+            if key not in keys:
+                keys.append(key)
+        self.namespaces = {key.split('.', 1)[0] for keys in self.candidates.values() for key in keys}
+        self._resolved = {}
+
+    def lookup(self, namespaces=()):
+        """{text: key} for a file whose route suggests namespaces (cached per namespace tuple)"""
+        table = self._resolved.get(namespaces)
+        if table is None:
+            table = self._resolved[namespaces] = {text: self._choose(text, keys, namespaces)
+                                                  for text, keys in self.candidates.items()}
+        return table
+
+    def _choose(self, text, keys, namespaces):
+        for namespace in namespaces:
+            for key in keys:
+                if key.startswith(namespace + '.'):
+                    return key
+        if text in self.replacements:
+            return self.replacements[text]
+        for key in keys:
+            if key.startswith('common.'):
+                return key
+        return keys[0]
+
+def compile_replacements(replacements=None, locale_path=None):
+    """Engine for the hand-kept table, extended with a locale's reverse index when locale_path is given"""
+    index = load_reverse_index(locale_path)[0] if locale_path else None
+    return ReplacementEngine(REPLACEMENTS if replacements is None else replacements, index)
+
+_ENGINES = {}
+
+def default_engine(locale_path=None):
+    """Engine per locale, built once per process"""
+    engine = _ENGINES.get(locale_path)
+    if engine is None:
+        engine = _ENGINES[locale_path] = compile_replacements(locale_path=locale_path)
+    return engine
+
+# A literal right after one of these, or used as an object key, is data rather than UI text
+_COMPARED = re.compile(r'(?:[=!]==?|\bcase)\s*\Z')
+_OBJECT_KEY = re.compile(r'[{,]\s*\Z')
+
+def replacement_edits(content, index, replacements):
+    """Splices (start, end, text) turning Arabic UI text into t() calls.
+
+    Text nodes match on their text without surrounding whitespace; attribute
+    values become {t("key")} and literals inside JSX expressions t("key").
+    Literals in plain code are only converted inside the default-export
+    component, where t is in scope. A literal that is compared or used as
+    an object key or case label is never converted.
+    """
+    edits = []
+    for start, end in index.text_nodes:
+        raw = content[start:end]
+        text = raw.strip()
+        key = replacements.get(text) if text else None
+        if key is not None:
+            lead = start + len(raw) - len(raw.lstrip())
+            edits.append((lead, lead + len(text), f'{{t("{key}")}}'))
+    for start, end, context in index.strings:
+        if context == 'call' or (context == 'code' and not index.in_component(start)):
+            continue
+        if context != 'attr' and (_COMPARED.search(content, max(0, start - 8), start)
+                                  or _OBJECT_KEY.search(content, max(0, start - 8), start)
+                                  and content[end:end + 8].lstrip().startswith(':')):
+            continue
+        key = replacements.get(content[start + 1:end - 1])
+        if key is not None:
+            edits.append((start, end, f'{{t("{key}")}}' if context == 'attr' else f't("{key}")'))
+    return edits
+
+def splice(content, edits):
+    """Apply non-overlapping (start, end, text) edits in one pass"""
+    if not edits:
+        return content
+    parts = []
+    position = 0
+    for start, end, text in sorted(edits, key=lambda edit: (edit[0], edit[1])):
+        parts.append(content[position:start])
+        parts.append(text)
+        position = end
+    parts.append(content[position:])
+    return ''.join(parts)
+
+def apply_replacements(content, engine, namespaces=(), index=None):
+    """Replace every matching JSX text node and UI string literal.
+
+    The span index locates text nodes and literals in one lexer pass; each is
+    looked up whole in a dict, so the cost is linear in the file size whatever
+    the number of keys.
+    """
+    index = index or index_for(content)
+    return splice(content, replacement_edits(content, index, engine.lookup(namespaces)))
+
 def should_update_file(content):
     """Check if file needs updating"""
     # Skip if already has useLanguage from our hook
@@ -16,190 +285,434 @@ def should_update_file(content):
         return True
     return False
 
-def update_file(file_path):
-    """Update a single file with i18n support"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+# Arabic letters (U+0600-U+06FF) are the only characters whose UTF-8 lead byte is 0xD8-0xDB
+_ARABIC_LEAD_BYTES = (b'\xd8', b'\xd9', b'\xda', b'\xdb')
+_HOOK_IMPORTS = (b'from "@/hooks/useLanguage"', b"from '@/hooks/useLanguage'")
+
+# Smaller files are cheaper to read() than to map
+MMAP_THRESHOLD = 256 * 1024
+
+def _bytes_need_update(data):
+    if any(data.find(hook) >= 0 for hook in _HOOK_IMPORTS):
+        return False
+    return any(data.find(lead) >= 0 for lead in _ARABIC_LEAD_BYTES)
+
+def may_need_update(file_path):
+    """Byte-level should_update_file(), before any decoding.
+
+    Returns False only for files should_update_file() would skip too.
+    """
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            return _bytes_need_update(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return _bytes_need_update(data)
+
+_USE_LANGUAGE = re.compile(r'\buseLanguage\b')
+
+def update_content(content, engine=None, namespaces=(), index=None):
+    """Return content with i18n support added, or None if it needs no change.
 
+    namespaces are the locale namespaces to prefer for this file (see
+    route_namespaces). Every change is a splice at a position taken from the
+    file's span index, applied in a single pass.
+    """
     if not should_update_file(content):
+        return None
+    index = index or index_for(content)
+    edits = []
+
+    # Add "use client" above the first statement, below any leading comments
+    if 'use client' not in index.directives:
+        line_start = content.rfind('\n', 0, index.first_code) + 1
+        edits.append((line_start, line_start, '"use client";\n\n'))
+
+    # Import the hook after the last import (or the directives, in a file without imports)
+    if not any(clause and _USE_LANGUAGE.search(clause) for _, _, _, clause in index.imports):
+        static_imports = [end for _, end, _, clause in index.imports if clause is not None]
+        if static_imports:
+            edits.append((static_imports[-1], static_imports[-1], '\nimport { useLanguage } from "@/hooks/useLanguage";'))
+        elif index.directives:
+            edits.append((index.directive_end, index.directive_end, '\nimport { useLanguage } from "@/hooks/useLanguage";'))
+        else:
+            line_start = content.rfind('\n', 0, index.first_code) + 1
+            edits.append((line_start, line_start, 'import { useLanguage } from "@/hooks/useLanguage";\n\n'))
+
+    # Call the hook at the top of the default-export component
+    if index.component is not None:
+        _, body_open, body_close = index.component
+        if 'useLanguage(' not in content[body_open:body_close]:
+            edits.append((body_open + 1, body_open + 1, '\n  const { t } = useLanguage();'))
+
+    # Arabic UI strings in JSX text nodes and string literals
+    edits += replacement_edits(content, index, (engine or default_engine()).lookup(namespaces))
+
+    updated = splice(content, edits)
+    return updated if updated != content else None
+
+def update_file(file_path, engine=None, write=True, base_path='.'):
+    """Update a single file with i18n support.
+
+    Its path relative to base_path (the frontend root) picks the locale
+    namespaces tried first, as in process_file().
+    """
+    if not may_need_update(file_path):
         return False
 
-    original_content = content
-
-    # Add "use client" if not present
-    if '"use client"' not in content and "'use client'" not in content:
-        # Add after any leading comments
-        lines = content.split('\n')
-        insert_index = 0
-        for i, line in enumerate(lines):
-            if line.strip() and not line.strip().startswith('//') and not line.strip().startswith('/*'):
-                insert_index = i
-                break
-        lines.insert(insert_index, '"use client";\n')
-        content = '\n'.join(lines)
-
-    # Add import for useLanguage if not present
-    if 'useLanguage' not in content:
-        # Find the last import statement
-        import_pattern = r'^import\s+.*?from\s+["\'].*?["\'];?\s*$'
-        imports = list(re.finditer(import_pattern, content, re.MULTILINE))
-        if imports:
-            last_import = imports[-1]
-            insert_pos = last_import.end()
-            content = (
-                content[:insert_pos] +
-                '\nimport { useLanguage } from "@/hooks/useLanguage";' +
-                content[insert_pos:]
-            )
-
-    # Add const { t } = useLanguage(); in the component
-    # Find the component function
-    component_pattern = r'export default function \w+\([^)]*\)\s*\{'
-    match = re.search(component_pattern, content)
-    if match and 'const { t } = useLanguage()' not in content:
-        insert_pos = match.end()
-        content = (
-            content[:insert_pos] +
-            '\n  const { t } = useLanguage();' +
-            content[insert_pos:]
-        )
-
-    # Common Arabic text replacements
-    replacements = {
-        # Common UI
-        'تحميل': 'common.loading',
-        'حفظ': 'common.save',
-        'إلغاء': 'common.cancel',
-        'حذف': 'common.delete',
-        'تعديل': 'common.edit',
-        'إرسال': 'common.submit',
-        'بحث': 'common.search',
-        'تأكيد': 'common.confirm',
-        'رجوع': 'common.back',
-        'التالي': 'common.next',
-        'السابق': 'common.previous',
-        'إغلاق': 'common.close',
-        'عرض': 'common.view',
-        'التفاصيل': 'common.details',
-        'المزيد': 'common.more',
-        'الكل': 'common.all',
-        'نشط': 'common.active',
-        'الاسم': 'common.name',
-        'البريد الإلكتروني': 'common.email',
-        'رقم الهاتف': 'common.phone',
-        'العنوان': 'common.address',
-        'التاريخ': 'common.date',
-        'الوقت': 'common.time',
-        'الوصف': 'common.description',
-        'رفع': 'common.upload',
-        'تحديث': 'common.update',
-        'إضافة': 'common.add',
-        'إزالة': 'common.remove',
-
-        # Profile
-        'الملف الشخصي': 'common.profile',
-        'تسجيل الخروج': 'common.logout',
-        'لوحة التحكم': 'common.dashboard',
-        'الإعدادات': 'common.settings',
-        'الإشعارات': 'common.notifications',
-        'عرض جميع الإشعارات': 'common.showAllNotifications',
-
-        # Student
-        'الطالب': 'auth.student',
-        'الطلاب': 'teacher.students',
-        'كورساتي': 'student.myCourses',
-        'دوراتي': 'student.myCourses',
-        'الكورسات': 'student.myCourses',
-        'الدورات': 'student.myCourses',
-        'التقدم': 'student.myProgress',
-        'جلساتي': 'student.mySessions',
-        'الجلسات': 'student.mySessions',
-        'تسجيل الآن': 'landing.registerNow',
-        'استكمل المشاهدة': 'student.continueWatching',
-        'ابدأ الدورة': 'student.startCourse',
-        'عرض الدورة': 'student.viewCourse',
-
-        # Teacher
-        'المحاضر': 'auth.teacher',
-        'المحاضرين': 'landing.teachers',
-        'إنشاء دورة جديدة': 'teacher.createCourse',
-        'إنشاء كورس جديد': 'teacher.createCourse',
-        'الأرباح': 'teacher.earnings',
-        'الإحصائيات': 'teacher.statistics',
-        'الجدول': 'landing.schedule',
-
-        # Company
-        'الشركة': 'auth.company',
-        'الوظائف': 'company.myJobs',
-        'الطلبات': 'company.applications',
-        'نشر وظيفة': 'company.postJob',
-        'إنشاء وظيفة': 'company.postJob',
-
-        # General
-        'مرحباً': 'common.welcome',
-        'مرحبا': 'common.welcome',
-        'نعم': 'common.yes',
-        'لا': 'common.no',
-        'خطأ': 'common.error',
-        'نجح': 'common.success',
-    }
-
-    # Only replace in specific contexts (JSX text, attributes)
-    for arabic, key in replacements.items():
-        # Replace in JSX text nodes: >text<
-        pattern1 = f'>{re.escape(arabic)}<'
-        replacement1 = f'>{{t("{key}")}}<'
-        content = re.sub(pattern1, replacement1, content)
-
-        # Replace in string literals: "text" or 'text' but be careful
-        pattern2 = f'"{re.escape(arabic)}"'
-        replacement2 = f'{{t("{key}")}}'
-        # Only replace if it's likely a UI string (not in comments or imports)
-        if '>' in content.split(pattern2)[0][-50:]:  # Check context
-            content = re.sub(pattern2, replacement2, content)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    engine = engine or default_engine()
+    relative = os.path.relpath(file_path, base_path).replace(os.sep, '/')
+    content = update_content(content, engine, route_namespaces(relative, engine.namespaces),
+                             index_for(content, is_jsx(file_path)))
 
     # Write back if changed
-    if content != original_content:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        return True
-    return False
+    if content is None:
+        return False
+    if write:
+        atomic_write(file_path, lambda f: f.write(content))
+    return True
+
+# Page directories the codemod was written for, relative to the frontend root
+DEFAULT_INCLUDE = [
+    'app/student/**/page.tsx',
+    'app/teacher/**/page.tsx',
+    'app/company/**/page.tsx',
+    'app/university_student/**/page.tsx',
+    'app/parent/**/page.tsx',
+]
+DEFAULT_EXCLUDE = ['**/node_modules/**', '**/.next/**']
+
+def _glob_regex(pattern):
+    """Compile a path glob where ** spans directories and * / ? stay within one"""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            parts.append('[^/]')
+            i += 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile(''.join(parts) + r'\Z')
+
+def _static_prefix(pattern):
+    """Leading directories of a glob that contain no wildcards"""
+    prefix = []
+    for part in pattern.split('/')[:-1]:
+        if any(c in part for c in '*?['):
+            break
+        prefix.append(part)
+    return '/'.join(prefix)
+
+def _walk_starts(include):
+    """Wildcard-free directories of the include globs, without nested duplicates, as 'dir/' prefixes"""
+    starts = sorted({_static_prefix(p) for p in include})
+    # Walking 'app' already covers 'app/student'
+    starts = [s for s in starts if not any(s != o and (o == '' or s.startswith(o + '/')) for o in starts)]
+    return [s + '/' if s else '' for s in starts]
+
+def _scan_directory(root, prefix, include_res, exclude_res):
+    """(matching file entries, subdirectory prefixes) of one directory, or None if it is gone"""
+    try:
+        entries = os.scandir(os.path.join(root, prefix) if prefix else root)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    files = []
+    subdirs = []
+    with entries:
+        for entry in entries:
+            relative = prefix + entry.name
+            if entry.is_dir():
+                if not any(r.match(relative + '/') for r in exclude_res):
+                    subdirs.append(relative + '/')
+            elif any(r.match(relative) for r in include_res) and not any(r.match(relative) for r in exclude_res):
+                files.append((relative, entry))
+    return files, subdirs
+
+def find_files(root, include, exclude):
+    """Relative posix paths under root matching any include glob and no exclude glob, sorted.
+
+    The tree is walked once, starting from the wildcard-free directories of
+    the include globs, and excluded directories are pruned instead of walked.
+    """
+    include_res = [_glob_regex(p) for p in include]
+    exclude_res = [_glob_regex(p) for p in exclude]
+    files = []
+    stack = _walk_starts(include)
+    while stack:
+        scanned = _scan_directory(root, stack.pop(), include_res, exclude_res)
+        if scanned is not None:
+            files.extend(relative for relative, _ in scanned[0])
+            stack.extend(scanned[1])
+    files.sort()
+    return files
+
+# Manifest
+MANIFEST_NAME = '.update_all_pages.manifest.json'
 
-def main():
-    base_path = Path('/home/user/ACE/frontend/app')
+def codemod_version(locale_path=None):
+    """Fingerprint of this script, the lexer (jsx_index.py) and the locale: changing any of them
+    invalidates every manifest entry"""
+    digest = hashlib.sha1()
+    with open(os.path.abspath(__file__), 'rb') as f:
+        digest.update(f.read())
+    digest.update(lexer_version().encode('ascii'))
+    if locale_path:
+        digest.update(load_reverse_index(locale_path)[1].encode('ascii'))
+    return digest.hexdigest()
 
-    # Find all page.tsx files in user-specific directories
-    patterns = [
-        'student/**/page.tsx',
-        'teacher/**/page.tsx',
-        'company/**/page.tsx',
-        'university_student/**/page.tsx',
-        'parent/**/page.tsx',
-    ]
+def load_manifest(root, version):
+    """{relative path: [size, mtime_ns, sha1, outcome]} from the last runs, or {}"""
+    try:
+        with open(os.path.join(root, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get('files', {}) if data.get('version') == version else {}
 
-    updated_files = []
-    skipped_files = []
+def save_manifest(root, files, version):
+    atomic_write(os.path.join(root, MANIFEST_NAME),
+                 lambda f: json.dump({'version': version, 'files': files}, f, separators=(',', ':'), sort_keys=True))
 
-    for pattern in patterns:
-        for file_path in base_path.glob(pattern):
+def _signature(file_path, with_hash=True):
+    """(size, mtime_ns, sha1, needs work) of a file; large files are hashed and prefiltered through mmap"""
+    with open(file_path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        if stat.st_size < MMAP_THRESHOLD:
+            data = f.read()
+            digest = hashlib.sha1(data).hexdigest() if with_hash else None
+            return stat.st_size, stat.st_mtime_ns, digest, _bytes_need_update(data)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            digest = hashlib.sha1(data).hexdigest() if with_hash else None
+            return stat.st_size, stat.st_mtime_ns, digest, _bytes_need_update(data)
+
+def process_file(job):
+    """Worker: (file path, relative path, write, sha1 from the manifest, locale path)
+    -> (status, error message, manifest entry)
+
+    A file whose content hash matches the manifest is 'unchanged' and is not
+    decoded at all.
+    """
+    file_path, relative, write, known_hash, locale_path = job
+    try:
+        # The hash is only needed to compare with or to record in the manifest
+        size, mtime_ns, digest, needs_work = _signature(file_path, with_hash=write or known_hash is not None)
+        if known_hash is not None and digest == known_hash:
+            return 'unchanged', None, [size, mtime_ns, digest, 'skipped']
+        status = 'skipped'
+        if needs_work:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            engine = default_engine(locale_path)
+            content = update_content(content, engine, route_namespaces(relative, engine.namespaces),
+                                     index_for(content, is_jsx(relative)))
+            if content is not None:
+                status = 'updated'
+                if write:
+                    atomic_write(file_path, lambda f: f.write(content))
+                    encoded = content.encode('utf-8')
+                    stat = os.stat(file_path)
+                    size, mtime_ns, digest = stat.st_size, stat.st_mtime_ns, hashlib.sha1(encoded).hexdigest()
+        return status, None, [size, mtime_ns, digest, status]
+    except Exception as e:
+        return 'error', str(e), None
+
+def process_files(base_path, files, manifest, write=True, jobs=1, locale_path=None):
+    """Process relative paths, skipping files whose stat matches the manifest.
+
+    Returns {relative path: (status, error)} in file order and updates
+    manifest in place (entries are only recorded when write is set).
+    """
+    results = {}
+    pending = []
+    for relative in files:
+        entry = manifest.get(relative)
+        if entry is not None:
             try:
-                if update_file(file_path):
-                    updated_files.append(str(file_path.relative_to(base_path.parent)))
-                    print(f"✓ Updated: {file_path.relative_to(base_path.parent)}")
-                else:
-                    skipped_files.append(str(file_path.relative_to(base_path.parent)))
-                    print(f"- Skipped: {file_path.relative_to(base_path.parent)}")
-            except Exception as e:
-                print(f"✗ Error updating {file_path}: {e}")
+                stat = os.stat(os.path.join(base_path, relative))
+            except FileNotFoundError:
+                continue
+            if entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+                results[relative] = ('unchanged', None)
+                continue
+        pending.append(relative)
+
+    work = [(os.path.join(base_path, relative), relative, write, (manifest.get(relative) or [None] * 3)[2], locale_path)
+            for relative in pending]
+    if jobs > 1 and len(work) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            outcomes = list(pool.map(process_file, work, chunksize=max(1, len(work) // (jobs * 8))))
+    else:
+        outcomes = [process_file(job) for job in work]
+    for relative, (status, error, entry) in zip(pending, outcomes):
+        results[relative] = (status, error)
+        if write and entry is not None:
+            # A dry run must not record 'updated' for a file it left as it was
+            manifest[relative] = entry
+    return {relative: results[relative] for relative in files if relative in results}
+
+def print_results(results, dry_run=False):
+    counts = {'updated': [], 'skipped': [], 'unchanged': [], 'error': []}
+    for relative, (status, error) in results.items():
+        counts[status].append(relative)
+        if status == 'updated':
+            print(f"✓ {'Would update' if dry_run else 'Updated'}: {relative}")
+        elif status == 'skipped':
+            print(f"- Skipped: {relative}")
+        elif status == 'error':
+            print(f"✗ Error updating {relative}: {error}")
+    return counts
+
+class TreeWatcher:
+    """Polls the include directories for changed files.
+
+    A poll stats every known directory and file. Directories whose mtime
+    changed are rescanned to pick up new files and subdirectories, so a save
+    is seen within one poll interval without rewalking the tree.
+    """
+
+    def __init__(self, root, include, exclude):
+        self.root = root
+        self.include_res = [_glob_regex(p) for p in include]
+        self.exclude_res = [_glob_regex(p) for p in exclude]
+        self.files = {}
+        self.dirs = {}
+        for prefix in _walk_starts(include):
+            self._scan(prefix)
+
+    def _scan(self, prefix):
+        """Record a directory (recursing into new subdirectories); return files that are new or changed"""
+        try:
+            mtime_ns = os.stat(os.path.join(self.root, prefix)).st_mtime_ns
+        except FileNotFoundError:
+            return set()
+        scanned = _scan_directory(self.root, prefix, self.include_res, self.exclude_res)
+        if scanned is None:
+            return set()
+        self.dirs[prefix] = mtime_ns
+        changed = set()
+        for relative, entry in scanned[0]:
+            stat = entry.stat()
+            if self.files.get(relative) != (stat.st_size, stat.st_mtime_ns):
+                self.files[relative] = (stat.st_size, stat.st_mtime_ns)
+                changed.add(relative)
+        for subdir in scanned[1]:
+            if subdir not in self.dirs:
+                changed |= self._scan(subdir)
+        return changed
+
+    def refresh(self, relative):
+        """Take a file's current stat as seen, e.g. after the codemod rewrote it"""
+        try:
+            stat = os.stat(os.path.join(self.root, relative))
+        except FileNotFoundError:
+            self.files.pop(relative, None)
+            return
+        self.files[relative] = (stat.st_size, stat.st_mtime_ns)
+
+    def poll(self):
+        """Relative paths of files added or modified since the last poll, sorted"""
+        changed = set()
+        for prefix, mtime_ns in list(self.dirs.items()):
+            try:
+                current = os.stat(os.path.join(self.root, prefix)).st_mtime_ns
+            except FileNotFoundError:
+                del self.dirs[prefix]
+                continue
+            if current != mtime_ns:
+                changed |= self._scan(prefix)
+        for relative, signature in list(self.files.items()):
+            try:
+                stat = os.stat(os.path.join(self.root, relative))
+            except FileNotFoundError:
+                del self.files[relative]
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != signature:
+                self.files[relative] = (stat.st_size, stat.st_mtime_ns)
+                changed.add(relative)
+        return sorted(changed)
+
+def watch(base_path, include, exclude, manifest, write, interval, locale_path=None, version=None):
+    watcher = TreeWatcher(base_path, include, exclude)
+    print(f"\nWatching {len(watcher.files)} files in {len(watcher.dirs)} directories (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(interval)
+            changed = watcher.poll()
+            if not changed:
+                continue
+            started = time.perf_counter()
+            results = process_files(base_path, changed, manifest, write, locale_path=locale_path)
+            for relative in changed:
+                watcher.refresh(relative)
+            counts = print_results(results, not write)
+            if write and version:
+                save_manifest(base_path, manifest, version)
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"  {len(changed)} changed, {len(counts['updated'])} updated in {elapsed:.0f} ms")
+    except KeyboardInterrupt:
+        print()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Add i18n support to frontend pages and components")
+    parser.add_argument('--root', default=os.path.dirname(os.path.abspath(__file__)),
+                        help="frontend directory the globs are relative to (default: this script's directory)")
+    parser.add_argument('--include', action='append',
+                        help="glob of files to process, e.g. 'components/**/*.tsx' (repeatable; "
+                             "default: page.tsx under the student/teacher/company/university_student/parent apps)")
+    parser.add_argument('--exclude', action='append', default=[], help="glob of files to leave alone (repeatable)")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="worker processes (1 processes files in this process)")
+    parser.add_argument('--dry-run', action='store_true', help="report the files that would change without writing")
+    parser.add_argument('--no-manifest', action='store_true',
+                        help=f"process every file instead of skipping those unchanged since the last run ({MANIFEST_NAME})")
+    parser.add_argument('--locale', default=DEFAULT_LOCALE,
+                        help="locale whose strings are converted, relative to --root (default: locales/ar.json)")
+    parser.add_argument('--no-locale', action='store_true', help="only convert the hand-kept REPLACEMENTS")
+    parser.add_argument('--watch', action='store_true', help="keep running and process files as they are saved")
+    parser.add_argument('--interval', type=float, default=0.05, help="--watch poll interval in seconds")
+    args = parser.parse_args(argv)
+
+    base_path = Path(args.root).resolve()
+    include = args.include or DEFAULT_INCLUDE
+    exclude = DEFAULT_EXCLUDE + args.exclude
+    write = not args.dry_run
+    locale_path = None if args.no_locale else os.path.join(base_path, args.locale)
+    version = None if args.no_manifest else codemod_version(locale_path)
+    manifest = load_manifest(base_path, version) if version else {}
+
+    files = find_files(base_path, include, exclude)
+    # Results come back in file order whatever the worker scheduling was
+    results = process_files(base_path, files, manifest, write, args.jobs, locale_path)
+    counts = print_results(results, args.dry_run)
+    if write and version:
+        # Forget files that no longer match
+        save_manifest(base_path, {relative: manifest[relative] for relative in files if relative in manifest}, version)
 
     print(f"\n\nSummary:")
-    print(f"Updated: {len(updated_files)} files")
-    print(f"Skipped: {len(skipped_files)} files")
+    print(f"{'Would update' if args.dry_run else 'Updated'}: {len(counts['updated'])} files")
+    print(f"Skipped: {len(counts['skipped'])} files")
+    if counts['unchanged']:
+        print(f"Unchanged since last run: {len(counts['unchanged'])} files")
 
-    if updated_files:
+    if counts['updated']:
         print("\nUpdated files:")
-        for f in updated_files:
+        for f in counts['updated']:
             print(f"  - {f}")
 
+    if args.watch:
+        watch(base_path, include, exclude, manifest, write, args.interval, locale_path, version)
+
 if __name__ == '__main__':
     main()
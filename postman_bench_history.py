@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Benchmark history for replay/load runs against the collection.
+
+Runs are stored in a local SQLite file, tagged with the git commit they
+measured, with the full latency histogram of every endpoint. `compare`
+flags endpoints whose p95 regressed: the distribution-free (binomial
+order-statistic) confidence interval of the new p95 must sit entirely
+above the old one's by more than the threshold, so noise on endpoints with
+few samples is not reported as a regression.
+
+    python postman_load_test.py -u 20 -d 30 --history
+    python postman_bench_history.py record report.json --label nightly
+    python postman_bench_history.py compare --threshold 0.10
+    python postman_bench_history.py annotate
+"""
+import argparse
+import json
+import math
+import os
+import sqlite3
+import subprocess
+import sys
+from contextlib import closing
+from datetime import datetime, timezone
+from statistics import NormalDist
+
+from postman_collection import DEFAULT_COLLECTION, endpoint_key, iter_requests, load_collection, save_collection
+from postman_load_test import Histogram
+
+DEFAULT_DB = '.bench_history.sqlite'
+
+# Overrides DEFAULT_DB for every tool that records or reads runs
+DB_ENV = 'ACE_BENCH_DB'
+
+PERF_START = '<!-- perf -->'
+PERF_END = '<!-- /perf -->'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    git_commit TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    label TEXT,
+    base_url TEXT,
+    users INTEGER,
+    elapsed_s REAL
+);
+CREATE TABLE IF NOT EXISTS timings (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    endpoint TEXT NOT NULL,
+    requests INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    p50_ms REAL,
+    p95_ms REAL,
+    p99_ms REAL,
+    histogram TEXT NOT NULL,
+    PRIMARY KEY (run_id, endpoint)
+);
+CREATE INDEX IF NOT EXISTS timings_endpoint ON timings(endpoint, run_id);
+"""
+
+def db_path(path=None):
+    """The history file to use: path if given, else $ACE_BENCH_DB, else DEFAULT_DB"""
+    return path or os.environ.get(DB_ENV) or DEFAULT_DB
+
+def connect(path=None):
+    db = sqlite3.connect(db_path(path))
+    db.row_factory = sqlite3.Row
+    db.execute('PRAGMA foreign_keys = ON')
+    db.executescript(SCHEMA)
+    return db
+
+def current_commit():
+    """HEAD commit, suffixed with -dirty when the work tree has changes"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short=12', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True,
+                               text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return commit + ('-dirty' if dirty else '')
+
+def record_report(report, path=None, label=None, commit=None):
+    """Store a postman_load_test.py report in db_path(path) and return the new run id"""
+    with closing(connect(path)) as db, db:
+        cursor = db.execute(
+            'INSERT INTO runs (git_commit, created_at, label, base_url, users, elapsed_s) VALUES (?, ?, ?, ?, ?, ?)',
+            (commit or current_commit(), datetime.now(timezone.utc).isoformat(timespec='seconds'), label,
+             report.get('base_url'), report.get('users'), report.get('elapsed_s')))
+        run_id = cursor.lastrowid
+        db.executemany(
+            'INSERT INTO timings (run_id, endpoint, requests, errors, p50_ms, p95_ms, p99_ms, histogram) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            [(run_id, e['endpoint'], e['requests'], e['errors'] + e.get('non_2xx', 0), e['p50_ms'], e['p95_ms'],
+              e['p99_ms'], json.dumps(e['histogram'])) for e in report['endpoints']])
+    return run_id
+
+def resolve_run(db, ref):
+    """Run id for a run id, a commit prefix or (when ref is None) the latest run"""
+    if ref is None:
+        row = db.execute('SELECT id FROM runs ORDER BY id DESC LIMIT 1').fetchone()
+    elif str(ref).isdigit() and db.execute('SELECT 1 FROM runs WHERE id = ?', (int(ref),)).fetchone():
+        return int(ref)
+    else:
+        row = db.execute('SELECT id FROM runs WHERE git_commit LIKE ? ORDER BY id DESC LIMIT 1',
+                         (f'{ref}%',)).fetchone()
+    if row is None:
+        raise SystemExit(f"No run found for {ref!r}" if ref else "No runs recorded yet")
+    return row['id']
+
+def run_histograms(db, run_id):
+    rows = db.execute('SELECT endpoint, histogram FROM timings WHERE run_id = ?', (run_id,))
+    return {row['endpoint']: Histogram.from_dict(json.loads(row['histogram'])) for row in rows}
+
+def quantile_interval(histogram, quantile, confidence):
+    """Distribution-free confidence interval (lo, hi) for a quantile, in microseconds.
+
+    The number of samples below the true quantile is Binomial(n, q), so the
+    order statistics at n*q -/+ z*sqrt(n*q*(1-q)) bracket it with the given
+    confidence (normal approximation).
+    """
+    n = histogram.count
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    spread = z * math.sqrt(n * quantile * (1 - quantile))
+    low_rank = math.floor(n * quantile - spread)
+    high_rank = math.ceil(n * quantile + spread) + 1
+    return histogram.value_at_rank(low_rank, lowest=True), histogram.value_at_rank(high_rank)
+
+def compare_runs(base, head, threshold, confidence, min_samples):
+    """Return rows for endpoints present in both runs, flagged when p95 regressed"""
+    rows = []
+    for endpoint in sorted(base.keys() & head.keys()):
+        old, new = base[endpoint], head[endpoint]
+        if old.count < min_samples or new.count < min_samples:
+            rows.append((endpoint, old, new, None, 'too few samples'))
+            continue
+        old_low, old_high = quantile_interval(old, 0.95, confidence)
+        new_low, new_high = quantile_interval(new, 0.95, confidence)
+        old_p95, new_p95 = old.percentile(95), new.percentile(95)
+        change = new_p95 / old_p95 - 1 if old_p95 else 0.0
+        if new_low > old_high * (1 + threshold):
+            verdict = 'REGRESSED'
+        elif new_high < old_low:
+            verdict = 'improved'
+        else:
+            verdict = ''
+        rows.append((endpoint, old, new, change, verdict))
+    return rows
+
+def cmd_compare(args):
+    with closing(connect(args.db)) as db:
+        head_id = resolve_run(db, args.head)
+        if args.base:
+            base_id = resolve_run(db, args.base)
+        else:
+            row = db.execute('SELECT id FROM runs WHERE id < ? ORDER BY id DESC LIMIT 1', (head_id,)).fetchone()
+            if row is None:
+                raise SystemExit("No earlier run to compare against")
+            base_id = row['id']
+        commits = {r['id']: r['git_commit'] for r in db.execute('SELECT id, git_commit FROM runs WHERE id IN (?, ?)',
+                                                                (base_id, head_id))}
+        base, head = run_histograms(db, base_id), run_histograms(db, head_id)
+    rows = compare_runs(base, head, args.threshold, args.confidence, args.min_samples)
+
+    print(f"Comparing run {base_id} ({commits[base_id]}) -> run {head_id} ({commits[head_id]}), "
+          f"p95 threshold {args.threshold:.0%} at {args.confidence:.0%} confidence\n")
+    print(f"{'endpoint':<58} {'old p95':>9} {'new p95':>9} {'change':>8}  verdict")
+    regressions = 0
+    for endpoint, old, new, change, verdict in rows:
+        regressions += verdict == 'REGRESSED'
+        change_text = f'{change:+.1%}' if change is not None else '-'
+        print(f"{endpoint[:58]:<58} {old.percentile(95) / 1000:>9.1f} {new.percentile(95) / 1000:>9.1f} "
+              f"{change_text:>8}  {verdict}")
+    print(f"\n{regressions} endpoint(s) regressed")
+    return 1 if regressions else 0
+
+def cmd_record(args):
+    with open(args.report, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    run_id = record_report(report, args.db, args.label, args.commit)
+    print(f"Recorded run {run_id} ({len(report['endpoints'])} endpoints)")
+    return 0
+
+def cmd_list(args):
+    with closing(connect(args.db)) as db:
+        rows = db.execute('SELECT r.*, COUNT(t.endpoint) AS endpoints FROM runs r '
+                          'LEFT JOIN timings t ON t.run_id = r.id GROUP BY r.id ORDER BY r.id DESC LIMIT ?',
+                          (args.limit,)).fetchall()
+    for row in rows:
+        print(f"{row['id']:>5}  {row['created_at']}  {row['git_commit']:<18} {row['label'] or '':<12} "
+              f"{row['endpoints']:>4} endpoints  {row['users'] or 0:>4} users")
+    return 0
+
+def perf_block(histogram, commit, created_at):
+    return (f"{PERF_START}\n"
+            f"**Latency** ({histogram.count} samples, commit `{commit}`, {created_at}): "
+            f"p50 {histogram.percentile(50) / 1000:.1f} ms · p95 {histogram.percentile(95) / 1000:.1f} ms · "
+            f"p99 {histogram.percentile(99) / 1000:.1f} ms\n"
+            f"{PERF_END}")
+
+def with_perf_block(description, block):
+    """Replace the managed perf block in a description, or append one"""
+    description = description or ''
+    start = description.find(PERF_START)
+    end = description.find(PERF_END)
+    if start >= 0 and end > start:
+        return description[:start] + block + description[end + len(PERF_END):]
+    return (description.rstrip() + '\n\n' + block) if description.strip() else block
+
+def cmd_annotate(args):
+    with closing(connect(args.db)) as db:
+        run_id = resolve_run(db, args.run)
+        run = db.execute('SELECT * FROM runs WHERE id = ?', (run_id,)).fetchone()
+        histograms = run_histograms(db, run_id)
+    collection = load_collection(args.collection)
+    updated = 0
+    for path, item in iter_requests(collection['item']):
+        histogram = histograms.get(endpoint_key(path, item))
+        if histogram is None or not histogram.count:
+            continue
+        # A request given as a bare URL string has no description of its own; use the item's
+        owner = item['request'] if isinstance(item['request'], dict) else item
+        description = owner.get('description')
+        block = perf_block(histogram, run['git_commit'], run['created_at'])
+        if isinstance(description, dict):
+            description['content'] = with_perf_block(description.get('content'), block)
+        else:
+            owner['description'] = with_perf_block(description, block)
+        updated += 1
+    save_collection(collection, args.collection)
+    print(f"Annotated {updated} endpoints with latencies from run {run_id} ({run['git_commit']})")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Store and compare per-endpoint benchmark runs")
+    parser.add_argument('--db', help=f"SQLite history file (default: ${DB_ENV}, else {DEFAULT_DB})")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record = commands.add_parser('record', help="store a postman_load_test.py --json report")
+    record.add_argument('report')
+    record.add_argument('--label')
+    record.add_argument('--commit', help="override the git commit the run is tagged with")
+    record.set_defaults(func=cmd_record)
+
+    listing = commands.add_parser('list', help="show recorded runs")
+    listing.add_argument('--limit', type=int, default=20)
+    listing.set_defaults(func=cmd_list)
+
+    compare = commands.add_parser('compare', help="flag endpoints whose p95 regressed (exit status 1 if any)")
+    compare.add_argument('--base', help="run id or commit to compare against (default: the run before --head)")
+    compare.add_argument('--head', help="run id or commit to check (default: latest run)")
+    compare.add_argument('--threshold', type=float, default=0.10, help="relative p95 slowdown to flag")
+    compare.add_argument('--confidence', type=float, default=0.95)
+    compare.add_argument('--min-samples', type=int, default=30)
+    compare.set_defaults(func=cmd_compare)
+
+    annotate = commands.add_parser('annotate', help="write the latest latencies into each item's description")
+    annotate.add_argument('collection', nargs='?', default=DEFAULT_COLLECTION)
+    annotate.add_argument('--run', help="run id or commit to use (default: latest run)")
+    annotate.set_defaults(func=cmd_annotate)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
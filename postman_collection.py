@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Helpers shared by the Postman collection tools: loading a collection,
+walking its request items and normalizing request URLs so items can be
+matched to routes by (method, path).
+"""
+import json
+import os
+import re
+import shutil
+import tempfile
+
+DEFAULT_COLLECTION = 'ACE_API_Postman_Collection.json'
+
+# Key of the item variable postman_route_sync.py sets on items whose route no
+# longer exists; the name is left alone so endpoint keys and examples still match
+STALE_VARIABLE = 'stale'
+
+# :id, {id}, {id?} and {{var}} path segments all match any value
+_PARAM_SEGMENT = re.compile(r'^(?::[^/]+|\{\{?[^/{}]+\}?\})$')
+
+def load_collection(path=DEFAULT_COLLECTION):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_collection(collection, path):
+    """Write a collection in the tab-indented layout Postman exports use"""
+    atomic_write(path, lambda f: json.dump(collection, f, indent='\t'))
+
+def atomic_write(path, write):
+    """Write a file through a temp file in the same directory and rename it into place.
+
+    If write() returns False the temp file is discarded and path is left untouched.
+    Returns whether path was replaced.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            keep = write(f)
+        if keep is False:
+            os.unlink(tmp_path)
+            return False
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        else:
+            # mkstemp creates the file as 0600
+            os.chmod(tmp_path, umask_mode(0o666))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return True
+
+def umask_mode(mode):
+    """mode as open() or os.makedirs() would create it under the current umask"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return mode & ~umask
+
+def collection_variables(collection):
+    """Return the collection-level variables as a {key: value} dict"""
+    return {v['key']: v.get('value', '') for v in collection.get('variable', []) if 'key' in v}
+
+def iter_requests(items, path=()):
+    """Yield (folder path tuple, item) for every request item under items, in document order.
+
+    The walk keeps an explicit stack of folder iterators instead of recursing,
+    so folder depth is not bounded by the recursion limit, and items are
+    yielded as they are reached, so stages can be chained without building
+    intermediate lists.
+    """
+    stack = [(path, iter(items))]
+    while stack:
+        path, children = stack[-1]
+        for item in children:
+            if 'item' in item:
+                stack.append((path + (item.get('name', ''),), iter(item['item'])))
+                break
+            if 'request' in item:
+                yield path, item
+        else:
+            stack.pop()
+
+def is_stale(item):
+    variables = item.get('variable')
+    return isinstance(variables, list) and any(isinstance(v, dict) and v.get('key') == STALE_VARIABLE
+                                               for v in variables)
+
+def request_method(item):
+    request = item['request']
+    return (request.get('method', 'GET') if isinstance(request, dict) else 'GET').upper()
+
+def url_segments(url):
+    """Return the path segments of a Postman URL (dict or raw string), without host or query"""
+    if isinstance(url, dict):
+        if 'path' in url:
+            path = url['path']
+            return [s for s in (path if isinstance(path, list) else path.split('/')) if s]
+        url = url.get('raw', '')
+    raw = url.split('#', 1)[0].split('?', 1)[0]
+    raw = re.sub(r'^(?:[a-z][a-z0-9+.-]*://[^/]*|\{\{[^}]+\}\})', '', raw, flags=re.IGNORECASE)
+    return [s for s in raw.split('/') if s]
+
+def request_segments(item):
+    request = item['request']
+    return url_segments(request.get('url', '') if isinstance(request, dict) else request)
+
+def is_param_segment(segment):
+    return bool(_PARAM_SEGMENT.match(segment))
+
+def is_optional_segment(segment):
+    return is_param_segment(segment) and segment.rstrip('}').endswith('?')
+
+def normalize_path(segments):
+    """Canonical route path: parameters collapse to ':' so /users/:id == /users/{user}"""
+    return '/' + '/'.join(':' if is_param_segment(s) else s.lower() for s in segments)
+
+def route_key(item):
+    """(METHOD, normalized path) identifying the endpoint a request item targets"""
+    return request_method(item), normalize_path(request_segments(item))
+
+def endpoint_key(path, item):
+    """Stable per-item key used in reports: 'METHOD Folder/Subfolder/Name'"""
+    return f"{request_method(item)} {'/'.join(path + (item.get('name', 'Request'),))}"
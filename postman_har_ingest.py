@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Replace the collection's invented example responses with real, redacted
+responses captured in HAR files.
+
+Browser HAR exports (and proxy captures written as JSON Lines, one HAR
+entry per line, with a .jsonl or .ndjson extension) are parsed one entry at
+a time, so memory does not grow with the size of the capture. Each entry's
+URL is matched against a route trie compiled once from the collection, the
+same one postman_mock_server.py serves from, and its response is redacted
+and kept as a candidate example.
+
+For every item and status code one representative is kept: the captured
+body closest to the average size seen for that status, so the mock server,
+payload audit and load tests see realistic payload sizes. Captured
+examples are written first in each item, and the invented example that
+add_postman_responses.py generated for the item is removed; hand-written
+examples are kept.
+
+Redaction replaces the values of sensitive keys (passwords, tokens,
+secrets, OTPs, cookies, ...), bearer tokens and JWTs anywhere in a string,
+and e-mail addresses with stable placeholders. Only the Content-Type
+response header is kept.
+
+    python postman_har_ingest.py capture.har
+    python postman_har_ingest.py traffic/*.har proxy.jsonl --redact national_id --dry-run
+"""
+import argparse
+import base64
+import hashlib
+import json
+import re
+import sys
+import time
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+from add_postman_responses import JsonStreamReader
+from postman_collection import (
+    DEFAULT_COLLECTION,
+    endpoint_key,
+    iter_requests,
+    load_collection,
+    request_method,
+    request_segments,
+    save_collection,
+)
+from postman_mock_server import RouteTrie, base_path, expand_optional
+
+CAPTURED_PREFIX = 'Captured '
+GENERATED_PREFIX = 'Example Response - '
+REDACTED = '[redacted]'
+
+# Matched as whole words of a key: camelCase, kebab-case and snake_case keys are
+# all split into '_'-separated lowercase words first (accessToken -> access_token)
+SENSITIVE_WORDS = ['password', 'passwd', 'secret', 'token', 'apikey', 'api_key', 'otp', 'authorization',
+                   'cookie', 'session', 'signature', 'credit_card', 'card_number', 'cvv', 'iban']
+# Bearer tokens, JWTs and e-mail addresses, found in one pass over a string
+_SECRET_TEXT = re.compile(r'(\b[Bb]earer\s+[\w\-.~+/]+=*|\beyJ[\w-]+\.[\w-]+\.[\w-]+)|\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+\b')
+
+# Reading captures
+
+def _object_keys(reader):
+    """Yield the keys of the object at the reader; the caller consumes each value"""
+    reader.expect('{')
+    while reader.peek() != '}':
+        key = reader.value()
+        reader.expect(':')
+        yield key
+        if reader.peek() == ',':
+            reader.pos += 1
+    reader.pos += 1
+
+def _array_elements(reader):
+    """Yield once per element of the array at the reader; the caller consumes each element"""
+    reader.expect('[')
+    while reader.peek() != ']':
+        yield
+        if reader.peek() == ',':
+            reader.pos += 1
+    reader.pos += 1
+
+def iter_har_entries(f):
+    """Yield the log.entries of a HAR file one at a time without loading the file"""
+    reader = JsonStreamReader(f)
+    for key in _object_keys(reader):
+        if key != 'log':
+            reader.value()
+            continue
+        for key in _object_keys(reader):
+            if key != 'entries':
+                reader.value()
+                continue
+            for _ in _array_elements(reader):
+                yield reader.value()
+
+def iter_capture_entries(path):
+    """HAR entries from a .har file, or from a JSON Lines file of entries"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith(('.jsonl', '.ndjson')):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from iter_har_entries(f)
+
+# Redaction
+
+_CAMEL_BOUNDARY = re.compile(r'(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])')
+
+def key_words(key):
+    """key as '_'-separated lowercase words: 'accessToken', 'access-token' and 'ACCESS_TOKEN' -> 'access_token'"""
+    return _CAMEL_BOUNDARY.sub('_', key).lower().replace('-', '_')
+
+class Redactor:
+    def __init__(self, extra_keys=()):
+        words = '|'.join(re.escape(key_words(word)) for word in SENSITIVE_WORDS + list(extra_keys))
+        self.sensitive = re.compile(rf'(?:^|_)(?:{words})(?:_|$)')
+        self.keys = {}
+        self.emails = {}
+
+    def is_sensitive(self, key):
+        flag = self.keys.get(key)
+        if flag is None:
+            flag = self.keys[key] = bool(self.sensitive.search(key_words(key)))
+        return flag
+
+    def _replace(self, match):
+        if match.group(1):
+            return REDACTED
+        email = match.group().lower()
+        placeholder = self.emails.get(email)
+        if placeholder is None:
+            if len(self.emails) >= 4096:
+                # Keep memory bounded on captures with very many distinct addresses
+                self.emails.clear()
+            digest = hashlib.sha1(email.encode('utf-8')).hexdigest()[:8]
+            placeholder = self.emails[email] = f'user-{digest}@example.com'
+        return placeholder
+
+    def text(self, text):
+        # Most strings hold none of these; the substring checks run in C and skip the regex
+        if '@' not in text and 'earer' not in text and 'eyJ' not in text:
+            return text
+        return _SECRET_TEXT.sub(self._replace, text)
+
+    def object(self, obj):
+        """json.loads() object_hook: redact one object; objects inside it were redacted as they were decoded"""
+        for key, value in obj.items():
+            if self.is_sensitive(key) and value not in (None, '', [], {}):
+                obj[key] = REDACTED
+            elif isinstance(value, str):
+                obj[key] = self.text(value)
+            elif isinstance(value, list):
+                obj[key] = self.strings(value)
+        return obj
+
+    def strings(self, values):
+        return [self.text(value) if isinstance(value, str) else self.strings(value) if isinstance(value, list)
+                else value for value in values]
+
+    def loads(self, text):
+        """Decode a JSON body, redacting it while it is decoded"""
+        data = json.loads(text, object_hook=self.object)
+        if isinstance(data, str):
+            return self.text(data)
+        return self.strings(data) if isinstance(data, list) else data
+
+# Matching and choosing representatives
+
+def compile_route_index(collection):
+    """RouteTrie from every request item, for matching captured URLs to (folder path, item)"""
+    trie = RouteTrie()
+    for path, item in iter_requests(collection['item']):
+        for segments in expand_optional(request_segments(item)):
+            trie.insert(segments, request_method(item), (path, item))
+    return trie
+
+def match_entry(trie, prefix, entry):
+    """(folder path, item) for a HAR entry's request, or None"""
+    request = entry.get('request') or {}
+    path = urlsplit(request.get('url', '')).path
+    if prefix:
+        if path != prefix and not path.startswith(prefix + '/'):
+            return None
+        path = path[len(prefix):]
+    node = trie.find([s for s in path.split('/') if s])
+    return node.methods.get(request.get('method', 'GET').upper()) if node is not None else None
+
+def response_body(entry, redactor):
+    """(body text, preview language) of a HAR entry's response, redacted; None if it is binary or
+    has no body although its status should have one.
+
+    JSON bodies are returned minified (json.dumps with an indent is several
+    times slower); only the chosen representatives are indented, when written.
+    """
+    response = entry.get('response') or {}
+    content = response.get('content') or {}
+    text = content.get('text') or ''
+    if content.get('encoding') == 'base64':
+        try:
+            text = base64.b64decode(text).decode('utf-8')
+        except ValueError:
+            return None
+    if not text.strip():
+        # Browsers leave out bodies they did not keep (e.g. after a redirect or when the log was
+        # cleared), so an empty body is only real for statuses that never have one
+        return ('', 'json') if int(response.get('status') or 0) in (204, 304) else None
+    try:
+        data = redactor.loads(text)
+    except ValueError:
+        if 'json' in content.get('mimeType', '') or '\x00' in text:
+            return None
+        return redactor.text(text), 'text'
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False), 'json'
+
+class Representative:
+    """Running choice of the captured response closest to the mean body size for one item and status"""
+
+    __slots__ = ('count', 'total', 'size', 'body', 'language', 'content_type')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.size = None
+
+    def offer(self, body, language, content_type):
+        size = len(body.encode('utf-8'))
+        self.count += 1
+        self.total += size
+        mean = self.total / self.count
+        if self.size is None or abs(size - mean) < abs(self.size - mean):
+            self.size, self.body, self.language, self.content_type = size, body, language, content_type
+
+def _content_type(entry, language):
+    for header in (entry.get('response') or {}).get('headers') or []:
+        if header.get('name', '').lower() == 'content-type':
+            return header.get('value', '')
+    return 'application/json' if language == 'json' else 'text/plain'
+
+def collect_representatives(paths, trie, prefix, redactor):
+    """Read every capture once: ({id(item): (folder path, item, {status: Representative})}, stats)"""
+    chosen = {}
+    stats = {'entries': 0, 'matched': 0, 'skipped': 0, 'unmatched': 0, 'unmatched_samples': []}
+    for path in paths:
+        for entry in iter_capture_entries(path):
+            stats['entries'] += 1
+            match = match_entry(trie, prefix, entry)
+            if match is None:
+                stats['unmatched'] += 1
+                if len(stats['unmatched_samples']) < 10:
+                    request = entry.get('request') or {}
+                    stats['unmatched_samples'].append(f"{request.get('method', '?')} {request.get('url', '')}")
+                continue
+            # Aborted requests have status 0
+            status = int((entry.get('response') or {}).get('status') or 0)
+            body = response_body(entry, redactor) if status >= 100 else None
+            if body is None:
+                stats['skipped'] += 1
+                continue
+            stats['matched'] += 1
+            folder_path, item = match
+            statuses = chosen.setdefault(id(item), (folder_path, item, {}))[2]
+            statuses.setdefault(status, Representative()).offer(*body, _content_type(entry, body[1]))
+    return chosen, stats
+
+# Writing examples
+
+def captured_example(item, status, representative, compact=False, minify=False):
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = 'Unknown'
+    body = representative.body
+    if representative.language == 'json' and body and not minify:
+        body = json.dumps(json.loads(body), indent=2, ensure_ascii=False)
+    example = {'name': f'{CAPTURED_PREFIX}{status} {reason}'}
+    if not compact:
+        example['originalRequest'] = item['request'].copy()
+    example.update({
+        'status': reason,
+        'code': status,
+        '_postman_previewlanguage': representative.language,
+        'header': [{'key': 'Content-Type', 'value': representative.content_type}],
+        'cookie': [],
+        'body': body,
+    })
+    return example
+
+def attach_examples(item, statuses, compact=False, minify=False):
+    """Put the captured examples first in item, dropping the generated one and older captures"""
+    captured = [captured_example(item, status, statuses[status], compact, minify) for status in sorted(statuses)]
+    replaced = {example['name'] for example in captured}
+    generated = GENERATED_PREFIX + item.get('name', 'Request')
+    kept = [example for example in item.get('response') or []
+            if example.get('name') != generated and example.get('name') not in replaced]
+    item['response'] = captured + kept
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replace generated example responses with captured HAR traffic")
+    parser.add_argument('captures', nargs='+', help=".har files, or .jsonl/.ndjson files of HAR entries")
+    parser.add_argument('--collection', default=DEFAULT_COLLECTION)
+    parser.add_argument('--prefix', help="URL path prefix of the API in the captures (default: path of {{base_url}})")
+    parser.add_argument('--redact', action='append', default=[], metavar='KEY',
+                        help="also redact values of this key (repeatable)")
+    parser.add_argument('--compact', action='store_true', help="leave out originalRequest in captured examples")
+    parser.add_argument('--minify-bodies', action='store_true', help="write captured bodies without indentation")
+    parser.add_argument('--dry-run', action='store_true', help="report the matches without writing the collection")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    collection = load_collection(args.collection)
+    prefix = base_path(collection) if args.prefix is None else args.prefix.rstrip('/')
+    trie = compile_route_index(collection)
+    chosen, stats = collect_representatives(args.captures, trie, prefix, Redactor(args.redact))
+    for folder_path, item, statuses in chosen.values():
+        attach_examples(item, statuses, args.compact, args.minify_bodies)
+    elapsed = time.perf_counter() - started
+
+    for folder_path, item, statuses in sorted(chosen.values(), key=lambda c: endpoint_key(c[0], c[1])):
+        counts = ', '.join(f'{status} x{statuses[status].count}' for status in sorted(statuses))
+        print(f"✓ {endpoint_key(folder_path, item)}: {counts}")
+    for sample in stats['unmatched_samples']:
+        print(f"? Unmatched: {sample}")
+    print(f"\n{stats['entries']} entries: {stats['matched']} matched, {stats['unmatched']} unmatched, "
+          f"{stats['skipped']} aborted, empty or binary; {len(chosen)} item(s) updated in {elapsed:.2f} s")
+
+    if chosen and not args.dry_run:
+        save_collection(collection, args.collection)
+        print(f"Updated {args.collection}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""
+Concurrent load/replay harness driven by the Postman collection.
+
+Every selected request is compiled once into a byte template with the
+collection variables already substituted; only per-user variables such as
+{{access_token}} are filled in per request. Each virtual user logs in
+through the Authentication/Login request (Sanctum token), keeps one
+keep-alive connection open and cycles through the endpoints until the run
+ends. Latencies go into HDR-style log-linear histograms per endpoint.
+
+    python postman_load_test.py --users 50 --duration 30
+    python postman_load_test.py --folder Notifications --match "unread|jobs" --credentials users.csv
+"""
+import argparse
+import asyncio
+import csv
+import json
+import re
+import ssl
+import sys
+import time
+from urllib.parse import quote, urlencode, urlsplit
+
+from postman_collection import (
+    DEFAULT_COLLECTION,
+    collection_variables,
+    endpoint_key,
+    is_stale,
+    iter_requests,
+    load_collection,
+    request_method,
+    url_segments,
+)
+
+VARIABLE = re.compile(r'\{\{([^{}]+)\}\}')
+USER_VARIABLES = ('access_token',)
+
+class Histogram:
+    """Log-linear latency histogram in microseconds (HdrHistogram-style buckets).
+
+    Values below 2**precision_bits are exact; above that every power of two
+    is split into 2**(precision_bits - 1) buckets, so the relative error is
+    under 1% for the default precision while memory stays logarithmic in the
+    largest value.
+    """
+
+    def __init__(self, precision_bits=8):
+        self.precision_bits = precision_bits
+        self.half = 1 << (precision_bits - 1)
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def _index(self, value):
+        if value < (1 << self.precision_bits):
+            return value
+        shift = value.bit_length() - self.precision_bits
+        return (1 << self.precision_bits) + (shift - 1) * self.half + (value >> shift) - self.half
+
+    def _highest_value(self, index):
+        """Largest value that lands in bucket index"""
+        if index < (1 << self.precision_bits):
+            return index
+        shift, offset = divmod(index - (1 << self.precision_bits), self.half)
+        shift += 1
+        return ((offset + self.half) << shift) + (1 << shift) - 1
+
+    def _lowest_value(self, index):
+        if index < (1 << self.precision_bits):
+            return index
+        shift, offset = divmod(index - (1 << self.precision_bits), self.half)
+        return (offset + self.half) << (shift + 1)
+
+    def record(self, value):
+        value = int(value)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def value_at_rank(self, rank, lowest=False):
+        """Value of the rank-th smallest sample (1-based), as the bucket's upper or lower edge"""
+        if not self.count:
+            return 0
+        rank = min(max(rank, 1), self.count)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                if lowest:
+                    return self._lowest_value(index)
+                return min(self._highest_value(index), self.max)
+        return self.max
+
+    def percentile(self, percent):
+        return self.value_at_rank(round(self.count * percent / 100))
+
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def to_dict(self):
+        return {
+            'precision_bits': self.precision_bits,
+            'counts': {str(index): count for index, count in sorted(self.counts.items())},
+            'count': self.count,
+            'total': self.total,
+            'max': self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data['precision_bits'])
+        histogram.counts = {int(index): count for index, count in data['counts'].items()}
+        histogram.count = data['count']
+        histogram.total = data['total']
+        histogram.max = data['max']
+        return histogram
+
+def _compile_text(text):
+    """Split text into literal strings and {{variable}} names for fast rendering"""
+    parts = []
+    position = 0
+    for match in VARIABLE.finditer(text):
+        if match.start() > position:
+            parts.append(text[position:match.start()])
+        parts.append((match.group(1),))
+        position = match.end()
+    if position < len(text):
+        parts.append(text[position:])
+    return parts
+
+def _substitute(text, variables):
+    """Resolve the variables we know now and leave per-user ones as {{name}}"""
+    return VARIABLE.sub(lambda m: str(variables[m.group(1)]) if m.group(1) in variables else m.group(0), text)
+
+class RequestTemplate:
+    """One collection request compiled to header/body byte templates"""
+
+    def __init__(self, key, method, head, body):
+        self.key = key
+        self.method = method
+        self.head_parts = [p if isinstance(p, tuple) else p.encode('utf-8') for p in _compile_text(head)]
+        self.body_parts = [p if isinstance(p, tuple) else p.encode('utf-8') for p in _compile_text(body)]
+
+    @staticmethod
+    def _render(parts, user):
+        return b''.join(p if isinstance(p, bytes) else str(user.get(p[0], '')).encode('utf-8') for p in parts)
+
+    def render(self, user):
+        body = self._render(self.body_parts, user)
+        head = self._render(self.head_parts, user)
+        if body:
+            head += b'Content-Length: ' + str(len(body)).encode('ascii') + b'\r\n'
+        return head + b'\r\n' + body
+
+def _request_auth(request, collection):
+    auth = request.get('auth') or collection.get('auth') or {}
+    if auth.get('type') != 'bearer':
+        return None
+    for entry in auth.get('bearer', []):
+        if entry.get('key') == 'token':
+            return entry.get('value', '')
+    return None
+
+def compile_request(path, item, collection, variables, target):
+    """Compile a request item into a RequestTemplate, or None if it can't be replayed"""
+    request = item['request']
+    method = request_method(item)
+    url = request.get('url', '')
+    path_values = {}
+    query = []
+    if isinstance(url, dict):
+        # Substituted before quoting, so only the per-user {{...}} slots are left in the template
+        path_values = {v['key'].rstrip('?'): _substitute(v.get('value', ''), variables)
+                       for v in url.get('variable', []) if 'key' in v}
+        query = [(q['key'], _substitute(q.get('value') or '', variables))
+                 for q in url.get('query', []) if not q.get('disabled')]
+
+    segments = []
+    for segment in url_segments(url):
+        if segment.startswith(':'):
+            name = segment[1:].rstrip('?')
+            if not path_values.get(name):
+                if segment.endswith('?'):
+                    continue
+                return None
+            segments.append(quote(path_values[name], safe='/{}'))
+        else:
+            segments.append(segment)
+    request_path = target.path.rstrip('/') + '/' + '/'.join(segments)
+    if query:
+        request_path += '?' + urlencode(query, safe='{}')
+
+    body = ''
+    content_type = None
+    body_spec = request.get('body') or {}
+    mode = body_spec.get('mode')
+    if mode == 'raw':
+        body = body_spec.get('raw', '')
+    elif mode == 'urlencoded':
+        body = urlencode([(f['key'], _substitute(f.get('value', ''), variables))
+                          for f in body_spec.get('urlencoded', []) if not f.get('disabled')], safe='{}')
+        content_type = 'application/x-www-form-urlencoded'
+    elif mode:
+        # File uploads and GraphQL bodies are not replayed
+        return None
+
+    headers = [('Host', target.netloc), ('Accept', 'application/json'), ('Connection', 'keep-alive')]
+    for header in request.get('header', []):
+        if not header.get('disabled') and header.get('key', '').lower() not in ('host', 'content-length', 'connection'):
+            headers.append((header['key'], header.get('value', '')))
+    if content_type and not any(k.lower() == 'content-type' for k, _ in headers):
+        headers.append(('Content-Type', content_type))
+    token = _request_auth(request, collection)
+    if token is not None:
+        headers.append(('Authorization', f'Bearer {token}'))
+
+    head = f'{method} {request_path} HTTP/1.1\r\n' + ''.join(f'{k}: {v}\r\n' for k, v in headers)
+    return RequestTemplate(endpoint_key(path, item), method, _substitute(head, variables), _substitute(body, variables))
+
+class Connection:
+    """A single keep-alive HTTP/1.1 connection that reconnects when the server closes it"""
+
+    def __init__(self, target, timeout):
+        self.target = target
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+
+    async def _connect(self):
+        secure = self.target.scheme == 'https'
+        port = self.target.port or (443 if secure else 80)
+        self.reader, self.writer = await asyncio.open_connection(
+            self.target.hostname, port, ssl=ssl.create_default_context() if secure else None)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+    async def request(self, payload):
+        """Send raw request bytes and return (status, body bytes)"""
+        for attempt in (1, 2):
+            if self.writer is None:
+                await self._connect()
+            try:
+                self.writer.write(payload)
+                return await asyncio.wait_for(self._read_response(), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # Stale keep-alive connection: retry once on a fresh one
+                self.close()
+                if attempt == 2:
+                    raise
+            except BaseException:
+                self.close()
+                raise
+
+    async def _read_response(self):
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        status = int(lines[0].split(' ', 2)[1])
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            if name:
+                headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readuntil(b'\r\n')).split(b';', 1)[0], 16)
+                if size == 0:
+                    await self.reader.readuntil(b'\r\n')
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readexactly(2)
+            body = b''.join(chunks)
+        elif 'content-length' in headers:
+            body = await self.reader.readexactly(int(headers['content-length']))
+        else:
+            body = await self.reader.read()
+            self.close()
+            return status, body
+
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+        return status, body
+
+class EndpointStats:
+    def __init__(self):
+        self.histogram = Histogram()
+        self.statuses = {}
+        self.errors = 0
+
+def _extract(data, dotted):
+    for part in dotted.split('.'):
+        data = data[part] if isinstance(data, dict) else None
+    return data
+
+async def login(connection, template, credentials, token_path):
+    """Log one virtual user in and return its token"""
+    user = {}
+    payload = template.render(user)
+    if credentials:
+        head, _, body = payload.partition(b'\r\n\r\n')
+        data = json.loads(body or b'{}')
+        data.update(credentials)
+        body = json.dumps(data).encode('utf-8')
+        head = re.sub(rb'(?im)^Content-Length: \d+\r\n', b'', head + b'\r\n')
+        payload = head + b'Content-Length: ' + str(len(body)).encode('ascii') + b'\r\n\r\n' + body
+    status, body = await connection.request(payload)
+    if status != 200:
+        raise RuntimeError(f"login returned HTTP {status}")
+    token = _extract(json.loads(body), token_path)
+    if not token:
+        raise RuntimeError(f"login response has no {token_path!r}")
+    return token
+
+async def virtual_user(index, templates, stats, args, target, login_template, credentials, deadline):
+    connection = Connection(target, args.timeout)
+    user = {}
+    try:
+        if login_template is not None:
+            creds = credentials[index % len(credentials)] if credentials else None
+            try:
+                user['access_token'] = await login(connection, login_template, creds, args.token_path)
+            except Exception as e:
+                print(f"✗ User {index} could not log in: {e}", file=sys.stderr)
+                return
+
+        position = index % len(templates)
+        iterations = 0
+        while True:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            template = templates[position]
+            endpoint = stats[template.key]
+            payload = template.render(user)
+            started = time.perf_counter()
+            try:
+                status, _ = await connection.request(payload)
+            except Exception:
+                endpoint.errors += 1
+            else:
+                endpoint.histogram.record((time.perf_counter() - started) * 1_000_000)
+                endpoint.statuses[status] = endpoint.statuses.get(status, 0) + 1
+            position = (position + 1) % len(templates)
+            if position == index % len(templates):
+                iterations += 1
+                if deadline is None and iterations >= args.iterations:
+                    break
+            if args.think_time:
+                await asyncio.sleep(args.think_time / 1000)
+    finally:
+        connection.close()
+
+def select_requests(collection, args, variables, target):
+    templates = []
+    login_template = None
+    skipped = 0
+    methods = {m.upper() for m in args.methods}
+    for path, item in iter_requests(collection['item']):
+        name = item.get('name', '')
+        full_name = '/'.join(path + (name,))
+        if path[:1] == ('Authentication',) and name.lower() == 'login':
+            login_template = compile_request(path, item, collection, variables, target)
+        if args.folder and not any(full_name.startswith(folder) for folder in args.folder):
+            continue
+        if request_method(item) not in methods or is_stale(item):
+            continue
+        if args.match and not re.search(args.match, full_name, re.IGNORECASE):
+            continue
+        if args.exclude and re.search(args.exclude, full_name, re.IGNORECASE):
+            continue
+        template = compile_request(path, item, collection, variables, target)
+        if template is None:
+            skipped += 1
+        else:
+            templates.append(template)
+    return templates, login_template, skipped
+
+def load_credentials(path):
+    """Read email,password rows (with a header line) for per-user logins"""
+    with open(path, newline='', encoding='utf-8') as f:
+        return [dict(row) for row in csv.DictReader(f)]
+
+def build_report(stats, elapsed):
+    endpoints = []
+    for key, endpoint in stats.items():
+        histogram = endpoint.histogram
+        if not histogram.count and not endpoint.errors:
+            continue
+        endpoints.append({
+            'endpoint': key,
+            'requests': histogram.count,
+            'errors': endpoint.errors,
+            'non_2xx': sum(n for code, n in endpoint.statuses.items() if not 200 <= code < 300),
+            'statuses': {str(code): n for code, n in sorted(endpoint.statuses.items())},
+            'rps': histogram.count / elapsed if elapsed else 0,
+            'mean_ms': histogram.mean() / 1000,
+            'p50_ms': histogram.percentile(50) / 1000,
+            'p95_ms': histogram.percentile(95) / 1000,
+            'p99_ms': histogram.percentile(99) / 1000,
+            'max_ms': histogram.max / 1000,
+            'histogram': histogram.to_dict(),
+        })
+    endpoints.sort(key=lambda e: e['p99_ms'], reverse=True)
+    return endpoints
+
+def print_report(endpoints, elapsed):
+    total = sum(e['requests'] for e in endpoints)
+    print(f"\n{total} requests in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f} req/s)\n")
+    print(f"{'endpoint':<58} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'err':>5}")
+    for e in endpoints:
+        errors = e['errors'] + e['non_2xx']
+        print(f"{e['endpoint'][:58]:<58} {e['rps']:>8.1f} {e['p50_ms']:>8.1f} {e['p95_ms']:>8.1f} "
+              f"{e['p99_ms']:>8.1f} {e['max_ms']:>8.1f} {errors:>5}")
+
+async def run(args):
+    collection = load_collection(args.collection)
+    variables = collection_variables(collection)
+    if args.base_url:
+        variables['base_url'] = args.base_url
+    for user_variable in USER_VARIABLES:
+        variables.pop(user_variable, None)
+    target = urlsplit(variables.get('base_url', 'http://localhost:8000/api'))
+
+    templates, login_template, skipped = select_requests(collection, args, variables, target)
+    if not templates:
+        print("No requests matched the selection")
+        return None
+    if args.no_login:
+        login_template = None
+    credentials = load_credentials(args.credentials) if args.credentials else None
+    print(f"Replaying {len(templates)} requests with {args.users} virtual users"
+          + (f" ({skipped} skipped: file uploads or missing path variables)" if skipped else ""))
+
+    stats = {template.key: EndpointStats() for template in templates}
+    started = time.perf_counter()
+    deadline = started + args.duration if args.duration else None
+    await asyncio.gather(*[
+        virtual_user(i, templates, stats, args, target, login_template, credentials, deadline)
+        for i in range(args.users)
+    ])
+    elapsed = time.perf_counter() - started
+    endpoints = build_report(stats, elapsed)
+    print_report(endpoints, elapsed)
+    return {'collection': args.collection, 'base_url': variables['base_url'], 'users': args.users,
+            'elapsed_s': elapsed, 'endpoints': endpoints}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay the Postman collection against a local backend under load")
+    parser.add_argument('collection', nargs='?', default=DEFAULT_COLLECTION)
+    parser.add_argument('--base-url', help="override {{base_url}} (default: the collection variable)")
+    parser.add_argument('-u', '--users', type=int, default=10, help="concurrent virtual users")
+    parser.add_argument('-d', '--duration', type=float, default=0, help="run for this many seconds")
+    parser.add_argument('-n', '--iterations', type=int, default=1,
+                        help="passes over the selected requests per user when no --duration is given")
+    parser.add_argument('--folder', action='append', help="only requests under this folder path (repeatable)")
+    parser.add_argument('--match', help="only requests whose folder/name matches this regex")
+    parser.add_argument('--exclude', default='logout', help="skip requests whose folder/name matches this regex")
+    parser.add_argument('--methods', nargs='+', default=['GET'],
+                        help="HTTP methods to replay (default: GET only, so the database is not modified)")
+    parser.add_argument('--credentials', help="CSV with email,password columns, one row per virtual user")
+    parser.add_argument('--token-path', default='token', help="dotted path of the token in the login response")
+    parser.add_argument('--no-login', action='store_true', help="skip the Sanctum login step")
+    parser.add_argument('--think-time', type=float, default=0, help="pause between requests per user, in ms")
+    parser.add_argument('--timeout', type=float, default=30, help="per-request timeout in seconds")
+    parser.add_argument('--json', help="also write the report (with histograms) to this file")
+    parser.add_argument('--history', nargs='?', const='', metavar='DB',
+                        help="record the run in the benchmark history store (optionally at this SQLite path; "
+                             "default: $ACE_BENCH_DB, else .bench_history.sqlite)")
+    parser.add_argument('--label', help="label for the run in the history store")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    if report and args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if report and args.history is not None:
+        import postman_bench_history
+        db_path = postman_bench_history.db_path(args.history or None)
+        run_id = postman_bench_history.record_report(report, db_path, label=args.label or 'load')
+        print(f"\nRecorded as run {run_id} in the benchmark history ({db_path})")
+    return report
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Three-way merge of Postman collections, usable as a git merge driver.
+
+Base, ours and theirs are each indexed in one pass by (METHOD, normalized
+path), the same key postman_route_sync.py uses, so an item is matched across
+the three versions however the folders or names around it were edited.
+Every item is then merged field by field: the request's fields (url,
+header, body, ...) and the item's other fields separately, and examples by
+name, so two people changing the body and the examples of one endpoint do
+not conflict. Folders and collection-level fields (info, auth, variables
+by key) are merged the same way.
+
+Output order is deterministic: ours' order, with items and folders that
+only theirs has appended to their folder in theirs' order (--sort orders
+requests by path and method instead). A conflicting field keeps ours'
+value (or the edit, when the other side deleted it) and is reported per
+endpoint; the exit status is then 1. The written file records every
+conflict too: the item (folder, or collection) gets a merge-conflict
+variable listing the conflicting parts with their base, ours and theirs
+values, to be removed once they are resolved.
+
+    python postman_merge.py base.json ours.json theirs.json
+    python postman_merge.py base.json ours.json theirs.json -o merged.json --dry-run
+
+As a git merge driver, which writes the result over ours (%A):
+
+    git config merge.postman.name "Postman collection merge"
+    git config merge.postman.driver "python postman_merge.py %O %A %B"
+    echo 'ACE_API_Postman_Collection.json merge=postman' >> .git/info/attributes
+"""
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+
+from postman_collection import load_collection, route_key, save_collection
+
+# Stands for a value (item, field, example) that a version does not have
+MISSING = object()
+
+FOLDER, REQUEST = 'folder', 'request'
+
+# Key of the variable recording the conflicts of an item, folder or the collection
+CONFLICT_VARIABLE = 'merge-conflict'
+
+# Indexing
+
+def index_collection(collection):
+    """Walk a collection once.
+
+    Returns ({key: (folder path, item)}, {folder path: (folder, [child refs])})
+    where key is (METHOD, normalized path, occurrence) and child refs are
+    (FOLDER, folder path) or (REQUEST, key) in document order. The root's
+    folder path is () and its folder is the collection itself.
+    """
+    items = {}
+    folders = {(): (collection, [])}
+    occurrences = Counter()
+    stack = [((), iter(collection.get('item', [])))]
+    while stack:
+        path, children = stack[-1]
+        for item in children:
+            if 'item' in item:
+                child = path + (item.get('name', ''),)
+                if child not in folders:
+                    folders[child] = (item, [])
+                    folders[path][1].append((FOLDER, child))
+                stack.append((child, iter(item['item'])))
+                break
+            if 'request' in item:
+                key = route_key(item)
+                occurrences[key] += 1
+                key += (occurrences[key],)
+                items[key] = (path, item)
+                folders[path][1].append((REQUEST, key))
+        else:
+            stack.pop()
+    return items, folders
+
+def endpoint_label(key):
+    method, path, occurrence = key
+    return f'{method} {path}' + (f' #{occurrence}' if occurrence > 1 else '')
+
+# Merging values
+
+def merge_value(base, ours, theirs):
+    """(merged value, conflict) for one value; MISSING stands for an absent value.
+
+    A conflict keeps ours, unless we deleted what they edited: then their edit is kept.
+    """
+    if ours == theirs or theirs == base:
+        return ours, False
+    if ours == base:
+        return theirs, False
+    return (theirs if ours is MISSING else ours), True
+
+def merge_fields(base, ours, theirs, skip=()):
+    """Merge three dicts key by key: (merged dict, [(conflicting key, base, ours, theirs)])"""
+    merged = {}
+    conflicts = []
+    for key in list(ours) + [key for key in theirs if key not in ours]:
+        if key in skip:
+            continue
+        values = base.get(key, MISSING), ours.get(key, MISSING), theirs.get(key, MISSING)
+        value, conflict = merge_value(*values)
+        if conflict:
+            conflicts.append((key,) + values)
+        if value is not MISSING:
+            merged[key] = value
+    return merged, conflicts
+
+def _keyed(values, key):
+    """{(key, occurrence): value} in list order"""
+    keyed = {}
+    occurrences = Counter()
+    for value in values:
+        name = key(value) if isinstance(value, dict) else repr(value)
+        occurrences[name] += 1
+        keyed[(name, occurrences[name])] = value
+    return keyed
+
+def merge_keyed(base, ours, theirs, key):
+    """Merge three lists whose elements are identified by key(element):
+    (merged list, [(conflicting key, base, ours, theirs)])
+    """
+    base, ours, theirs = _keyed(base, key), _keyed(ours, key), _keyed(theirs, key)
+    merged = []
+    conflicts = []
+    for name in list(ours) + [name for name in theirs if name not in ours]:
+        values = base.get(name, MISSING), ours.get(name, MISSING), theirs.get(name, MISSING)
+        value, conflict = merge_value(*values)
+        if conflict:
+            conflicts.append((name[0] if name[1] == 1 else f'{name[0]} #{name[1]}',) + values)
+        if value is not MISSING:
+            merged.append(value)
+    return merged, conflicts
+
+def _as_list(value):
+    return value if isinstance(value, list) else []
+
+def merge_item(base, ours, theirs):
+    """Merge one request item: (merged item or MISSING, [(conflicting part, base, ours, theirs)])"""
+    if ours is MISSING or theirs is MISSING:
+        present = theirs if ours is MISSING else ours
+        if base is MISSING or present == base:
+            # Added on one side, or deleted on one side and untouched on the other
+            return (MISSING if base is not MISSING else present), []
+        return present, [('deleted on one side, changed on the other', base, ours, theirs)]
+    item, conflict = merge_value(base, ours, theirs)
+    if not conflict:
+        # Unchanged, or changed on one side only: no need to look inside
+        return item, []
+    base = {} if base is MISSING else base
+
+    merged, conflicts = merge_fields(base, ours, theirs, skip=('request', 'response'))
+    requests = base.get('request', MISSING), ours['request'], theirs['request']
+    if all(isinstance(request, dict) for request in requests[1:]):
+        base_request = requests[0] if isinstance(requests[0], dict) else {}
+        request, request_conflicts = merge_fields(base_request, *requests[1:])
+        conflicts += [(f'request.{conflict[0]}',) + conflict[1:] for conflict in request_conflicts]
+    else:
+        request, conflict = merge_value(*requests)
+        conflicts += [('request',) + requests] * conflict
+    merged['request'] = request
+
+    if 'response' in ours or 'response' in theirs:
+        responses, response_conflicts = merge_keyed(_as_list(base.get('response')), _as_list(ours.get('response')),
+                                                    _as_list(theirs.get('response')), lambda r: r.get('name', ''))
+        conflicts += [(f'response[{conflict[0]}]',) + conflict[1:] for conflict in response_conflicts]
+        merged['response'] = responses
+
+    # Keep ours' field order
+    order = list(ours) + [key for key in theirs if key not in ours]
+    return {key: merged[key] for key in order if key in merged}, conflicts
+
+def merge_folder(base, ours, theirs):
+    """Merge a folder's own fields (or the collection's), leaving out its items:
+    (merged folder, [(conflicting part, base, ours, theirs)])
+    """
+    merged, conflicts = merge_fields(base, ours, theirs, skip=('item', 'variable'))
+    if 'variable' in ours or 'variable' in theirs:
+        variables, variable_conflicts = merge_keyed(_as_list(base.get('variable')), _as_list(ours.get('variable')),
+                                                    _as_list(theirs.get('variable')), lambda v: v.get('key', ''))
+        merged['variable'] = variables
+        conflicts += [(f'variable[{conflict[0]}]',) + conflict[1:] for conflict in variable_conflicts]
+    return merged, conflicts
+
+def _describe(value, width=200):
+    if value is MISSING:
+        return '(none)'
+    text = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+    return text if len(text) <= width else text[:width - 3] + '...'
+
+def mark_conflicts(item, parts):
+    """Copy of item (or folder) with a merge-conflict variable recording parts, replacing any earlier one"""
+    lines = ['Set by postman_merge.py: ours was kept, or the edit where one side deleted. '
+             'Resolve these and remove this variable.']
+    for part, base, ours, theirs in parts:
+        lines += ['', part, f'  base: {_describe(base)}', f'  ours: {_describe(ours)}', f'  theirs: {_describe(theirs)}']
+    variables = [v for v in item.get('variable') or [] if not (isinstance(v, dict) and v.get('key') == CONFLICT_VARIABLE)]
+    variables.append({'key': CONFLICT_VARIABLE, 'value': ', '.join(part for part, *_ in parts), 'type': 'string',
+                      'description': '\n'.join(lines)})
+    return dict(item, variable=variables)
+
+# Merging collections
+
+def _sort_key(child):
+    if isinstance(child, dict) and 'item' not in child and 'request' in child:
+        method, path = route_key(child)
+        return 1, path, method
+    return 0, '', ''
+
+def merge_collections(base, ours, theirs, sort=False):
+    """Three-way merge of three loaded collections.
+
+    Returns (merged collection, {endpoint label: [conflicting parts]}); the
+    inputs are not modified, and the merged collection shares unchanged
+    values with them. Folder conflicts are reported under 'folder Name/Sub'.
+    Conflicting items and folders carry a merge-conflict variable (see
+    mark_conflicts).
+    """
+    base_items, base_folders = index_collection(base)
+    our_items, our_folders = index_collection(ours)
+    their_items, their_folders = index_collection(theirs)
+    conflicts = {}
+
+    # Items: each key is merged once, in linear time overall
+    merged_items = {}
+    for key in list(our_items) + [key for key in their_items if key not in our_items]:
+        base_entry = base_items.get(key, (MISSING, MISSING))
+        our_entry = our_items.get(key, (MISSING, MISSING))
+        their_entry = their_items.get(key, (MISSING, MISSING))
+        item, parts = merge_item(base_entry[1], our_entry[1], their_entry[1])
+        if item is MISSING:
+            continue
+        # The folder an item lives in merges like any other field
+        if our_entry[1] is MISSING or their_entry[1] is MISSING:
+            path = their_entry[0] if our_entry[1] is MISSING else our_entry[0]
+        else:
+            path, moved = merge_value(base_entry[0], our_entry[0], their_entry[0])
+            if moved:
+                parts.append(('folder',) + tuple('/'.join(entry[0]) if entry[0] is not MISSING else MISSING
+                                                 for entry in (base_entry, our_entry, their_entry)))
+        if parts:
+            conflicts[endpoint_label(key)] = [part for part, *_ in parts]
+            item = mark_conflicts(item, parts)
+        merged_items[key] = (path, item)
+
+    # Folders: kept unless one side deleted a folder the other left alone and
+    # nothing merged ends up in it; the root is always kept
+    kept = set()
+    for path in list(our_folders) + [path for path in their_folders if path not in our_folders]:
+        in_base, in_ours, in_theirs = path in base_folders, path in our_folders, path in their_folders
+        if (in_ours and in_theirs) or not in_base:
+            kept.add(path)
+    for path, _ in merged_items.values():
+        kept.add(path)
+    for path in list(kept):
+        while path and path[:-1] not in kept:
+            path = path[:-1]
+            kept.add(path)
+
+    empty = ({}, [])
+    merged_folders = {}
+    for path in list(our_folders) + [path for path in their_folders if path not in our_folders]:
+        if path not in kept:
+            continue
+        folder, parts = merge_folder(base_folders.get(path, empty)[0], our_folders.get(path, empty)[0],
+                                     their_folders.get(path, empty)[0])
+        if parts:
+            conflicts['folder ' + ('/'.join(path) or '(collection)')] = [part for part, *_ in parts]
+            folder = mark_conflicts(folder, parts)
+        folder['item'] = []
+        merged_folders[path] = folder
+
+    # Children: ours' order first, then what only theirs has, each placed once
+    placed = set()
+    for path, folder in merged_folders.items():
+        refs = our_folders.get(path, empty)[1] + their_folders.get(path, empty)[1]
+        for kind, ref in refs:
+            if (kind, ref) in placed:
+                continue
+            if kind == FOLDER and ref in merged_folders:
+                child = merged_folders[ref]
+            elif kind == REQUEST and ref in merged_items and merged_items[ref][0] == path:
+                child = merged_items[ref][1]
+            else:
+                continue
+            placed.add((kind, ref))
+            folder['item'].append(child)
+        if sort:
+            folder['item'].sort(key=_sort_key)
+
+    merged = merged_folders[()]
+    return merged, dict(sorted(conflicts.items()))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Three-way merge of Postman collections (git merge driver)")
+    parser.add_argument('base', help="common ancestor (%%O)")
+    parser.add_argument('ours', help="our version (%%A); the result is written here unless -o is given")
+    parser.add_argument('theirs', help="their version (%%B)")
+    parser.add_argument('-o', '--output', help="write the merged collection here instead of over ours")
+    parser.add_argument('--sort', action='store_true', help="order the requests of every folder by path and method")
+    parser.add_argument('--dry-run', action='store_true', help="report conflicts without writing anything")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    base, ours, theirs = (load_collection(path) for path in (args.base, args.ours, args.theirs))
+    merged, conflicts = merge_collections(base, ours, theirs, args.sort)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    for endpoint, parts in conflicts.items():
+        print(f"! Conflict: {endpoint}: {', '.join(parts)}")
+    print(f"Merged in {elapsed:.1f} ms, {len(conflicts)} conflict(s)")
+
+    if not args.dry_run:
+        output = args.output or args.ours
+        save_collection(merged, output)
+        print(f"Wrote {output}" + (f" (conflicts are marked with a {CONFLICT_VARIABLE} variable)" if conflicts else ""))
+    return 1 if conflicts else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
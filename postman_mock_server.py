@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Local mock of the ACE API served from the example responses in the Postman
+collection, so the Next.js frontend can run (and be load-tested) without
+Laravel.
+
+Routes are compiled once into a path trie where :id / {id} segments match
+any value, and every response is serialized to raw HTTP bytes at startup,
+so serving a request is a trie walk and a single transport write.
+
+    python postman_mock_server.py --port 8000
+    python postman_mock_server.py --latency 80 --jitter 40
+    python postman_mock_server.py new_collection.json --enrich
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+from postman_collection import (
+    DEFAULT_COLLECTION,
+    collection_variables,
+    is_optional_segment,
+    is_param_segment,
+    is_stale,
+    iter_requests,
+    load_collection,
+    request_method,
+    request_segments,
+)
+
+CORS_HEADERS = (
+    b'Access-Control-Allow-Origin: *\r\n'
+    b'Access-Control-Allow-Methods: GET, POST, PUT, PATCH, DELETE, OPTIONS\r\n'
+    b'Access-Control-Allow-Headers: Authorization, Content-Type, Accept, X-Requested-With\r\n'
+)
+
+MAX_HEADER_BYTES = 64 * 1024
+
+def build_response(code, body, content_type=b'application/json', extra_headers=b''):
+    """Serialize a complete HTTP/1.1 response once so it can be written as-is"""
+    try:
+        reason = HTTPStatus(code).phrase
+    except ValueError:
+        reason = 'Unknown'
+    return (
+        f'HTTP/1.1 {code} {reason}\r\n'.encode('ascii') +
+        b'Content-Type: ' + content_type + b'\r\n' +
+        b'Content-Length: ' + str(len(body)).encode('ascii') + b'\r\n' +
+        CORS_HEADERS + extra_headers + b'\r\n' + body
+    )
+
+def _json_body(payload):
+    return json.dumps(payload).encode('utf-8')
+
+NOT_FOUND = build_response(404, _json_body({"message": "No example response for this route"}))
+METHOD_NOT_ALLOWED = build_response(405, _json_body({"message": "Method not allowed for this route"}))
+BAD_REQUEST = build_response(400, _json_body({"message": "Malformed request"}), extra_headers=b'Connection: close\r\n')
+PREFLIGHT = build_response(204, b'', extra_headers=b'Access-Control-Max-Age: 86400\r\n')
+
+class RouteTrie:
+    """Path trie keyed by segment; parameter segments share one wildcard child"""
+
+    def __init__(self):
+        self.children = {}
+        self.param = None
+        self.methods = {}
+
+    def insert(self, segments, method, response):
+        node = self
+        for segment in segments:
+            if is_param_segment(segment):
+                if node.param is None:
+                    node.param = RouteTrie()
+                node = node.param
+            else:
+                node = node.children.setdefault(segment, RouteTrie())
+        # The first example registered for a route wins
+        node.methods.setdefault(method, response)
+
+    def find(self, segments, index=0):
+        """Return the node for segments, preferring literal over parameter matches"""
+        if index == len(segments):
+            return self if self.methods else None
+        child = self.children.get(segments[index])
+        if child is not None:
+            found = child.find(segments, index + 1)
+            if found is not None:
+                return found
+        if self.param is not None:
+            return self.param.find(segments, index + 1)
+        return None
+
+def expand_optional(segments):
+    """Yield the segment list with and without each trailing optional parameter"""
+    yield segments
+    while segments and is_optional_segment(segments[-1]):
+        segments = segments[:-1]
+        yield segments
+
+def _status_code(example):
+    """An example's status code, or None when it is missing a numeric one"""
+    if not isinstance(example, dict):
+        return None
+    try:
+        return int(example.get('code') or 200)
+    except (TypeError, ValueError):
+        return None
+
+def _pick_example(responses):
+    """(code, example): prefer a 2xx example, then the first one; None if no example has a usable code"""
+    examples = [(_status_code(response), response) for response in responses]
+    examples = [(code, response) for code, response in examples if code is not None]
+    for code, response in examples:
+        if 200 <= code < 300:
+            return code, response
+    return examples[0] if examples else None
+
+def _example_bytes(code, example, minify):
+    body = example.get('body') or ''
+    if minify and body:
+        try:
+            body = json.dumps(json.loads(body), separators=(',', ':'), ensure_ascii=False)
+        except ValueError:
+            pass
+    content_type = b'application/json'
+    for header in example.get('header') or []:
+        if isinstance(header, dict) and header.get('key', '').lower() == 'content-type':
+            content_type = header.get('value', 'application/json').encode('latin-1')
+    return build_response(code, body.encode('utf-8'), content_type)
+
+def compile_routes(requests, minify=False):
+    """Build the route trie from every live request item that has an example response.
+
+    requests is an iterable of (folder path, item) pairs, e.g. iter_requests(collection['item'])
+    """
+    trie = RouteTrie()
+    count = 0
+    for _, item in requests:
+        responses = item.get('response') or []
+        if not responses or is_stale(item):
+            continue
+        picked = _pick_example(responses)
+        if picked is None:
+            continue
+        response = _example_bytes(*picked, minify)
+        method = request_method(item)
+        for segments in expand_optional(request_segments(item)):
+            trie.insert(segments, method, response)
+        count += 1
+    return trie, count
+
+def base_path(collection):
+    """Path prefix of {{base_url}}, e.g. '/api' for http://localhost:8000/api"""
+    return urlsplit(collection_variables(collection).get('base_url', '')).path.rstrip('/')
+
+class MockHTTPProtocol(asyncio.Protocol):
+    """Minimal HTTP/1.1 server with keep-alive and pipelining"""
+
+    def __init__(self, server):
+        self.server = server
+        self.buffer = bytearray()
+        self.transport = None
+        self.next_write_at = 0.0
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self.buffer += data
+        while self.buffer:
+            end = self.buffer.find(b'\r\n\r\n')
+            if end < 0:
+                if len(self.buffer) > MAX_HEADER_BYTES:
+                    self._send(BAD_REQUEST, close=True)
+                return
+            head = bytes(self.buffer[:end]).decode('latin-1')
+            lines = head.split('\r\n')
+            try:
+                method, target, version = lines[0].split(' ')
+            except ValueError:
+                self._send(BAD_REQUEST, close=True)
+                return
+
+            content_length = 0
+            keep_alive = version == 'HTTP/1.1'
+            for line in lines[1:]:
+                name, _, value = line.partition(':')
+                name = name.strip().lower()
+                if name == 'content-length':
+                    try:
+                        content_length = int(value.strip() or 0)
+                    except ValueError:
+                        self._send(BAD_REQUEST, close=True)
+                        return
+                elif name == 'connection':
+                    value = value.strip().lower()
+                    keep_alive = value == 'keep-alive' or (keep_alive and value != 'close')
+                elif name == 'transfer-encoding' and 'chunked' in value.lower():
+                    # Clients of this API always send a Content-Length
+                    self._send(BAD_REQUEST, close=True)
+                    return
+
+            request_end = end + 4 + content_length
+            if len(self.buffer) < request_end:
+                return
+            del self.buffer[:request_end]
+            self._send(self.server.respond(method, target), close=not keep_alive)
+            if not keep_alive:
+                return
+
+    def _send(self, response, close=False):
+        delay = self.server.delay()
+        if not delay:
+            self.transport.write(response)
+            if close:
+                self.transport.close()
+            return
+        # Keep pipelined responses in order even when their delays differ
+        loop = asyncio.get_running_loop()
+        self.next_write_at = max(loop.time() + delay, self.next_write_at)
+        loop.call_at(self.next_write_at, self._write_later, response, close)
+
+    def _write_later(self, response, close):
+        if self.transport.is_closing():
+            return
+        self.transport.write(response)
+        if close:
+            self.transport.close()
+
+class MockServer:
+    def __init__(self, trie, prefix='', latency_ms=0.0, jitter_ms=0.0):
+        self.trie = trie
+        self.prefix = prefix
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.requests = 0
+
+    def delay(self):
+        if not self.latency and not self.jitter:
+            return 0.0
+        return max(0.0, self.latency + random.uniform(-self.jitter, self.jitter))
+
+    def respond(self, method, target):
+        self.requests += 1
+        if method == 'OPTIONS':
+            return PREFLIGHT
+        path = target.split('?', 1)[0]
+        if self.prefix:
+            if path != self.prefix and not path.startswith(self.prefix + '/'):
+                return NOT_FOUND
+            path = path[len(self.prefix):]
+        node = self.trie.find([s for s in path.split('/') if s])
+        if node is None:
+            return NOT_FOUND
+        response = node.methods.get(method)
+        if response is None and method == 'HEAD':
+            response = node.methods.get('GET')
+            if response is not None:
+                # Same headers, no body
+                response = response[:response.index(b'\r\n\r\n') + 4]
+        return response or METHOD_NOT_ALLOWED
+
+async def serve(server, host, port):
+    loop = asyncio.get_running_loop()
+    listener = await loop.create_server(lambda: MockHTTPProtocol(server), host, port, reuse_address=True)
+    async with listener:
+        await listener.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the collection's example responses as a local mock API")
+    parser.add_argument('collection', nargs='?', default=DEFAULT_COLLECTION)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--prefix', help="URL prefix to mount routes under (default: path of {{base_url}})")
+    parser.add_argument('--latency', type=float, default=0.0, help="artificial latency per response in ms")
+    parser.add_argument('--jitter', type=float, default=0.0, help="random +/- jitter added to --latency in ms")
+    parser.add_argument('--minify', action='store_true', help="serve example bodies without indentation")
+    parser.add_argument('--enrich', action='store_true',
+                        help="generate examples for requests that have none, as add_postman_responses.py would, "
+                             "without changing the collection file")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    collection = load_collection(args.collection)
+    requests = iter_requests(collection['item'])
+    if args.enrich:
+        from add_postman_responses import enrich_requests
+        requests = enrich_requests(requests)
+    trie, count = compile_routes(requests, args.minify)
+    prefix = base_path(collection) if args.prefix is None else args.prefix.rstrip('/')
+    server = MockServer(trie, prefix, args.latency, args.jitter)
+    print(f"Loaded {count} example responses in {(time.perf_counter() - started) * 1000:.1f} ms")
+    print(f"Mock API listening on http://{args.host}:{args.port}{prefix}")
+
+    try:
+        asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        print(f"\nServed {server.requests} requests")
+
+if __name__ == '__main__':
+    main()
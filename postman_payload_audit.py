@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Response payload size and pagination audit.
+
+Replays the collection's GET endpoints against a local, seeded backend (or,
+with --examples, reads the collection's example bodies) and measures each
+payload: serialized bytes, the length of its main list, nesting depth and
+the relations embedded in every list item. Endpoints are ranked by size and
+flagged when they return a list without pagination metadata, a list longer
+than --max-items, or items that embed large nested relations.
+
+    python postman_payload_audit.py --base-url http://localhost:8000/api
+    python postman_payload_audit.py --examples --json payloads.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from urllib.parse import urlsplit
+
+from postman_collection import (
+    DEFAULT_COLLECTION,
+    collection_variables,
+    endpoint_key,
+    is_stale,
+    iter_requests,
+    load_collection,
+    normalize_path,
+    request_method,
+    route_key,
+)
+from postman_load_test import USER_VARIABLES, Connection, login, select_requests
+
+PAGINATION_KEYS = {'current_page', 'per_page', 'last_page', 'next_page_url', 'next_cursor', 'prev_cursor'}
+
+def _size(value):
+    return len(json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
+
+def _depth(value):
+    """Nesting depth of containers, counted iteratively (a scalar is 0)"""
+    deepest = 0
+    stack = [(value, 1)]
+    while stack:
+        value, depth = stack.pop()
+        if isinstance(value, dict):
+            children = value.values()
+        elif isinstance(value, list):
+            children = value
+        else:
+            continue
+        deepest = max(deepest, depth)
+        stack.extend((child, depth + 1) for child in children if isinstance(child, (dict, list)))
+    return deepest
+
+def _main_list(data, max_depth=2):
+    """(dotted path, list, containing dict) of the longest list reachable through objects only"""
+    best = ('', None, None)
+    stack = [('', data, None, 0)]
+    while stack:
+        path, value, parent, depth = stack.pop()
+        if isinstance(value, list):
+            if best[1] is None or len(value) > len(best[1]):
+                best = (path, value, parent)
+        elif isinstance(value, dict) and depth < max_depth:
+            for key, child in value.items():
+                stack.append((f'{path}.{key}' if path else key, child, value, depth + 1))
+    return best
+
+def _is_paginated(data, container):
+    """Paginator fields next to the list, at the root or in a resource collection's meta / links"""
+    for candidate in (container, data, data.get('meta') if isinstance(data, dict) else None):
+        if isinstance(candidate, dict) and PAGINATION_KEYS & candidate.keys():
+            return True
+    for candidate in (container, data):
+        links = candidate.get('links') if isinstance(candidate, dict) else None
+        if isinstance(links, dict) and {'next', 'prev'} & links.keys():
+            return True
+    return False
+
+def _relations(items):
+    """Average serialized bytes and largest length of each nested object/array key across list items"""
+    totals = {}
+    longest = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        for key, value in item.items():
+            if isinstance(value, (dict, list)):
+                totals[key] = totals.get(key, 0) + _size(value)
+                if isinstance(value, list):
+                    longest[key] = max(longest.get(key, 0), len(value))
+    count = max(len(items), 1)
+    return {key: (total / count, longest.get(key)) for key, total in totals.items()}
+
+def measure_payload(body, args):
+    """Measure one response body (bytes) and return its audit row fields"""
+    row = {'bytes': len(body), 'items': None, 'list_path': None, 'depth': 0, 'paginated': None,
+           'relations': {}, 'flags': []}
+    try:
+        data = json.loads(body)
+    except ValueError:
+        row['flags'].append('not-json')
+        return row
+    row['depth'] = _depth(data)
+    path, items, container = _main_list(data)
+    if items is None or ('id' in (container or {}) and not _is_paginated(data, container)):
+        # Detail responses such as {"id": 1, "lessons": [...]} or {"course": {"id": 1, "lessons": [...]}}:
+        # the list belongs to a record. Lists under {"data": {"courses": [...]}} are still measured.
+        return row
+
+    row['items'] = len(items)
+    row['list_path'] = path or '(root)'
+    row['paginated'] = _is_paginated(data, container)
+    relations = _relations(items)
+    row['relations'] = {key: {'avg_bytes': round(size), 'max_length': length}
+                        for key, (size, length) in sorted(relations.items(), key=lambda r: -r[1][0])}
+    if not row['paginated']:
+        row['flags'].append('unpaginated')
+    if len(items) > args.max_items:
+        row['flags'].append('unbounded')
+    for key, (size, length) in relations.items():
+        if size > args.max_nested_bytes or (length or 0) > args.max_nested_items:
+            row['flags'].append(f'nested:{key}')
+    return row
+
+def load_controllers(routes_path):
+    """(METHOD, normalized path) -> 'Controller@action', or {} without a routes file"""
+    if not routes_path or not os.path.exists(routes_path):
+        return {}
+    from postman_route_sync import extract_routes, route_segments
+    return {(r['method'], normalize_path(route_segments(r))): r['action'] for r in extract_routes(routes_path)}
+
+def audit_examples(collection, args):
+    """Audit the example response bodies stored in the collection (no backend needed)"""
+    rows = []
+    for path, item in iter_requests(collection['item']):
+        if request_method(item) not in args.methods or is_stale(item):
+            continue
+        for example in item.get('response') or []:
+            body = (example.get('body') or '').encode('utf-8')
+            if body:
+                rows.append(dict(measure_payload(body, args), endpoint=endpoint_key(path, item),
+                                 route=route_key(item), status=example.get('code')))
+                break
+    return rows
+
+async def audit_backend(collection, args):
+    """Replay the selected requests once against the backend and audit the live bodies"""
+    variables = collection_variables(collection)
+    if args.base_url:
+        variables['base_url'] = args.base_url
+    for user_variable in USER_VARIABLES:
+        variables.pop(user_variable, None)
+    target = urlsplit(variables.get('base_url', 'http://localhost:8000/api'))
+    templates, login_template, _ = select_requests(collection, args, variables, target)
+    routes = {endpoint_key(path, item): route_key(item) for path, item in iter_requests(collection['item'])}
+
+    connection = Connection(target, args.timeout)
+    user = {}
+    rows = []
+    try:
+        if login_template is not None and not args.no_login:
+            credentials = {'email': args.email, 'password': args.password} if args.email else None
+            user['access_token'] = await login(connection, login_template, credentials, args.token_path)
+        for template in templates:
+            try:
+                status, body = await connection.request(template.render(user))
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as exc:
+                print(f"  {template.key}: {exc!r}", file=sys.stderr)
+                continue
+            row = measure_payload(body, args)
+            if status >= 400:
+                row['flags'] = [f'http-{status}']
+            rows.append(dict(row, endpoint=template.key, route=routes.get(template.key), status=status))
+    finally:
+        connection.close()
+    return rows
+
+def print_table(rows):
+    print(f"{'endpoint':<52} {'controller':<44} {'bytes':>9} {'items':>6} {'depth':>5}  flags")
+    for row in rows:
+        items = '-' if row['items'] is None else row['items']
+        print(f"{row['endpoint'][:52]:<52} {(row.get('controller') or '?')[:44]:<44} {row['bytes']:>9,} "
+              f"{items:>6} {row['depth']:>5}  {', '.join(row['flags'])}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank endpoints by response payload size and flag missing pagination")
+    parser.add_argument('collection', nargs='?', default=DEFAULT_COLLECTION)
+    parser.add_argument('--base-url', help="override {{base_url}} (default: the collection variable)")
+    parser.add_argument('--examples', action='store_true', help="audit the collection's example bodies offline")
+    parser.add_argument('--routes', default='backend/routes/api.php', help="routes file used to name controllers")
+    parser.add_argument('--folder', action='append', help="only requests under this folder path (repeatable)")
+    parser.add_argument('--match', help="only requests whose folder/name matches this regex")
+    parser.add_argument('--exclude', default='logout', help="skip requests whose folder/name matches this regex")
+    parser.add_argument('--email', help="login as this user (default: the Login request body)")
+    parser.add_argument('--password')
+    parser.add_argument('--token-path', default='token', help="dotted path of the token in the login response")
+    parser.add_argument('--no-login', action='store_true', help="skip the Sanctum login step")
+    parser.add_argument('--timeout', type=float, default=30, help="per-request timeout in seconds")
+    parser.add_argument('--max-items', type=int, default=100, help="flag lists longer than this")
+    parser.add_argument('--max-nested-bytes', type=int, default=2048,
+                        help="flag relations averaging more than this many bytes per list item")
+    parser.add_argument('--max-nested-items', type=int, default=20,
+                        help="flag relations embedding arrays longer than this in a list item")
+    parser.add_argument('--flagged', action='store_true', help="only show flagged endpoints")
+    parser.add_argument('--json', help="also write the rows to this file")
+    args = parser.parse_args(argv)
+    args.methods = {'GET'}
+
+    collection = load_collection(args.collection)
+    rows = audit_examples(collection, args) if args.examples else asyncio.run(audit_backend(collection, args))
+    controllers = load_controllers(args.routes)
+    for row in rows:
+        row['controller'] = controllers.get(tuple(row['route'])) if row['route'] else None
+    rows.sort(key=lambda r: (-bool(r['flags']), -r['bytes']))
+    if args.flagged:
+        rows = [row for row in rows if row['flags']]
+
+    print_table(rows)
+    flagged = sum(1 for row in rows if row['flags'])
+    print(f"\n{len(rows)} endpoints audited, {flagged} flagged")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Find N+1 queries per endpoint from the Laravel query log.
+
+With DB_QUERY_LOG=true the backend writes every query, tagged with the
+request it ran for, to backend/storage/logs/queries.log. `replay` sends
+each collection request once (with an X-Replay-Id header so its queries can
+be told apart) and then analyzes the part of the log written during the
+replay; `analyze` reads any existing log.
+
+The log is read line by line and only a bounded window of in-flight
+requests is kept, so multi-GB logs are processed in constant memory. SQL is
+normalized to a query shape (literals and IN lists collapsed), and shapes
+that repeat within a single request are reported with their counts and
+total time.
+
+    python postman_query_log.py replay --base-url http://localhost:8000/api
+    python postman_query_log.py analyze backend/storage/logs/queries.log --min-repeats 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+from collections import OrderedDict
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+from postman_collection import DEFAULT_COLLECTION, collection_variables, load_collection
+from postman_load_test import USER_VARIABLES, Connection, login, select_requests
+
+DEFAULT_LOG = 'backend/storage/logs/queries.log'
+
+QUERY_MARKER = b'.DEBUG: query {'
+OPEN_REQUESTS = 1024
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bin\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_VALUES_LIST = re.compile(r'(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+')
+_SPACE = re.compile(r'\s+')
+
+@lru_cache(maxsize=8192)
+def query_shape(sql):
+    """Normalize SQL so queries that differ only in their parameters share a shape"""
+    shape = _STRING.sub('?', sql)
+    shape = _NUMBER.sub('?', shape)
+    shape = _IN_LIST.sub('in (?+)', shape)
+    shape = _VALUES_LIST.sub(r'\1+', shape)
+    return _SPACE.sub(' ', shape).strip()
+
+def iter_queries(path, start=0):
+    """Yield the context dict of every query line in the log, from byte offset start"""
+    decoder = json.JSONDecoder()
+    with open(path, 'rb') as f:
+        f.seek(start)
+        for line in f:
+            marker = line.find(QUERY_MARKER)
+            if marker < 0:
+                continue
+            try:
+                entry, _ = decoder.raw_decode(line[marker + len(QUERY_MARKER) - 1:].decode('utf-8', 'replace'))
+            except ValueError:
+                continue
+            if isinstance(entry, dict) and 'sql' in entry:
+                yield entry
+
+class EndpointQueries:
+    """Per-endpoint totals and per-shape statistics across the requests seen"""
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.time_ms = 0.0
+        self.shapes = {}
+
+    def add_request(self, shapes):
+        self.requests += 1
+        for shape, (count, time_ms) in shapes.items():
+            self.queries += count
+            self.time_ms += time_ms
+            stats = self.shapes.get(shape)
+            if stats is None:
+                stats = self.shapes[shape] = {'count': 0, 'time_ms': 0.0, 'max_per_request': 0, 'requests': 0}
+            stats['count'] += count
+            stats['time_ms'] += time_ms
+            stats['requests'] += 1
+            stats['max_per_request'] = max(stats['max_per_request'], count)
+
+def analyze_log(path, start=0, endpoint_names=None):
+    """Aggregate the log into {endpoint: EndpointQueries}.
+
+    Queries are grouped per request (request_id) in a bounded window of open
+    requests; a request is folded into its endpoint's totals once it falls
+    out of the window or the log ends.
+    """
+    endpoint_names = endpoint_names or {}
+    endpoints = {}
+    open_requests = OrderedDict()
+
+    def flush(request_id):
+        endpoint, shapes = open_requests.pop(request_id)
+        stats = endpoints.get(endpoint)
+        if stats is None:
+            stats = endpoints[endpoint] = EndpointQueries()
+        stats.add_request(shapes)
+
+    for entry in iter_queries(path, start):
+        request_id = str(entry.get('request_id', ''))
+        current = open_requests.get(request_id)
+        if current is None:
+            if len(open_requests) >= OPEN_REQUESTS:
+                flush(next(iter(open_requests)))
+            endpoint = endpoint_names.get(request_id) or entry.get('request') or 'unknown'
+            current = open_requests[request_id] = (endpoint, {})
+        else:
+            open_requests.move_to_end(request_id)
+        shape = query_shape(entry['sql'])
+        totals = current[1].get(shape)
+        if totals is None:
+            totals = current[1][shape] = [0, 0.0]
+        totals[0] += 1
+        totals[1] += float(entry.get('time') or 0)
+    while open_requests:
+        flush(next(iter(open_requests)))
+    return endpoints
+
+def build_report(endpoints, min_repeats):
+    """Rows per endpoint with the shapes repeated at least min_repeats times in one request"""
+    rows = []
+    for endpoint, stats in endpoints.items():
+        repeated = sorted(
+            ({'shape': shape, **shape_stats} for shape, shape_stats in stats.shapes.items()
+             if shape_stats['max_per_request'] >= min_repeats),
+            key=lambda s: (-s['max_per_request'], -s['time_ms']))
+        rows.append({
+            'endpoint': endpoint,
+            'requests': stats.requests,
+            'queries_per_request': stats.queries / stats.requests,
+            'time_ms_per_request': stats.time_ms / stats.requests,
+            'distinct_shapes': len(stats.shapes),
+            'repeated': repeated,
+        })
+    rows.sort(key=lambda r: (-len(r['repeated']), -r['queries_per_request']))
+    return rows
+
+def print_report(rows, shape_width=110):
+    print(f"{'endpoint':<60} {'queries':>8} {'ms':>8} {'shapes':>7}  N+1")
+    for row in rows:
+        print(f"{row['endpoint'][:60]:<60} {row['queries_per_request']:>8.1f} {row['time_ms_per_request']:>8.1f} "
+              f"{row['distinct_shapes']:>7}  {len(row['repeated']) or ''}")
+    flagged = [row for row in rows if row['repeated']]
+    for row in flagged:
+        print(f"\n{row['endpoint']}")
+        for shape in row['repeated']:
+            sql = shape['shape'] if len(shape['shape']) <= shape_width else shape['shape'][:shape_width - 3] + '...'
+            print(f"  {shape['max_per_request']:>5}x/request  {shape['time_ms']:>9.1f} ms total  {sql}")
+    print(f"\n{len(rows)} endpoints, {len(flagged)} with repeated query shapes")
+
+async def replay(collection, args):
+    """Send every selected request once, tagged with X-Replay-Id; return {replay id: endpoint}"""
+    variables = collection_variables(collection)
+    if args.base_url:
+        variables['base_url'] = args.base_url
+    for user_variable in USER_VARIABLES:
+        variables.pop(user_variable, None)
+    target = urlsplit(variables.get('base_url', 'http://localhost:8000/api'))
+    templates, login_template, skipped = select_requests(collection, args, variables, target)
+
+    connection = Connection(target, args.timeout)
+    user = {}
+    names = {}
+    try:
+        if login_template is not None and not args.no_login:
+            credentials = {'email': args.email, 'password': args.password} if args.email else None
+            user['access_token'] = await login(connection, login_template, credentials, args.token_path)
+        for index, template in enumerate(templates):
+            replay_id = f'replay-{os.getpid()}-{index}'
+            names[replay_id] = template.key
+            payload = template.render(user).replace(b'\r\n', f'\r\nX-Replay-Id: {replay_id}\r\n'.encode('ascii'), 1)
+            try:
+                status, _ = await connection.request(payload)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as exc:
+                print(f"  {template.key}: {exc!r}", file=sys.stderr)
+                continue
+            if status >= 400:
+                print(f"  {template.key}: HTTP {status}", file=sys.stderr)
+    finally:
+        connection.close()
+    print(f"Replayed {len(templates)} requests" + (f" ({skipped} skipped)" if skipped else ""))
+    return names
+
+def cmd_replay(args):
+    if not os.path.exists(args.log):
+        raise SystemExit(f"{args.log} not found: start the backend with DB_QUERY_LOG=true")
+    start = os.path.getsize(args.log)
+    collection = load_collection(args.collection)
+    args.methods = [m.upper() for m in args.methods]
+    names = asyncio.run(replay(collection, args))
+    endpoints = analyze_log(args.log, start, names)
+    # Only the requests this replay sent (the log may interleave other traffic)
+    replayed = set(names.values())
+    endpoints = {endpoint: stats for endpoint, stats in endpoints.items() if endpoint in replayed}
+    return report(endpoints, args)
+
+def cmd_analyze(args):
+    return report(analyze_log(args.log), args)
+
+def report(endpoints, args):
+    rows = build_report(endpoints, args.min_repeats)
+    print_report(rows)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2)
+    return 1 if args.fail and any(row['repeated'] for row in rows) else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report repeated (N+1) query shapes per endpoint from the query log")
+    parser.add_argument('--min-repeats', type=int, default=3,
+                        help="flag query shapes run at least this many times in one request")
+    parser.add_argument('--json', help="also write the report to this file")
+    parser.add_argument('--fail', action='store_true', help="exit with status 1 when any endpoint is flagged")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    replay_parser = commands.add_parser('replay', help="replay the collection once and analyze the queries it ran")
+    replay_parser.add_argument('collection', nargs='?', default=DEFAULT_COLLECTION)
+    replay_parser.add_argument('--log', default=DEFAULT_LOG)
+    replay_parser.add_argument('--base-url', help="override {{base_url}} (default: the collection variable)")
+    replay_parser.add_argument('--folder', action='append', help="only requests under this folder path (repeatable)")
+    replay_parser.add_argument('--match', help="only requests whose folder/name matches this regex")
+    replay_parser.add_argument('--exclude', default='logout', help="skip requests whose folder/name matches this regex")
+    replay_parser.add_argument('--methods', nargs='+', default=['GET'],
+                               help="HTTP methods to replay (default: GET only, so the database is not modified)")
+    replay_parser.add_argument('--email', help="login as this user (default: the Login request body)")
+    replay_parser.add_argument('--password')
+    replay_parser.add_argument('--token-path', default='token', help="dotted path of the token in the login response")
+    replay_parser.add_argument('--no-login', action='store_true', help="skip the Sanctum login step")
+    replay_parser.add_argument('--timeout', type=float, default=30, help="per-request timeout in seconds")
+    replay_parser.set_defaults(func=cmd_replay)
+
+    analyze_parser = commands.add_parser('analyze', help="analyze an existing query log")
+    analyze_parser.add_argument('log', nargs='?', default=DEFAULT_LOG)
+    analyze_parser.set_defaults(func=cmd_analyze)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
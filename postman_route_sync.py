@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Sync the Postman collection with the Laravel routes in backend/routes/api.php.
+
+The route file is tokenized in one pass and parsed with a small recursive
+descent parser that understands Route::verb(...) declarations, chained
+prefix()/middleware()/name() calls and nested ->group(function () {...})
+blocks (including the array form Route::group([...], ...)).
+
+Routes and collection items are each indexed by (METHOD, normalized path)
+and diffed in linear time. Only differences are applied: missing routes are
+added as new items, items whose path variables or auth drifted are updated,
+and items without a route are marked stale so the mock server and load
+harness skip them. The mark is an item variable (key "stale"), so the
+item's name, and with it report keys and example names, stays the same.
+
+    python postman_route_sync.py --dry-run
+    python postman_route_sync.py --list
+"""
+import argparse
+import re
+import sys
+import time
+from collections import Counter
+
+from postman_collection import (
+    DEFAULT_COLLECTION,
+    STALE_VARIABLE,
+    is_param_segment,
+    is_stale,
+    load_collection,
+    normalize_path,
+    request_segments,
+    route_key,
+    save_collection,
+)
+
+DEFAULT_ROUTES = 'backend/routes/api.php'
+
+VERBS = {'get', 'post', 'put', 'patch', 'delete', 'any', 'match', 'options'}
+RESOURCE_ACTIONS = [
+    ('GET', '', 'index'),
+    ('POST', '', 'store'),
+    ('GET', '/{id}', 'show'),
+    ('PUT', '/{id}', 'update'),
+    ('DELETE', '/{id}', 'destroy'),
+]
+NEW_ITEMS_FOLDER = 'New Routes'
+
+TOKEN = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<comment>//[^\n]*|\#[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+  | (?P<var>\$\w+)
+  | (?P<name>\\?[A-Za-z_]\w*(?:\\[A-Za-z_]\w*)*)
+  | (?P<number>\d+(?:\.\d+)?)
+  | (?P<op>::|\?->|->|=>|[()\[\]{},;.=:?!<>&|+\-*/%@])
+  | (?P<other>.)
+""", re.S | re.X)
+
+OPENERS = {'(': ')', '[': ']', '{': '}'}
+
+def tokenize(source):
+    """Return (kind, text) tokens, dropping whitespace and comments"""
+    return [(m.lastgroup, m.group()) for m in TOKEN.finditer(source) if m.lastgroup not in ('ws', 'comment')]
+
+def _unquote(text):
+    body = text[1:-1]
+    if text[0] == "'":
+        return body.replace("\\'", "'").replace('\\\\', '\\')
+    return body.encode('utf-8').decode('unicode_escape')
+
+class RouteFileParser:
+    """Extracts route declarations from a Laravel routes file"""
+
+    def __init__(self, source):
+        self.tokens = tokenize(source)
+        self.routes = []
+
+    def parse(self):
+        self._block(0, len(self.tokens), {'prefix': '', 'middleware': (), 'name': ''})
+        return self.routes
+
+    def _text(self, i):
+        return self.tokens[i][1] if i < len(self.tokens) else ''
+
+    def _matching(self, i):
+        """Index of the bracket closing the one at i"""
+        depth = 0
+        for j in range(i, len(self.tokens)):
+            text = self.tokens[j][1]
+            if self.tokens[j][0] != 'op':
+                continue
+            if text in OPENERS:
+                depth += 1
+            elif text in (')', ']', '}'):
+                depth -= 1
+                if depth == 0:
+                    return j
+        raise ValueError(f"Unbalanced {self._text(i)!r} in routes file")
+
+    def _split_args(self, start, end):
+        """Split the tokens between brackets into top-level comma separated ranges"""
+        args = []
+        i = arg_start = start
+        while i < end:
+            text = self.tokens[i][1]
+            if self.tokens[i][0] == 'op' and text in OPENERS:
+                i = self._matching(i) + 1
+                continue
+            if self.tokens[i][0] == 'op' and text == ',':
+                args.append((arg_start, i))
+                arg_start = i + 1
+            i += 1
+        if arg_start < end:
+            args.append((arg_start, end))
+        return args
+
+    def _eval(self, start, end):
+        """Evaluate a literal expression: strings, X::class, '.' concatenation and arrays"""
+        parts = []
+        i = start
+        while i < end:
+            kind, text = self.tokens[i]
+            if kind == 'string':
+                parts.append(_unquote(text))
+            elif kind == 'name' and self._text(i + 1) == '::' and self._text(i + 2) == 'class':
+                parts.append(text.rsplit('\\', 1)[-1])
+                i += 2
+            elif kind == 'op' and text == '[':
+                close = self._matching(i)
+                parts.append(self._eval_array(i + 1, close))
+                i = close
+            elif kind == 'op' and text == '.':
+                pass
+            elif kind in ('name', 'number'):
+                parts.append(text)
+            else:
+                return None
+            i += 1
+        if len(parts) == 1:
+            return parts[0]
+        if all(isinstance(p, str) for p in parts):
+            return ''.join(parts)
+        return None
+
+    def _eval_array(self, start, end):
+        values = []
+        mapping = {}
+        for arg_start, arg_end in self._split_args(start, end):
+            arrow = next((j for j in range(arg_start, arg_end) if self.tokens[j] == ('op', '=>')), None)
+            if arrow is None:
+                values.append(self._eval(arg_start, arg_end))
+            else:
+                mapping[self._eval(arg_start, arrow)] = self._eval(arrow + 1, arg_end)
+        return mapping if mapping else values
+
+    def _block(self, start, end, context):
+        i = start
+        while i < end:
+            if self.tokens[i] == ('name', 'Route') and self._text(i + 1) == '::':
+                i = self._statement(i + 2, end, context)
+            else:
+                i += 1
+
+    def _statement(self, i, end, context):
+        """Parse one Route::a(...)->b(...)... chain starting at the first method name"""
+        calls = []
+        while i < end and self.tokens[i][0] == 'name' and self._text(i + 1) == '(':
+            close = self._matching(i + 1)
+            calls.append((self.tokens[i][1], self._split_args(i + 2, close)))
+            i = close + 1
+            if self._text(i) in ('->', '?->'):
+                i += 1
+            else:
+                break
+        if not calls:
+            return i
+        if any(name == 'group' for name, _ in calls):
+            self._group(calls, context)
+        else:
+            self._route(calls, context)
+        return i
+
+    def _apply_modifiers(self, calls, context):
+        """Context after chained ->prefix() / ->middleware() / ->name() calls"""
+        return self._apply_attributes({name: self._eval(*args[0]) if args else None for name, args in calls}, context)
+
+    def _apply_attributes(self, attributes, context):
+        """Context after group attributes such as ['prefix' => ..., 'middleware' => ...]"""
+        context = dict(context)
+        prefix = attributes.get('prefix')
+        if isinstance(prefix, str):
+            context['prefix'] = _join_uri(context['prefix'], prefix)
+        middleware = attributes.get('middleware')
+        if middleware is not None:
+            context['middleware'] += tuple(middleware if isinstance(middleware, list) else [middleware])
+        name = attributes.get('name', attributes.get('as'))
+        if isinstance(name, str):
+            context['name'] += name
+        return context
+
+    def _group(self, calls, context):
+        group_index = next(i for i, (name, _) in enumerate(calls) if name == 'group')
+        context = self._apply_modifiers(calls[:group_index], context)
+        args = calls[group_index][1]
+        for arg_start, arg_end in args:
+            if self.tokens[arg_start] == ('op', '['):
+                attributes = self._eval(arg_start, arg_end)
+                if isinstance(attributes, dict):
+                    context = self._apply_attributes(attributes, context)
+            elif self.tokens[arg_start][1] in ('function', 'fn', 'static'):
+                brace = next((j for j in range(arg_start, arg_end) if self.tokens[j] == ('op', '{')), None)
+                if brace is not None:
+                    self._block(brace + 1, self._matching(brace), context)
+
+    def _route(self, calls, context):
+        verb, args = calls[0]
+        verb = verb.lower()
+        if verb in ('resource', 'apiresource') and args:
+            base = self._eval(*args[0])
+            controller = self._eval(*args[1]) if len(args) > 1 else None
+            for method, suffix, action in RESOURCE_ACTIONS:
+                self._add(method, _join_uri(context['prefix'], f'{base}{suffix}'), f'{controller}@{action}',
+                          context['middleware'], '')
+            return
+        if verb not in VERBS or not args:
+            return
+
+        if verb == 'match':
+            methods = self._eval(*args[0])
+            methods = [m.upper() for m in (methods if isinstance(methods, list) else [methods]) if m]
+            args = args[1:]
+        elif verb == 'any':
+            methods = ['GET', 'POST', 'PUT', 'PATCH', 'DELETE']
+        else:
+            methods = [verb.upper()]
+        if not args:
+            return
+        uri = self._eval(*args[0])
+        if not isinstance(uri, str):
+            return
+        action = self._action(*args[1]) if len(args) > 1 else None
+
+        route_context = self._apply_modifiers(calls[1:], context)
+        name = route_context['name'] if route_context['name'] != context['name'] else ''
+        for method in methods:
+            self._add(method, _join_uri(context['prefix'], uri), action, route_context['middleware'], name)
+
+    def _action(self, start, end):
+        if self.tokens[start][1] in ('function', 'fn', 'static'):
+            return 'Closure'
+        value = self._eval(start, end)
+        if isinstance(value, list) and len(value) == 2:
+            return f'{value[0]}@{value[1]}'
+        return value if isinstance(value, str) else None
+
+    def _add(self, method, uri, action, middleware, name):
+        self.routes.append({
+            'method': method,
+            'uri': uri,
+            'action': action,
+            'middleware': list(middleware),
+            'name': name,
+        })
+
+def _join_uri(prefix, uri):
+    return '/' + '/'.join(part.strip('/') for part in (prefix, uri) if part.strip('/'))
+
+def extract_routes(path=DEFAULT_ROUTES, include_options=False):
+    with open(path, 'r', encoding='utf-8') as f:
+        routes = RouteFileParser(f.read()).parse()
+    if not include_options:
+        routes = [r for r in routes if r['method'] != 'OPTIONS']
+    return routes
+
+def route_segments(route):
+    return [s for s in route['uri'].split('/') if s]
+
+def _param_name(segment):
+    return segment.strip(':{}').rstrip('?')
+
+def _postman_segment(segment):
+    """Laravel {id} / {id?} -> Postman :id / :id?"""
+    if segment.startswith('{') and segment.endswith('}'):
+        return ':' + segment[1:-1]
+    return segment
+
+def _humanize(route):
+    action = route['action'] or ''
+    method_name = action.rsplit('@', 1)[-1] if '@' in action else ''
+    if method_name:
+        words = re.sub(r'(?<=[a-z0-9])(?=[A-Z])|_', ' ', method_name).split()
+        return ' '.join(w if w.isupper() else w.capitalize() for w in words)
+    return f"{route['method']} {route['uri']}"
+
+def new_item(route):
+    segments = [_postman_segment(s) for s in route_segments(route)]
+    request = {
+        'method': route['method'],
+        'header': [{'key': 'Accept', 'value': 'application/json'}],
+        'url': {
+            'raw': '{{base_url}}/' + '/'.join(segments),
+            'host': ['{{base_url}}'],
+            'path': segments,
+        },
+    }
+    variables = [{'key': s[1:], 'value': '1'} for s in segments if s.startswith(':')]
+    if variables:
+        request['url']['variable'] = variables
+    if route['method'] in ('POST', 'PUT', 'PATCH'):
+        request['header'].append({'key': 'Content-Type', 'value': 'application/json'})
+        request['body'] = {'mode': 'raw', 'raw': '{}'}
+    if 'auth:sanctum' not in route['middleware']:
+        request['auth'] = {'type': 'noauth'}
+    return {'name': _humanize(route), 'request': request, 'response': []}
+
+def _set_stale(item, stale):
+    """Add or remove the stale variable; return whether the item changed"""
+    if stale == is_stale(item):
+        return False
+    variables = [v for v in item.get('variable') or [] if not (isinstance(v, dict) and v.get('key') == STALE_VARIABLE)]
+    if stale:
+        variables.append({'key': STALE_VARIABLE, 'value': 'true', 'type': 'boolean',
+                          'description': f'No route in {DEFAULT_ROUTES}; set by postman_route_sync.py'})
+    if variables:
+        item['variable'] = variables
+    else:
+        del item['variable']
+    return True
+
+def _update_item(item, route):
+    """Bring an existing item's path variable names and auth mode in line with its route"""
+    changed = False
+    request = item['request']
+    url = request.get('url')
+    if isinstance(url, dict) and isinstance(url.get('path'), list):
+        route_params = [s for s in route_segments(route) if is_param_segment(s)]
+        item_params = [s for s in url['path'] if is_param_segment(s)]
+        renames = {}
+        for old, new in zip(item_params, route_params):
+            new = _postman_segment(new)
+            if old.startswith(':') and _param_name(old) != _param_name(new):
+                renames[old] = new
+        if renames:
+            url['path'] = [renames.get(s, s) for s in url['path']]
+            url['raw'] = re.sub(r':[\w?]+', lambda m: renames.get(m.group(), m.group()), url.get('raw', ''))
+            for variable in url.get('variable', []):
+                key = ':' + variable.get('key', '')
+                if key in renames:
+                    variable['key'] = renames[key][1:]
+            changed = True
+
+    public = 'auth:sanctum' not in route['middleware']
+    auth_type = (request.get('auth') or {}).get('type')
+    if public and auth_type is None:
+        request['auth'] = {'type': 'noauth'}
+        changed = True
+    elif not public and auth_type == 'noauth':
+        del request['auth']
+        changed = True
+    return changed
+
+def _folder_for(route, folders_by_prefix):
+    """Folder of the existing item sharing the longest leading path with the route"""
+    key = tuple(':' if is_param_segment(s) else s.lower() for s in route_segments(route))
+    for length in range(len(key), 0, -1):
+        folder = folders_by_prefix.get(key[:length])
+        if folder is not None:
+            return folder
+    return None
+
+def sync_collection(collection, routes):
+    """Apply the route diff to collection in place and return a summary dict"""
+    routes_by_key = {}
+    for route in routes:
+        routes_by_key.setdefault((route['method'], normalize_path(route_segments(route))), route)
+
+    items_by_key = {}
+    folder_votes = {}
+    containers = {}
+    for items in _containers(collection):
+        containers[id(items)] = items
+        for item in items:
+            if 'request' not in item or 'item' in item:
+                continue
+            items_by_key.setdefault(route_key(item), []).append(item)
+            normalized = tuple(':' if is_param_segment(s) else s.lower() for s in request_segments(item))
+            for length in range(1, len(normalized) + 1):
+                folder_votes.setdefault(normalized[:length], Counter())[id(items)] += 1
+    folders_by_prefix = {prefix: containers[votes.most_common(1)[0][0]] for prefix, votes in folder_votes.items()}
+
+    summary = {'added': [], 'updated': [], 'stale': [], 'revived': []}
+    for key, items in items_by_key.items():
+        route = routes_by_key.get(key)
+        for item in items:
+            if route is None:
+                if _set_stale(item, True):
+                    summary['stale'].append(key)
+                continue
+            if _set_stale(item, False):
+                summary['revived'].append(key)
+            if _update_item(item, route):
+                summary['updated'].append(key)
+
+    new_folder = None
+    for key, route in routes_by_key.items():
+        if key in items_by_key:
+            continue
+        folder = _folder_for(route, folders_by_prefix)
+        if folder is None:
+            if new_folder is None:
+                new_folder = {'name': NEW_ITEMS_FOLDER, 'item': []}
+                collection['item'].append(new_folder)
+            folder = new_folder['item']
+        folder.append(new_item(route))
+        summary['added'].append(key)
+    return summary
+
+def _containers(collection):
+    """Yield the item list of the collection root and of every folder"""
+    stack = [collection['item']]
+    while stack:
+        items = stack.pop()
+        yield items
+        stack.extend(item['item'] for item in items if 'item' in item)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sync the Postman collection with backend/routes/api.php")
+    parser.add_argument('collection', nargs='?', default=DEFAULT_COLLECTION)
+    parser.add_argument('--routes', default=DEFAULT_ROUTES, help="Laravel routes file to read")
+    parser.add_argument('--dry-run', action='store_true', help="report the changes without writing the collection")
+    parser.add_argument('--list', action='store_true', help="print the extracted routes and exit")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    routes = extract_routes(args.routes)
+    if args.list:
+        for route in routes:
+            print(f"{route['method']:<7} {route['uri']:<50} {route['action'] or ''}")
+        print(f"\n{len(routes)} routes")
+        return 0
+
+    collection = load_collection(args.collection)
+    summary = sync_collection(collection, routes)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    labels = {'added': '+ Added', 'updated': '~ Updated', 'stale': '! Stale', 'revived': '✓ Revived'}
+    for kind, label in labels.items():
+        for method, path in sorted(summary[kind]):
+            print(f"{label}: {method} {path}")
+    changes = sum(len(v) for v in summary.values())
+    print(f"\n{len(routes)} routes, {changes} change(s) in {elapsed:.1f} ms")
+
+    if changes and not args.dry_run:
+        save_collection(collection, args.collection)
+        print(f"Updated {args.collection}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
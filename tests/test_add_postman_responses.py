@@ -0,0 +1,160 @@
+import copy
+import json
+import os
+
+import add_postman_responses
+from add_postman_responses import Profiler, enrich_collection, enrich_file
+from postman_collection import endpoint_key, iter_requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def load_without_examples():
+    with open(os.path.join(ROOT, 'ACE_API_Postman_Collection.json'), 'r', encoding='utf-8') as f:
+        collection = json.load(f)
+    for _, item in iter_requests(collection['item']):
+        item.pop('response', None)
+    return collection
+
+def test_enrich_collection_does_not_modify_its_input():
+    collection = load_without_examples()
+    before = copy.deepcopy(collection)
+    enriched = enrich_collection(collection)
+    assert collection == before
+    assert all(item['response'] for _, item in iter_requests(enriched['item']))
+    assert enrich_collection(enriched) is enriched
+
+def test_on_item_hook_sees_every_request():
+    seen = []
+    enrich_collection(load_without_examples(), on_item=lambda path, item, parent, changed, seconds:
+                      seen.append((parent, changed)))
+    assert len(seen) == 128 and all(changed for _, changed in seen)
+    assert ('Admin/Users', True) in seen
+
+def folded_leaves(profiler, prefix, path):
+    """{(walk phase, leaf frame): microseconds} of the generation stacks and the phase frames in prefix.folded"""
+    profiler.write(prefix, path)
+    leaves = {}
+    with open(prefix + '.folded', 'r', encoding='utf-8') as f:
+        for line in f.read().splitlines():
+            stack, micros = line.rsplit(' ', 1)
+            frames = stack.split(';')
+            assert frames[0] == 'add_postman_responses' and int(micros) > 0
+            key = (frames[1], frames[-1]) if len(frames) > 2 else (frames[1], None)
+            leaves[key] = leaves.get(key, 0) + int(micros)
+    return leaves
+
+def test_profile_counts_only_generated_items(tmp_path):
+    path = str(tmp_path / 'collection.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(load_without_examples(), f, indent='\t')
+
+    profiler = Profiler()
+    assert enrich_file(path, use_cache=False, profiler=profiler) == 'updated'
+    report = profiler.report(path)
+    assert set(report['phases']) == {'load', 'traversal', 'generation', 'serialization', 'write'}
+    assert report['rules'] == len(add_postman_responses.rule_index().rules)
+    assert report['kept'] == 0 and sum(hits for _, hits in report['rule_hits']) == 128
+    assert dict(report['rule_hits'])['default'] == len(report['fallback']) > 0
+    with open(path, 'r', encoding='utf-8') as f:
+        enriched = {endpoint_key(p, item): item for p, item in iter_requests(json.load(f)['item'])}
+    for endpoint in report['fallback']:
+        assert json.loads(enriched[endpoint]['response'][0]['body']) == add_postman_responses.DEFAULT_RESPONSE
+    leaves = folded_leaves(profiler, str(tmp_path / 'profile'), path)
+    assert {phase for phase, leaf in leaves if leaf is None} <= set(report['phases'])
+    assert {leaf for phase, leaf in leaves if leaf is not None} <= set(dict(report['rule_hits']))
+    assert ('traversal', 'default') in leaves
+
+    for stream in (False, True):
+        profiler = Profiler()
+        assert enrich_file(path, stream=stream, use_cache=False, profiler=profiler) == 'unchanged'
+        report = profiler.report(path)
+        assert set(report['phases']) == ({'stream', 'generation'} if stream else {'load', 'traversal', 'generation'})
+        assert report['kept'] == 128 and report['rule_hits'] == [] and report['fallback'] == []
+        leaves = folded_leaves(profiler, str(tmp_path / f'profile-{stream}'), path)
+        assert {leaf for phase, leaf in leaves if leaf is not None} <= {'kept'}
+
+def test_minify_cache_is_bounded():
+    style = add_postman_responses.ExampleStyle(minify=True)
+    for i in range(add_postman_responses.MINIFIED_CACHE_SIZE * 3):
+        assert style.minify_text(json.dumps({'id': i}, indent=2)) == json.dumps({'id': i}, separators=(',', ':'))
+    assert len(style.minified) <= add_postman_responses.MINIFIED_CACHE_SIZE
+    # Hand-formatted bodies are left alone
+    assert style.minify_text('{"id":  1}') == '{"id":  1}'
+
+def test_non_collections_are_skipped_in_both_modes(tmp_path):
+    for name, text in (('package.json', '{"name": "x", "scripts": {}}'), ('list.json', '[1, 2]'),
+                       ('item.json', '{"item": {"a": 1}}')):
+        path = tmp_path / name
+        path.write_text(text)
+        for stream in (False, True):
+            assert enrich_file(str(path), stream=stream) == 'skipped'
+            assert path.read_text() == text
+    assert sorted(os.listdir(tmp_path)) == ['item.json', 'list.json', 'package.json']
+
+def test_stream_mode_matches_in_memory_output(tmp_path):
+    source = tmp_path / 'source.json'
+    source.write_text(json.dumps(load_without_examples(), indent='\t'))
+    outputs = {}
+    for stream in (False, True):
+        output = tmp_path / f'out-{stream}.json'
+        assert enrich_file(str(source), str(output), stream=stream, use_cache=False) == 'updated'
+        outputs[stream] = output.read_text()
+    assert outputs[False] == outputs[True]
+
+def small_collection():
+    def request(name, path, method='GET', **fields):
+        return dict({'name': name, 'request': {'method': method, 'url': {'raw': '{{base_url}}/' + path,
+                                                                          'path': path.split('/')}}}, **fields)
+    hand_written = {'name': 'Example Response - Show', 'code': 200, 'body': '{"id": 1, "by": "hand"}'}
+    return {'info': {'name': 'ACE'}, 'item': [
+        {'name': 'Courses', 'item': [request('List Courses', 'courses'),
+                                     request('Show', 'courses/:id', response=[hand_written])]},
+    ]}
+
+def write_collection(path, collection):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(collection, f, indent='\t')
+
+def test_second_run_leaves_the_file_untouched(tmp_path):
+    for stream in (False, True):
+        path = tmp_path / f'collection-{stream}.json'
+        write_collection(path, small_collection())
+        assert enrich_file(str(path), stream=stream) == 'updated'
+        data, mtime_ns = path.read_bytes(), path.stat().st_mtime_ns
+
+        assert enrich_file(str(path), stream=stream) == 'current'
+        # A touch without a content change is still current (the sha256 matches)
+        os.utime(path, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+        assert enrich_file(str(path), stream=stream) == 'current'
+        assert enrich_file(str(path), stream=stream, use_cache=False) == 'unchanged'
+        assert path.read_bytes() == data and path.stat().st_mtime_ns == mtime_ns + 10**9
+
+def test_changed_request_regenerates_only_generated_examples(tmp_path):
+    path = tmp_path / 'collection.json'
+    write_collection(path, small_collection())
+    assert enrich_file(str(path)) == 'updated'
+
+    for stream, query in ((False, '?page=2'), (True, '?page=3')):
+        collection = json.loads(path.read_text(encoding='utf-8'))
+        for _, item in iter_requests(collection['item']):
+            item['request']['url']['raw'] = '{{base_url}}/' + '/'.join(item['request']['url']['path']) + query
+        write_collection(path, collection)
+        assert enrich_file(str(path), stream=stream) == 'updated'
+        items = {item['name']: item for _, item in iter_requests(json.loads(path.read_text(encoding='utf-8'))['item'])}
+        generated = items['List Courses']['response']
+        assert [r['name'] for r in generated] == ['Example Response - List Courses']
+        assert generated[0]['originalRequest']['url']['raw'].endswith(query)
+        # The hand-written example has the generated name but the manifest knows it was not generated
+        assert items['Show']['response'] == small_collection()['item'][0]['item'][1]['response']
+        assert enrich_file(str(path), stream=stream) == 'current'
+
+def test_rules_change_invalidates_the_manifest(tmp_path, monkeypatch):
+    path = tmp_path / 'collection.json'
+    write_collection(path, small_collection())
+    assert enrich_file(str(path)) == 'updated'
+    assert enrich_file(str(path)) == 'current'
+    manifest = tmp_path / '.collection.json.manifest.json'
+    monkeypatch.setattr(add_postman_responses, 'rules_version', lambda: 'changed-rules')
+    assert enrich_file(str(path)) == 'updated'
+    assert json.loads(manifest.read_text(encoding='utf-8'))['rules_version'] == 'changed-rules'
+    assert enrich_file(str(path)) == 'current'
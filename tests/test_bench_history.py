@@ -0,0 +1,63 @@
+import json
+import random
+
+import postman_bench_history
+from postman_bench_history import PERF_END, PERF_START, compare_runs, db_path, main, record_report
+from postman_load_test import Histogram
+
+def histogram(mean_ms, samples=500, seed=0):
+    rng = random.Random(seed)
+    result = Histogram()
+    for _ in range(samples):
+        result.record(int(rng.gauss(mean_ms, mean_ms / 10) * 1000))
+    return result
+
+def report(**endpoints):
+    return {'base_url': 'http://localhost', 'users': 1, 'elapsed_s': 1.0, 'endpoints': [
+        {'endpoint': name, 'requests': h.count, 'errors': 0, 'p50_ms': h.percentile(50) / 1000,
+         'p95_ms': h.percentile(95) / 1000, 'p99_ms': h.percentile(99) / 1000, 'histogram': h.to_dict()}
+        for name, h in endpoints.items()]}
+
+def test_db_path_prefers_argument_then_environment(monkeypatch):
+    monkeypatch.delenv(postman_bench_history.DB_ENV, raising=False)
+    assert db_path() == postman_bench_history.DEFAULT_DB
+    monkeypatch.setenv(postman_bench_history.DB_ENV, 'env.sqlite')
+    assert db_path() == 'env.sqlite'
+    assert db_path('given.sqlite') == 'given.sqlite'
+
+def test_record_honours_the_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv(postman_bench_history.DB_ENV, str(tmp_path / 'env.sqlite'))
+    assert record_report(report(**{'GET Health': histogram(10)}), commit='abc') == 1
+    assert (tmp_path / 'env.sqlite').exists()
+
+def test_compare_flags_only_clear_regressions():
+    base = {'GET A': histogram(10), 'GET B': histogram(10), 'GET C': histogram(10, samples=5)}
+    head = {'GET A': histogram(10, seed=1), 'GET B': histogram(20, seed=1), 'GET C': histogram(40, samples=5)}
+    verdicts = {row[0]: row[4] for row in compare_runs(base, head, 0.10, 0.95, 30)}
+    assert verdicts == {'GET A': '', 'GET B': 'REGRESSED', 'GET C': 'too few samples'}
+
+def test_compare_command_exit_status(tmp_path, capsys):
+    db = str(tmp_path / 'history.sqlite')
+    record_report(report(**{'GET A': histogram(10)}), db, commit='aaa')
+    record_report(report(**{'GET A': histogram(10, seed=1)}), db, commit='bbb')
+    assert main(['--db', db, 'compare']) == 0
+    record_report(report(**{'GET A': histogram(30, seed=2)}), db, commit='ccc')
+    assert main(['--db', db, 'compare', '--base', 'aaa']) == 1
+    assert main(['--db', db, 'list']) == 0
+    assert 'ccc' in capsys.readouterr().out
+
+def test_annotate_handles_string_requests(tmp_path):
+    db = str(tmp_path / 'history.sqlite')
+    collection = {'item': [{'name': 'Health', 'request': '{{base_url}}/health'},
+                           {'name': 'Users', 'request': {'method': 'GET', 'url': '{{base_url}}/users',
+                                                         'description': 'All users'}}]}
+    path = tmp_path / 'collection.json'
+    path.write_text(json.dumps(collection))
+    record_report(report(**{'GET Health': histogram(5), 'GET Users': histogram(8)}), db, commit='abc')
+    for _ in range(2):
+        assert main(['--db', db, 'annotate', str(path)]) == 0
+    health, users = json.loads(path.read_text())['item']
+    assert health['request'] == '{{base_url}}/health'
+    assert health['description'].startswith(PERF_START) and health['description'].count(PERF_START) == 1
+    assert users['request']['description'].startswith('All users\n\n' + PERF_START)
+    assert users['request']['description'].endswith(PERF_END)
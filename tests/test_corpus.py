@@ -0,0 +1,38 @@
+import os
+import shutil
+
+import corpus
+import update_all_pages
+from postman_collection import iter_requests
+
+def test_collection_size_and_determinism(tmp_path):
+    for requests in (1, 128, 1000):
+        assert sum(1 for _ in iter_requests(corpus.collection(requests)['item'])) == requests
+    paths = [str(tmp_path / f'{i}.json') for i in range(3)]
+    corpus.write_collection(paths[0], 300, seed=1)
+    corpus.write_collection(paths[1], 300, seed=1)
+    corpus.write_collection(paths[2], 300, seed=2)
+    contents = [open(path, 'rb').read() for path in paths]
+    assert contents[0] == contents[1] != contents[2]
+
+def test_page_tree_reports_the_pages_the_codemod_changes(tmp_path):
+    pages = tmp_path / 'pages'
+    pending = corpus.write_page_tree(str(pages), 200, seed=3)
+    # A copy, so the reverse index cache is written next to it instead of into the source tree
+    locale = tmp_path / 'ar.json'
+    shutil.copy(os.path.join(corpus.ROOT, 'frontend', 'locales', 'ar.json'), locale)
+    engine = update_all_pages.default_engine(str(locale))
+    assert (tmp_path / '.ar.json.index.json').exists()
+    changed = 0
+    for directory, _, files in os.walk(pages):
+        for name in files:
+            changed += update_all_pages.update_file(os.path.join(directory, name), engine, write=False,
+                                                    base_path=str(pages))
+    assert 0 < pending == changed
+
+def test_page_source_size():
+    texts = [('common.save', 'حفظ'), ('common.cancel', 'إلغاء')]
+    source = corpus.page_source(texts, 16, seed=1)
+    assert 16 * 1024 <= len(source.encode('utf-8')) < 18 * 1024
+    assert source == corpus.page_source(texts, 16, seed=1)
+    assert 'حفظ' in source
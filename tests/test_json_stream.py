@@ -0,0 +1,62 @@
+import io
+import json
+
+import pytest
+
+from add_postman_responses import CollectionStream, JsonStreamReader, enrich_collection, is_collection_file
+
+DOCUMENT = '  {"a": [1, 2.5e3, -0.25, true, false, null], "s": "é\\"\\u00e9}]", "n": 123456789} [] "x" 42 '
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 1 << 16])
+def test_reader_decodes_values_split_across_chunks(chunk_size):
+    reader = JsonStreamReader(io.StringIO(DOCUMENT), chunk_size)
+    assert reader.value() == {'a': [1, 2500.0, -0.25, True, False, None], 's': 'é"é}]', 'n': 123456789}
+    assert reader.value() == []
+    assert reader.value() == 'x'
+    # A number at the end of a chunk is only returned once it is known to be complete
+    assert reader.value() == 42
+    assert reader.peek() == ''
+
+def test_reader_reports_bad_input():
+    reader = JsonStreamReader(io.StringIO('{"a": 1'), 2)
+    with pytest.raises(ValueError):
+        reader.value()
+    reader = JsonStreamReader(io.StringIO('[1]'))
+    with pytest.raises(ValueError):
+        reader.expect('{')
+
+def nested_collection(depth):
+    items = [{'name': 'Leaf', 'request': {'method': 'GET', 'url': {'raw': '{{base_url}}/leaf', 'path': ['leaf']}}}]
+    for level in range(depth):
+        items = [{'name': f'Folder {level}', 'description': 'd', 'item': items, 'auth': {'type': 'noauth'}},
+                 {'name': 'Empty', 'item': []},
+                 {'name': f'Users {level}', 'request': {'method': 'POST', 'url': f'{{{{base_url}}}}/users/{level}'}}]
+    return {'info': {'name': 'Nested', 'schema': 'v2.1.0'}, 'item': items, 'variable': [{'key': 'k', 'value': 1}]}
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 1 << 16])
+def test_stream_output_matches_json_dump(chunk_size):
+    collection = nested_collection(40)
+    out = io.StringIO()
+    stream = CollectionStream(JsonStreamReader(io.StringIO(json.dumps(collection, indent='\t')), chunk_size), out)
+    stream.run()
+    assert stream.changed
+    assert out.getvalue() == json.dumps(enrich_collection(collection), indent='\t')
+
+def test_stream_folder_context_is_the_full_path():
+    seen = []
+    source = io.StringIO(json.dumps(nested_collection(2)))
+    CollectionStream(JsonStreamReader(source), io.StringIO(),
+                     on_item=lambda path, item, parent, changed, seconds: seen.append((parent, item['name']))).run()
+    assert seen == [('Folder 1/Folder 0', 'Leaf'), ('Folder 1', 'Users 0'), ('', 'Users 1')]
+
+def test_stream_rejects_trailing_data():
+    with pytest.raises(ValueError):
+        CollectionStream(JsonStreamReader(io.StringIO('{"item": []} {}')), io.StringIO()).run()
+
+def test_is_collection_file(tmp_path):
+    cases = {'{"info": {"item": 1}, "item": [\n': True, '{"item": {}}': False, '[{"item": []}]': False,
+             '{"name": "x"}': False}
+    for index, (text, expected) in enumerate(cases.items()):
+        path = tmp_path / f'{index}.json'
+        path.write_text(text)
+        assert is_collection_file(str(path)) is expected
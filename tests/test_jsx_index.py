@@ -0,0 +1,100 @@
+import json
+import os
+
+import jsx_index
+from jsx_index import IndexCache, lex
+
+def spans(source, index):
+    return {
+        'text': [source[a:b] for a, b in index.text_nodes],
+        'strings': [(source[a:b], context) for a, b, context in index.strings],
+        'templates': [source[a:b] for a, b in index.templates],
+        'comments': [source[a:b] for a, b in index.comments],
+    }
+
+def test_jsx_text_versus_comparison():
+    source = 'const ok = a < b && c > d;\nconst el = <p className="x">Hi {name} there</p>;\n'
+    found = spans(source, lex(source))
+    assert found['text'] == ['Hi ', ' there']
+    assert found['strings'] == [('"x"', 'attr')]
+
+def test_ts_files_have_no_jsx():
+    source = 'const n = <number>value;\nconst s = "text";\n'
+    assert spans(source, lex(source, jsx=False))['strings'] == [('"text"', 'code')]
+
+def test_regex_literal_versus_division():
+    source = 'const r = /"quoted"<p>/g.test(s);\nconst half = total / 2 / "x".length;\n'
+    found = spans(source, lex(source))
+    # The quotes and '<p>' inside the regex are neither a string nor an element
+    assert found['strings'] == [('"x"', 'code')] and found['text'] == []
+
+def test_nested_template_literals():
+    source = 'const s = `outer ${cond ? `inner ${t("a.b")} "q"` : "no"} end`;\n'
+    index = lex(source)
+    found = spans(source, index)
+    assert found['templates'] == ['`inner ${t("a.b")} "q"`', '`outer ${cond ? `inner ${t("a.b")} "q"` : "no"} end`']
+    # "q" is template text, not a string
+    assert found['strings'] == [('"a.b"', 'call'), ('"no"', 'code')]
+    assert [(kind, value) for _, kind, value in index.t_calls] == [('key', 'a.b')]
+
+PAGE = '''"use client";
+// t('in.comment')
+import {
+  useState,
+  useEffect,
+} from "react";
+import "./styles.css";
+export default function Page({ id }) {
+  const { t } = useLanguage();
+  const Lazy = import("./Lazy");
+  const label = t("page.title");
+  return <div title="attr" onClick={() => go("expr")}>{t(`grades.${g}`)} {t(key)}</div>;
+}
+const after = "code";
+'''
+
+def test_string_contexts():
+    assert spans(PAGE, lex(PAGE))['strings'] == [
+        ('"use client"', 'code'), ('"./Lazy"', 'call'), ('"page.title"', 'call'), ('"attr"', 'attr'),
+        ('"expr"', 'expr'), ('"code"', 'code')]
+
+def test_t_calls_and_comments():
+    index = lex(PAGE)
+    assert [(kind, value) for _, kind, value in index.t_calls] == [
+        ('key', 'page.title'), ('prefix', 'grades.'), ('dynamic', None)]
+    # t() inside a comment is not a call
+    assert spans(PAGE, index)['comments'] == ["// t('in.comment')"]
+
+def test_imports():
+    imports = [(PAGE[start:end].split('\n')[0], source, clause) for start, end, source, clause in lex(PAGE).imports]
+    assert imports == [
+        ('import {', 'react', '{\n  useState,\n  useEffect,\n}'),
+        ('import "./styles.css";', './styles.css', ''),
+        ('import("./Lazy"', './Lazy', None),
+    ]
+
+def test_directive_prologue_and_component():
+    index = lex(PAGE)
+    assert index.directives == ['use client'] and PAGE[:index.directive_end] == '"use client";'
+    name, body_open, body_close = index.component
+    assert name == 'Page'
+    assert PAGE[body_open:body_close + 1].startswith('{\n  const { t }')
+    assert PAGE[body_open:body_close + 1].endswith('</div>;\n}')
+    assert index.in_component(PAGE.index('label')) and not index.in_component(PAGE.index('after'))
+
+def test_expression_after_directive_is_not_a_directive():
+    source = '// header\n"use client".length;\n'
+    index = lex(source)
+    assert index.directives == [] and index.first_code == source.index('"')
+
+def test_index_cache_round_trip(tmp_path):
+    path = str(tmp_path / 'index.json')
+    cache = IndexCache(path)
+    index = cache.get(PAGE)
+    cache.save()
+    assert os.listdir(tmp_path) == ['index.json']
+    with open(path, 'r', encoding='utf-8') as f:
+        assert json.load(f)['version'] == jsx_index.lexer_version()
+    cached = IndexCache(path).get(PAGE)
+    assert json.dumps(cached.to_json()) == json.dumps(index.to_json())
+    assert cached.component == index.component
@@ -0,0 +1,126 @@
+import asyncio
+import random
+from urllib.parse import urlsplit
+
+from postman_load_test import Connection, Histogram, compile_request
+
+def test_histogram_small_values_are_exact():
+    histogram = Histogram()
+    for value in range(256):
+        histogram.record(value)
+    assert [histogram.value_at_rank(rank + 1) for rank in range(256)] == list(range(256))
+
+def test_histogram_buckets_bound_the_relative_error():
+    histogram = Histogram()
+    random.seed(5)
+    values = [random.randrange(1, 1 << 40) for _ in range(2000)] + [255, 256, 257, 511, 512, (1 << 20) - 1, 1 << 20]
+    last_index = -1
+    for value in sorted(values):
+        index = histogram._index(value)
+        low, high = histogram._lowest_value(index), histogram._highest_value(index)
+        assert low <= value <= high and index >= last_index
+        # Bucket width over its lower edge: 1 / 2**(precision_bits - 1) = 0.78%
+        assert (high - low + 1) / low <= 1 / 128
+        last_index = index
+
+def test_value_at_rank_and_percentiles():
+    histogram = Histogram()
+    for value in range(1, 101):
+        histogram.record(value * 1000)
+    assert histogram.count == 100 and histogram.mean() == 50500
+    for percent, exact in ((50, 50000), (90, 90000), (99, 99000)):
+        value = histogram.percentile(percent)
+        assert exact <= value < exact * 1.01
+        assert histogram.value_at_rank(percent, lowest=True) <= exact <= value
+    # The upper edge is capped at the largest sample, and ranks are clamped
+    assert histogram.percentile(100) == histogram.value_at_rank(10**6) == 100000
+    assert histogram.value_at_rank(0) == histogram.value_at_rank(1) >= 1000
+    assert Histogram().percentile(99) == 0
+
+def test_histogram_merge_and_round_trip():
+    first, second = Histogram(), Histogram()
+    for value in (5, 300, 70000):
+        first.record(value)
+    second.record(12345678)
+    first.merge(second)
+    restored = Histogram.from_dict(first.to_dict())
+    assert (restored.count, restored.total, restored.max) == (4, 5 + 300 + 70000 + 12345678, 12345678)
+    assert [restored.value_at_rank(rank) for rank in range(1, 5)] == [first.value_at_rank(rank) for rank in range(1, 5)]
+
+def item(url, **request):
+    return {'name': 'Lessons', 'request': dict({'method': 'GET', 'url': url}, **request)}
+
+def test_compile_request_byte_template():
+    url = {
+        'raw': '{{base_url}}/courses/:course/lessons/:lesson?',
+        'path': ['courses', ':course', 'lessons', ':lesson?'],
+        'variable': [{'key': 'course', 'value': '{{course_id}}'}, {'key': 'lesson?', 'value': ''}],
+        'query': [{'key': 'q', 'value': 'a b&c'}, {'key': 'page', 'value': '{{page}}'},
+                  {'key': 'token', 'value': '{{access_token}}'}, {'key': 'debug', 'value': '1', 'disabled': True}],
+    }
+    collection = {'auth': {'type': 'bearer', 'bearer': [{'key': 'token', 'value': '{{access_token}}'}]}}
+    variables = {'base_url': 'http://localhost:8000/api', 'course_id': '7 x', 'page': '2'}
+    template = compile_request(('Courses',), item(url, header=[{'key': 'Host', 'value': 'evil'},
+                                                               {'key': 'X-Tenant', 'value': '{{page}}'}]),
+                               collection, variables, urlsplit(variables['base_url']))
+    assert template.key == 'GET Courses/Lessons'
+    assert template.render({'access_token': 'T1'}) == (
+        b'GET /api/courses/7%20x/lessons?q=a+b%26c&page=2&token=T1 HTTP/1.1\r\n'
+        b'Host: localhost:8000\r\nAccept: application/json\r\nConnection: keep-alive\r\n'
+        b'X-Tenant: 2\r\nAuthorization: Bearer T1\r\n\r\n')
+    # The token slot is filled per user; everything else was rendered once
+    assert template.render({'access_token': 'T2'}).count(b'T2') == 2
+
+def test_compile_request_bodies_and_unreplayable_requests():
+    target = urlsplit('http://localhost/api')
+    form = item('{{base_url}}/login', method='POST', body={'mode': 'urlencoded', 'urlencoded': [
+        {'key': 'email', 'value': '{{email}}'}, {'key': 'skip', 'value': 'x', 'disabled': True}]})
+    payload = compile_request((), form, {}, {'email': 'a+b@ace.edu'}, target).render({})
+    assert payload.endswith(b'Content-Type: application/x-www-form-urlencoded\r\n'
+                            b'Content-Length: 21\r\n\r\nemail=a%2Bb%40ace.edu')
+    raw = item('{{base_url}}/notes', method='POST', body={'mode': 'raw', 'raw': '{"by": "{{access_token}}"}'})
+    assert compile_request((), raw, {}, {}, target).render({'access_token': 'é'}).endswith(
+        'Content-Length: 12\r\n\r\n{"by": "é"}'.encode('utf-8'))
+    upload = item('{{base_url}}/files', method='POST', body={'mode': 'formdata', 'formdata': []})
+    assert compile_request((), upload, {}, {}, target) is None
+    missing = item({'raw': '{{base_url}}/courses/:id', 'path': ['courses', ':id'], 'variable': [{'key': 'id'}]})
+    assert compile_request((), missing, {}, {}, target) is None
+
+RESPONSES = [
+    b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n4;ext=1\r\n{"a"\r\n3\r\n:1}\r\n0\r\n\r\n',
+    b'HTTP/1.1 201 Created\r\nContent-Length: 7\r\n\r\n{"b":2}',
+    b'HTTP/1.1 204 No Content\r\nContent-Length: 0\r\n\r\n',
+    b'HTTP/1.1 500 Internal Server Error\r\nContent-Type: text/plain\r\n\r\nno length',
+]
+
+def test_connection_parses_chunked_and_sized_responses():
+    async def run():
+        requests = []
+
+        async def serve(reader, writer):
+            # One keep-alive connection for the sized responses, then a close-delimited one
+            for response in RESPONSES:
+                requests.append(await reader.readuntil(b'\r\n\r\n'))
+                writer.write(response)
+                await writer.drain()
+                if b'Content-Length' not in response and b'chunked' not in response:
+                    break
+            writer.close()
+
+        server = await asyncio.start_server(serve, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        connection = Connection(urlsplit(f'http://127.0.0.1:{port}/api'), timeout=5)
+        payload = b'GET /api/x HTTP/1.1\r\nHost: test\r\n\r\n'
+        try:
+            results = [await connection.request(payload) for _ in RESPONSES]
+            # The read-to-end response closed the connection
+            assert connection.writer is None
+        finally:
+            connection.close()
+            server.close()
+            await server.wait_closed()
+        return results, requests
+
+    results, requests = asyncio.run(run())
+    assert results == [(200, b'{"a":1}'), (201, b'{"b":2}'), (204, b''), (500, b'no length')]
+    assert len(requests) == 4
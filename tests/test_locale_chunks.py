@@ -0,0 +1,71 @@
+import json
+import os
+import stat
+
+import pytest
+
+import build_locale_chunks
+from build_locale_chunks import build_chunks, write_chunk_dir
+
+LOCALES = {'ar': {'common.save': 'حفظ', 'admin.title': 'لوحة'}, 'en': {'common.save': 'Save', 'admin.title': 'Panel'}}
+
+PAGE = '''import { useLanguage } from "@/hooks/useLanguage";
+
+export default function Page() {
+  const { t } = useLanguage();
+  return <button>{t("%s")}</button>;
+}
+'''
+
+def write_page(root, route, key):
+    directory = os.path.join(root, 'app', *route.strip('/').split('/'))
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, 'page.tsx'), 'w', encoding='utf-8') as f:
+        f.write(PAGE % key)
+
+def read_tree(directory):
+    tree = {}
+    for parent, _, files in os.walk(directory):
+        for name in files:
+            with open(os.path.join(parent, name), 'r', encoding='utf-8') as f:
+                tree[os.path.relpath(os.path.join(parent, name), directory)] = f.read()
+    return tree
+
+def test_build_chunks_per_route(tmp_path):
+    root, out = str(tmp_path), str(tmp_path / 'public' / 'locales' / 'chunks')
+    write_page(root, '/student', 'common.save')
+    write_page(root, '/admin', 'admin.title')
+    rows, count = build_chunks(root, LOCALES, out)
+    assert count == 2 and {row['route']: row['keys'] for row in rows} == {'/admin': 1, '/student': 1}
+    with open(os.path.join(out, 'manifest.json'), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    chunk = manifest['routes']['/student']['chunk']
+    with open(os.path.join(out, 'en', f'{chunk}.json'), 'r', encoding='utf-8') as f:
+        assert json.load(f) == {'common.save': 'Save'}
+
+    # A rebuild replaces the whole directory: chunks no route uses any more are gone
+    write_page(root, '/admin', 'common.save')
+    build_chunks(root, LOCALES, out)
+    assert sorted(read_tree(out)) == ['ar/%s.json' % chunk, 'en/%s.json' % chunk, 'manifest.json']
+    assert sorted(os.listdir(os.path.dirname(out))) == ['chunks']
+
+def test_interrupted_write_keeps_the_previous_chunks(tmp_path, monkeypatch):
+    out = str(tmp_path / 'chunks')
+    write_chunk_dir(out, ['en'], {'abc': {'en': '{}'}}, {'languages': ['en'], 'routes': {}})
+    before = read_tree(out)
+
+    def fail(*args, **kwargs):
+        raise OSError('disk full')
+    monkeypatch.setattr(build_locale_chunks.json, 'dump', fail)
+    with pytest.raises(OSError):
+        write_chunk_dir(out, ['en'], {'def': {'en': '{}'}}, {'languages': ['en'], 'routes': {}})
+    assert read_tree(out) == before
+    assert os.listdir(tmp_path) == ['chunks']
+
+def test_chunk_dir_mode_follows_the_umask(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        write_chunk_dir(str(tmp_path / 'chunks'), ['en'], {}, {'languages': ['en'], 'routes': {}})
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE((tmp_path / 'chunks').stat().st_mode) == 0o755
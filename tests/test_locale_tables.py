@@ -0,0 +1,14 @@
+import contextlib
+import io
+
+import build_locale_tables
+from build_locale_tables import flat_table
+
+def test_flat_table():
+    locale = {'nav': {'home': 'Home', 'menu': {'open': 'Open'}}, 'list': ['x'], 'title': 'ACE'}
+    assert flat_table(locale) == {'nav.home': 'Home', 'nav.menu.open': 'Open', 'title': 'ACE'}
+
+def test_committed_flat_tables_are_current():
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        status = build_locale_tables.main(['--check'])
+    assert status == 0, out.getvalue()
@@ -0,0 +1,159 @@
+import copy
+import json
+
+from postman_collection import iter_requests
+from postman_merge import CONFLICT_VARIABLE, main, merge_collections
+
+def request(name, path, method='GET', **fields):
+    item = {'name': name, 'request': {'method': method, 'url': {'raw': '{{base_url}}/' + path, 'path': path.split('/')}}}
+    item.update(fields)
+    return item
+
+def base_collection():
+    return {
+        'info': {'name': 'ACE'},
+        'variable': [{'key': 'base_url', 'value': 'http://localhost'}],
+        'item': [
+            {'name': 'Users', 'item': [
+                request('List', 'users'),
+                request('Show', 'users/:id', response=[{'name': 'OK', 'code': 200}]),
+            ]},
+            request('Health', 'health'),
+        ],
+    }
+
+def names(collection):
+    return [(path, item['name']) for path, item in iter_requests(collection['item'])]
+
+def test_unchanged_merge_is_identity():
+    base = base_collection()
+    merged, conflicts = merge_collections(base, copy.deepcopy(base), copy.deepcopy(base))
+    assert merged == base and conflicts == {}
+
+def test_edits_to_different_fields_of_one_item_merge():
+    base, ours, theirs = base_collection(), base_collection(), base_collection()
+    ours['item'][0]['item'][1]['request']['body'] = {'mode': 'raw', 'raw': '{}'}
+    theirs['item'][0]['item'][1]['response'].append({'name': 'Not Found', 'code': 404})
+    merged, conflicts = merge_collections(base, ours, theirs)
+    show = merged['item'][0]['item'][1]
+    assert conflicts == {}
+    assert show['request']['body'] == {'mode': 'raw', 'raw': '{}'}
+    assert [r['name'] for r in show['response']] == ['OK', 'Not Found']
+
+def test_items_are_matched_by_route_across_renames_and_moves():
+    base, ours, theirs = base_collection(), base_collection(), base_collection()
+    ours['item'][0]['item'][0]['name'] = 'List users'
+    health = theirs['item'].pop()
+    theirs['item'][0]['item'].append(health)
+    merged, conflicts = merge_collections(base, ours, theirs)
+    assert conflicts == {}
+    assert names(merged) == [(('Users',), 'List users'), (('Users',), 'Show'), (('Users',), 'Health')]
+
+def test_additions_and_deletions():
+    base, ours, theirs = base_collection(), base_collection(), base_collection()
+    ours['item'][0]['item'].append(request('Create', 'users', 'POST'))
+    del theirs['item'][1]
+    theirs['item'].append({'name': 'Posts', 'item': [request('List', 'posts')]})
+    merged, conflicts = merge_collections(base, ours, theirs)
+    assert conflicts == {}
+    assert names(merged) == [(('Users',), 'List'), (('Users',), 'Show'), (('Users',), 'Create'),
+                             (('Posts',), 'List')]
+
+def test_conflict_keeps_ours_and_is_reported():
+    base, ours, theirs = base_collection(), base_collection(), base_collection()
+    ours['item'][1]['name'] = 'Ours'
+    theirs['item'][1]['name'] = 'Theirs'
+    theirs['variable'][0]['value'] = 'http://staging'
+    ours['variable'][0]['value'] = 'http://prod'
+    merged, conflicts = merge_collections(base, ours, theirs)
+    assert merged['item'][1]['name'] == 'Ours'
+    assert conflicts == {'GET /health': ['name'], 'folder (collection)': ['variable[base_url]']}
+
+def conflict_marker(item):
+    markers = [v for v in item.get('variable', []) if v['key'] == CONFLICT_VARIABLE]
+    assert len(markers) == 1
+    return markers[0]
+
+def test_conflicts_are_recorded_in_the_output():
+    base, ours, theirs = base_collection(), base_collection(), base_collection()
+    ours['item'][1]['request']['header'] = [{'key': 'X-Trace', 'value': 'ours'}]
+    theirs['item'][1]['request']['header'] = [{'key': 'X-Trace', 'value': 'theirs'}]
+    ours['item'][1]['description'] = 'Ours'
+    theirs['item'][1]['description'] = 'Theirs'
+    ours['item'][0]['item'][1]['response'][0]['code'] = 201
+    theirs['item'][0]['item'][1]['response'][0]['code'] = 202
+    ours['variable'][0]['value'] = 'http://prod'
+    theirs['variable'][0]['value'] = 'http://staging'
+    # Only the item's own marker: the other variables are kept
+    ours['item'][0]['item'][1]['variable'] = [{'key': 'id', 'value': '1'}]
+    merged, conflicts = merge_collections(base, ours, theirs)
+    assert conflicts == {'GET /health': ['description', 'request.header'], 'GET /users/:': ['response[OK]'],
+                         'folder (collection)': ['variable[base_url]']}
+
+    health = conflict_marker(merged['item'][1])
+    assert health['value'] == 'description, request.header'
+    assert '\ndescription\n  base: (none)\n  ours: "Ours"\n  theirs: "Theirs"\n' in health['description']
+    assert 'request.header\n  base: (none)\n  ours: [{"key":"X-Trace","value":"ours"}]\n' in health['description']
+    show = merged['item'][0]['item'][1]
+    assert [v['key'] for v in show['variable']] == ['id', CONFLICT_VARIABLE]
+    assert show['response'][0]['code'] == 201
+    assert '  theirs: {"name":"OK","code":202}' in conflict_marker(show)['description']
+    assert conflict_marker(merged)['value'] == 'variable[base_url]'
+    # Items without conflicts are left alone, and so are the inputs
+    assert 'variable' not in merged['item'][0]['item'][0] and 'variable' not in ours['item'][1]
+
+    # Merging again (the marker left in ours) replaces the marker instead of adding another
+    ours = merged
+    merged, _ = merge_collections(base, ours, theirs)
+    assert conflict_marker(merged['item'][1])['value'] == 'description, request.header'
+
+def test_delete_and_move_conflicts_are_recorded():
+    base, ours, theirs = base_collection(), base_collection(), base_collection()
+    del ours['item'][1]
+    theirs['item'][1]['name'] = 'Ping'
+    ours['item'].append({'name': 'Admin', 'item': [ours['item'][0]['item'].pop(0)]})
+    theirs['item'].append({'name': 'Public', 'item': [theirs['item'][0]['item'].pop(0)]})
+    merged, conflicts = merge_collections(base, ours, theirs)
+    assert conflicts == {'GET /health': ['deleted on one side, changed on the other'], 'GET /users': ['folder']}
+    ping = next(item for path, item in iter_requests(merged['item']) if item['name'] == 'Ping')
+    assert '  ours: (none)\n  theirs: {"name":"Ping"' in conflict_marker(ping)['description']
+    listing = next(item for path, item in iter_requests(merged['item']) if item['name'] == 'List')
+    assert conflict_marker(listing)['description'].endswith('folder\n  base: "Users"\n  ours: "Admin"\n  theirs: "Public"')
+
+def test_delete_against_edit_keeps_the_edit():
+    base, ours, theirs = base_collection(), base_collection(), base_collection()
+    del ours['item'][1]
+    theirs['item'][1]['name'] = 'Ping'
+    merged, conflicts = merge_collections(base, ours, theirs)
+    assert ((), 'Ping') in names(merged)
+    assert conflicts == {'GET /health': ['deleted on one side, changed on the other']}
+
+def test_inputs_are_not_modified():
+    base, ours, theirs = base_collection(), base_collection(), base_collection()
+    ours['item'][0]['item'].append(request('Create', 'users', 'POST'))
+    theirs['item'][0]['item'][1]['response'] = []
+    before = copy.deepcopy((base, ours, theirs))
+    merge_collections(base, ours, theirs)
+    assert (base, ours, theirs) == before
+
+def test_merge_driver_writes_over_ours(tmp_path):
+    paths = {}
+    versions = base_collection(), base_collection(), base_collection()
+    versions[2]['item'][1]['description'] = 'Liveness probe'
+    for label, collection in zip(('base', 'ours', 'theirs'), versions):
+        paths[label] = str(tmp_path / f'{label}.json')
+        with open(paths[label], 'w', encoding='utf-8') as f:
+            json.dump(collection, f)
+    assert main([paths['base'], paths['ours'], paths['theirs']]) == 0
+    with open(paths['ours'], 'r', encoding='utf-8') as f:
+        assert json.load(f)['item'][1]['description'] == 'Liveness probe'
+
+    versions[1]['item'][1]['description'] = 'Health check'
+    with open(paths['ours'], 'w', encoding='utf-8') as f:
+        json.dump(versions[1], f)
+    assert main([paths['base'], paths['ours'], paths['theirs'], '--dry-run']) == 1
+    output = str(tmp_path / 'merged.json')
+    assert main([paths['base'], paths['ours'], paths['theirs'], '-o', output]) == 1
+    with open(output, 'r', encoding='utf-8') as f:
+        health = json.load(f)['item'][1]
+    assert health['description'] == 'Health check' and conflict_marker(health)['value'] == 'description'
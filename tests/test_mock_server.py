@@ -0,0 +1,70 @@
+from postman_mock_server import METHOD_NOT_ALLOWED, NOT_FOUND, MockServer, compile_routes, expand_optional
+
+def request(path, method='GET', responses=None, name='Request'):
+    item = {'name': name, 'request': {'method': method, 'url': {'raw': '{{base_url}}/' + path, 'path': path.split('/')}}}
+    item['response'] = [{'name': 'OK', 'code': 200, 'body': f'"{method} {path}"'}] if responses is None else responses
+    return ((), item)
+
+def body(response):
+    return response.split(b'\r\n\r\n', 1)[1].decode('utf-8')
+
+def status(response):
+    return int(response.split(b' ', 2)[1])
+
+def server(requests, prefix='/api'):
+    trie, _ = compile_routes(requests)
+    return MockServer(trie, prefix)
+
+def test_literal_segments_win_over_parameters():
+    mock = server([request('users/:id'), request('users/me'), request('users/{user}/posts/:post')])
+    assert body(mock.respond('GET', '/api/users/me')) == '"GET users/me"'
+    assert body(mock.respond('GET', '/api/users/42')) == '"GET users/:id"'
+    assert body(mock.respond('GET', '/api/users/me/posts/7?page=2')) == '"GET users/{user}/posts/:post"'
+    assert mock.respond('GET', '/api/users') is NOT_FOUND
+    assert mock.respond('GET', '/api/users/1/posts') is NOT_FOUND
+
+def test_backtracks_when_the_literal_branch_dead_ends():
+    mock = server([request('users/me/settings'), request('users/:id/posts')])
+    assert body(mock.respond('GET', '/api/users/me/posts')) == '"GET users/:id/posts"'
+
+def test_methods_head_and_preflight():
+    mock = server([request('posts'), request('posts', 'POST')])
+    assert body(mock.respond('POST', '/api/posts')) == '"POST posts"'
+    assert mock.respond('DELETE', '/api/posts') is METHOD_NOT_ALLOWED
+    head = mock.respond('HEAD', '/api/posts')
+    assert status(head) == 200 and body(head) == ''
+    assert status(mock.respond('OPTIONS', '/api/anything')) == 204
+
+def test_optional_trailing_parameters():
+    assert list(expand_optional(['a', '{b?}', '{c?}'])) == [['a', '{b?}', '{c?}'], ['a', '{b?}'], ['a']]
+    mock = server([request('files/{path?}')])
+    assert status(mock.respond('GET', '/api/files')) == 200
+    assert status(mock.respond('GET', '/api/files/readme')) == 200
+
+def test_prefix_must_end_at_a_segment_boundary():
+    mock = server([request('users'), request('xyz/users')])
+    assert status(mock.respond('GET', '/api/users')) == 200
+    assert mock.respond('GET', '/apixyz/users') is NOT_FOUND
+    assert mock.respond('GET', '/users') is NOT_FOUND
+    root = server([request('users')], prefix='')
+    assert status(root.respond('GET', '/users')) == 200
+
+def test_example_choice_and_unusable_codes():
+    mock = server([
+        request('a', responses=[{'name': 'Err', 'code': 422, 'body': 'e'}, {'name': 'OK', 'code': '201', 'body': 'ok'}]),
+        request('b', responses=[{'name': 'Err', 'code': 404, 'body': 'missing'}]),
+        request('c', responses=[{'name': 'Odd', 'code': 'OK', 'body': 'x'}, {'name': 'Err', 'code': 500, 'body': 'y'}]),
+        request('d', responses=[{'name': 'Odd', 'code': 'n/a'}, 'not an example']),
+        request('e', responses=[]),
+    ])
+    assert (status(mock.respond('GET', '/api/a')), body(mock.respond('GET', '/api/a'))) == (201, 'ok')
+    assert status(mock.respond('GET', '/api/b')) == 404
+    assert (status(mock.respond('GET', '/api/c')), body(mock.respond('GET', '/api/c'))) == (500, 'y')
+    assert mock.respond('GET', '/api/d') is NOT_FOUND
+    assert mock.respond('GET', '/api/e') is NOT_FOUND
+
+def test_first_example_for_a_route_wins():
+    first = request('users/:id', name='First')
+    first[1]['response'][0]['body'] = '"first"'
+    mock = server([first, request('users/{user}')])
+    assert body(mock.respond('GET', '/api/users/1')) == '"first"'
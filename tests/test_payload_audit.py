@@ -0,0 +1,52 @@
+import argparse
+import json
+
+import pytest
+
+from postman_payload_audit import measure_payload
+
+ARGS = argparse.Namespace(max_items=100, max_nested_bytes=2048, max_nested_items=20)
+
+def measure(data):
+    return measure_payload(json.dumps(data).encode('utf-8'), ARGS)
+
+def records(count, **extra):
+    return [dict({'id': i, 'title': f'Item {i}'}, **extra) for i in range(count)]
+
+@pytest.mark.parametrize('data, path', [
+    (records(500), '(root)'),
+    ({'success': True, 'data': records(500)}, 'data'),
+    ({'success': True, 'data': {'jobs': records(500)}}, 'data.jobs'),
+])
+def test_unpaginated_lists_are_flagged(data, path):
+    row = measure(data)
+    assert (row['list_path'], row['items'], row['paginated']) == (path, 500, False)
+    assert row['flags'] == ['unpaginated', 'unbounded']
+
+def test_short_nested_list_is_only_unpaginated():
+    row = measure({'success': True, 'data': {'courses': records(3), 'total': 3}})
+    assert (row['list_path'], row['items'], row['flags']) == ('data.courses', 3, ['unpaginated'])
+
+@pytest.mark.parametrize('data, path', [
+    ({'data': {'current_page': 1, 'data': records(15), 'per_page': 15, 'last_page': 4}}, 'data.data'),
+    ({'data': records(15), 'links': {'first': '?page=1', 'next': '?page=2'}}, 'data'),
+    ({'data': records(15), 'meta': {'current_page': 1, 'last_page': 4}}, 'data'),
+])
+def test_paginated_lists(data, path):
+    row = measure(data)
+    assert (row['list_path'], row['items'], row['paginated'], row['flags']) == (path, 15, True, [])
+
+@pytest.mark.parametrize('data', [
+    {'id': 1, 'title': 'Course', 'lessons': records(500)},
+    {'success': True, 'course': {'id': 1, 'lessons': records(500)}},
+    {'data': {'id': 1, 'students': records(500)}},
+])
+def test_detail_responses_are_not_list_endpoints(data):
+    row = measure(data)
+    assert (row['list_path'], row['items'], row['flags']) == (None, None, [])
+    assert row['depth'] >= 2
+
+def test_nested_relations_and_bad_bodies():
+    row = measure({'data': records(5, lessons=records(30))})
+    assert 'nested:lessons' in row['flags'] and row['relations']['lessons']['max_length'] == 30
+    assert measure_payload(b'<html>', ARGS)['flags'] == ['not-json']
@@ -0,0 +1,30 @@
+import os
+import stat
+
+from postman_collection import atomic_write, umask_mode
+
+def test_atomic_write_modes(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        assert umask_mode(0o777) == 0o755
+        new = tmp_path / 'new.json'
+        atomic_write(str(new), lambda f: f.write('{}'))
+        assert stat.S_IMODE(new.stat().st_mode) == 0o644
+        existing = tmp_path / 'script.sh'
+        existing.write_text('old')
+        existing.chmod(0o755)
+        atomic_write(str(existing), lambda f: f.write('new'))
+        assert existing.read_text() == 'new' and stat.S_IMODE(existing.stat().st_mode) == 0o755
+    finally:
+        os.umask(umask)
+    assert sorted(os.listdir(tmp_path)) == ['new.json', 'script.sh']
+
+def test_atomic_write_discards_when_write_returns_false(tmp_path):
+    path = tmp_path / 'collection.json'
+    path.write_text('old')
+    def write(f):
+        f.write('partial')
+        return False
+    atomic_write(str(path), write)
+    assert path.read_text() == 'old'
+    assert os.listdir(tmp_path) == ['collection.json']
@@ -0,0 +1,65 @@
+import json
+
+import postman_query_log
+from postman_query_log import analyze_log, build_report, query_shape
+
+def log_line(request_id, sql, request='GET /api/courses', time=1.5):
+    context = {'request_id': request_id, 'request': request, 'sql': sql, 'bindings': [], 'time': time}
+    return f'[2026-01-01 00:00:00] local.DEBUG: query {json.dumps(context)} []\n'
+
+def write_log(path, lines):
+    with open(path, 'a', encoding='utf-8') as f:
+        f.writelines(lines)
+
+def test_query_shape_collapses_literals():
+    assert query_shape("select * from users where id = 42 and price > -3.5") == \
+        query_shape("select * from users where id = 7 and price > 10") == \
+        'select * from users where id = ? and price > ?'
+    assert query_shape("select * from `t1` where name = 'O''Brien' or title = \"x\\\"y\"") == \
+        'select * from `t1` where name = ? or title = ?'
+    assert query_shape('select * from lessons where course_id in (1, 2, 3)') == \
+        query_shape('select * from lessons where course_id IN (?)') == \
+        'select * from lessons where course_id in (?+)'
+    assert query_shape('insert into tags (a, b) values (?, ?), (?, ?),\n (?, ?)') == \
+        'insert into tags (a, b) values (?, ?)+'
+
+def test_repeats_are_counted_per_request(tmp_path):
+    log = tmp_path / 'queries.log'
+    lesson = 'select * from lessons where course_id = {}'
+    write_log(log, [
+        log_line('a', 'select * from courses'),
+        'not a query line\n',
+        log_line('a', lesson.format(1)),
+        log_line('b', 'select * from courses'),
+        log_line('a', lesson.format(2)),
+        log_line('b', lesson.format(1)),
+        log_line('a', lesson.format(3)),
+        log_line('c', 'select * from users', request='GET /api/user'),
+    ])
+    endpoints = analyze_log(str(log))
+    courses = endpoints['GET /api/courses']
+    assert courses.requests == 2 and courses.queries == 6 and courses.time_ms == 9.0
+    assert courses.shapes['select * from lessons where course_id = ?'] == \
+        {'count': 4, 'time_ms': 6.0, 'max_per_request': 3, 'requests': 2}
+    rows = build_report(endpoints, min_repeats=3)
+    assert [row['endpoint'] for row in rows] == ['GET /api/courses', 'GET /api/user']
+    assert [shape['shape'] for shape in rows[0]['repeated']] == ['select * from lessons where course_id = ?']
+    assert rows[0]['queries_per_request'] == 3 and rows[1]['repeated'] == []
+
+def test_requests_evicted_from_the_window_are_not_merged(tmp_path, monkeypatch):
+    monkeypatch.setattr(postman_query_log, 'OPEN_REQUESTS', 1)
+    log = tmp_path / 'queries.log'
+    write_log(log, [log_line('a', 'select 1'), log_line('b', 'select 1'), log_line('a', 'select 1')])
+    # 'a' is flushed when 'b' opens, so its late query counts as a separate request
+    assert analyze_log(str(log))['GET /api/courses'].requests == 3
+
+def test_replay_window_starts_at_the_log_offset(tmp_path):
+    log = tmp_path / 'queries.log'
+    write_log(log, [log_line('earlier', 'select * from users', request='GET /api/user')] * 5)
+    start = log.stat().st_size
+    write_log(log, [log_line('replay-1-0', 'select * from courses'),
+                    log_line('other', 'select * from courses'),
+                    log_line('replay-1-0', 'select * from courses')])
+    endpoints = analyze_log(str(log), start, {'replay-1-0': 'Courses/List'})
+    assert sorted(endpoints) == ['Courses/List', 'GET /api/courses']
+    assert endpoints['Courses/List'].queries == 2 and endpoints['GET /api/courses'].queries == 1
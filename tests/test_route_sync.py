@@ -0,0 +1,68 @@
+import copy
+
+from postman_collection import endpoint_key, is_stale, iter_requests
+from postman_mock_server import NOT_FOUND, MockServer, compile_routes
+from postman_route_sync import RouteFileParser, sync_collection
+
+ROUTES = r"""<?php
+use App\Http\Controllers\UserController;
+
+Route::post('/login', [AuthController::class, 'login']);
+Route::middleware('auth:sanctum')->group(function () {
+    Route::prefix('admin')->name('admin.')->group(function () {
+        Route::get('/users/{user}', [UserController::class, 'show'])->name('users.show');
+        Route::apiResource('courses', CourseController::class);
+    });
+    Route::match(['get', 'post'], 'profile', fn () => null);
+});
+"""
+
+def item(name, method, path, **request):
+    segments = path.strip('/').split('/')
+    request.update(method=method, url={'raw': '{{base_url}}/' + '/'.join(segments), 'path': segments})
+    return {'name': name, 'request': request, 'response': [{'name': f'Example Response - {name}', 'code': 200}]}
+
+def collection():
+    return {'item': [
+        {'name': 'Admin', 'item': [item('Get User', 'GET', 'admin/users/:id'),
+                                   item('Old Report', 'GET', 'admin/reports')]},
+        item('Login', 'POST', 'login'),
+    ]}
+
+def test_parser_follows_groups_prefixes_and_resources():
+    routes = {(r['method'], r['uri']): r for r in RouteFileParser(ROUTES).parse()}
+    assert routes[('GET', '/admin/users/{user}')]['middleware'] == ['auth:sanctum']
+    assert routes[('GET', '/admin/users/{user}')]['name'] == 'admin.users.show'
+    assert routes[('POST', '/login')]['action'] == 'AuthController@login'
+    assert {key for key in routes if 'courses' in key[1]} == {
+        ('GET', '/admin/courses'), ('POST', '/admin/courses'), ('GET', '/admin/courses/{id}'),
+        ('PUT', '/admin/courses/{id}'), ('DELETE', '/admin/courses/{id}')}
+    assert ('POST', '/profile') in routes and ('GET', '/profile') in routes
+
+def test_stale_items_keep_their_name():
+    synced = collection()
+    keys = [endpoint_key(path, item) for path, item in iter_requests(synced['item'])]
+    summary = sync_collection(synced, RouteFileParser(ROUTES).parse())
+    assert summary['stale'] == [('GET', '/admin/reports')]
+    items = dict((endpoint_key(path, item), item) for path, item in iter_requests(synced['item']))
+    assert set(keys) <= set(items)
+    report = items['GET Admin/Old Report']
+    assert is_stale(report) and report['name'] == 'Old Report'
+    assert report['response'][0]['name'] == 'Example Response - Old Report'
+    assert not is_stale(items['GET Admin/Get User'])
+    # The route's {user} parameter name is carried over to the item
+    assert items['GET Admin/Get User']['request']['url']['path'] == ['admin', 'users', ':user']
+
+    # Stale items are not served by the mock server
+    trie, _ = compile_routes(iter_requests(synced['item']))
+    mock = MockServer(trie)
+    assert mock.respond('GET', '/admin/reports') is NOT_FOUND
+    assert mock.respond('GET', '/admin/users/1') is not NOT_FOUND
+
+    # A second sync changes nothing; restoring the route revives the item
+    again = copy.deepcopy(synced)
+    assert not any(sync_collection(again, RouteFileParser(ROUTES).parse()).values())
+    revived = sync_collection(again, RouteFileParser(ROUTES + "Route::get('admin/reports', fn () => 1);").parse())
+    assert revived['revived'] == [('GET', '/admin/reports')]
+    report = next(item for _, item in iter_requests(again['item']) if item['name'] == 'Old Report')
+    assert not is_stale(report) and 'variable' not in report
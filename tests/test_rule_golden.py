@@ -0,0 +1,23 @@
+"""
+create_response_for_endpoint against tests/data/rule_responses.json.
+
+The golden file holds the response the original if/elif cascade gave for
+every (name, method, parent folder) of ACE_API_Postman_Collection.json,
+with the parent both as the immediate folder and as the full folder path,
+so a rule that moves, shadows or stops matching shows up as a diff here.
+"""
+import json
+import os
+
+import pytest
+
+from add_postman_responses import create_response_for_endpoint
+
+GOLDEN = os.path.join(os.path.dirname(__file__), 'data', 'rule_responses.json')
+
+with open(GOLDEN, 'r', encoding='utf-8') as f:
+    CASES = json.load(f)
+
+@pytest.mark.parametrize('case', CASES, ids=lambda c: f"{c['method']} {c['parent']}/{c['name']}")
+def test_rule_matches_golden(case):
+    assert create_response_for_endpoint(case['name'], case['method'], case['parent']) == case['response']
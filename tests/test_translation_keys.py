@@ -0,0 +1,83 @@
+import json
+import os
+import stat
+
+from translation_keys import LOCALE_DIRS, analyze, load_locale, prune, scan_source, write_pruned
+
+LOCALE = {'common': {'save': 'حفظ', 'cancel': 'إلغاء'}, 'admin': {'title': 'لوحة'}, 'unused': {'x': 'y'}}
+
+def test_prune_keeps_used_keys_and_their_subtrees():
+    keep = {'common.save', 'admin'}.__contains__
+    assert prune(LOCALE, keep) == {'common': {'save': 'حفظ'}, 'admin': {'title': 'لوحة'}}
+
+def test_write_pruned_replaces_files_in_place(tmp_path):
+    path = tmp_path / LOCALE_DIRS[0] / 'ar.json'
+    path.parent.mkdir(parents=True)
+    path.write_text(json.dumps(LOCALE, ensure_ascii=False), encoding='utf-8')
+    path.chmod(0o664)
+
+    assert write_pruned(str(tmp_path), {'ar': LOCALE}, {'common.save'}, dry_run=True)[0][0] == os.path.join(
+        LOCALE_DIRS[0], 'ar.json')
+    assert json.loads(path.read_text(encoding='utf-8')) == LOCALE
+
+    (_, before, after), = write_pruned(str(tmp_path), {'ar': LOCALE}, {'common.save'})
+    assert json.loads(path.read_text(encoding='utf-8')) == {'common': {'save': 'حفظ'}}
+    assert after == path.stat().st_size < before
+    assert stat.S_IMODE(path.stat().st_mode) == 0o664
+    assert os.listdir(path.parent) == ['ar.json']
+
+SOURCE = '''import faq from "@/locales/en.json";
+
+export default function Page() {
+  const { t } = useLanguage();
+  const tabs = [{ labelKey: "admin.title" }];
+  const questions = faq.faq.items.map((q) => q);
+  // t("common.cancel") in a comment does not count
+  return <p>{t("common.save")} {t(`grades.${grade}`)} {t(name)} {t("common.missing")}</p>;
+}
+'''
+
+def scan(source=SOURCE, known=frozenset({'admin.title', 'common.save'})):
+    usages, dynamic = [], []
+    scan_source(source, 'app/page.tsx', known, usages, dynamic)
+    return usages, dynamic
+
+def test_scan_source_finds_every_kind_of_reference():
+    usages, dynamic = scan()
+    assert [(u.key, u.kind) for u in usages] == [
+        ('common.save', 't'), ('grades', 'prefix'), ('common.missing', 't'), ('admin.title', 'literal'),
+        ('faq.items.map', 'import')]
+    assert dynamic == [('app/page.tsx', SOURCE.index('t(name)'))]
+
+def test_literals_count_only_when_they_name_a_known_key():
+    usages, _ = scan(known=frozenset({'common.save'}))
+    assert 'literal' not in [u.kind for u in usages]
+
+def test_analyze_reports_missing_unused_and_parity():
+    locales = {
+        'ar': {'common': {'save': 'حفظ', 'cancel': 'إلغاء'}, 'admin': {'title': 'لوحة'}, 'faq': {'items': ['س']},
+               'grades': {'a': 'ممتاز'}},
+        'en': {'common': {'save': 'Save', 'cancel': 'Cancel', 'missing': 'Only English'},
+               'admin': {'title': {'short': 'Panel'}}, 'faq': {'items': ['Q']}, 'grades': {'a': 'A'},
+               'extra': 'Unused'},
+    }
+    usages, _ = scan()
+    report = analyze(locales, usages, keep=('common.cancel',))
+    assert {key: sorted(entry['languages']) for key, entry in report['missing'].items()} == {
+        'common.missing': ['ar']}
+    assert report['unused'] == ['extra']
+    # faq.items.map resolves to the locale entry the chain starts with
+    assert 'faq.items' in report['used'] and 'grades' in report['used']
+    assert report['parity'] == [
+        ('admin.title', {'ar': 'text', 'en': 'object'}),
+        ('admin.title.short', {'ar': 'absent', 'en': 'text'}),
+        ('common.missing', {'ar': 'absent', 'en': 'text'}),
+        ('extra', {'ar': 'absent', 'en': 'text'}),
+    ]
+
+def test_load_locale_reports_duplicates(tmp_path):
+    path = tmp_path / 'ar.json'
+    path.write_text('{"common": {"save": "a", "save": "b"}, "top": 1, "top": 2}', encoding='utf-8')
+    data, duplicates = load_locale(str(path))
+    assert data == {'common': {'save': 'b'}, 'top': 2}
+    assert sorted(duplicates) == ['common.save', 'top']
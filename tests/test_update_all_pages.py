@@ -0,0 +1,153 @@
+import json
+import os
+
+import update_all_pages
+from update_all_pages import ReplacementEngine, TreeWatcher, process_files, route_namespaces, update_file
+
+PAGE = '''export default function Page() {
+  return <button>حفظ</button>;
+}
+'''
+
+def test_route_namespaces():
+    namespaces = {'company', 'companyJobs', 'universityStudent'}
+    assert route_namespaces('app/company/jobs/page.tsx', namespaces) == ('companyJobs', 'company')
+    assert route_namespaces('app/university_student/page.tsx', namespaces) == ('universityStudent',)
+    assert route_namespaces('components/Button.tsx', namespaces) == ()
+
+def test_update_file_prefers_the_route_namespace(tmp_path):
+    engine = ReplacementEngine({'حفظ': 'common.save'}, {'حفظ': ['company.save']})
+    for directory, key in (('company', 'company.save'), ('teacher', 'common.save')):
+        page = tmp_path / 'app' / directory / 'page.tsx'
+        page.parent.mkdir(parents=True)
+        page.write_text(PAGE, encoding='utf-8')
+        assert update_file(str(page), engine, base_path=str(tmp_path))
+        assert f'{{t("{key}")}}' in page.read_text(encoding='utf-8')
+        assert not update_file(str(page), engine, base_path=str(tmp_path))
+
+def test_process_files_skips_by_stat_then_by_hash(tmp_path):
+    page = tmp_path / 'app' / 'teacher' / 'page.tsx'
+    page.parent.mkdir(parents=True)
+    page.write_text(PAGE, encoding='utf-8')
+    manifest = {}
+    assert process_files(str(tmp_path), ['app/teacher/page.tsx'], manifest) == {'app/teacher/page.tsx': ('updated', None)}
+    size, mtime_ns, digest, outcome = manifest['app/teacher/page.tsx']
+    assert outcome == 'updated'
+
+    # Same size and mtime: the file is not even opened, so a bogus hash goes unnoticed
+    manifest['app/teacher/page.tsx'] = [size, mtime_ns, 'bogus', 'updated']
+    assert process_files(str(tmp_path), ['app/teacher/page.tsx'], manifest) == {'app/teacher/page.tsx': ('unchanged', None)}
+
+    # A touch changes the mtime only: the content hash still matches and the new stat is recorded
+    manifest['app/teacher/page.tsx'] = [size, mtime_ns, digest, 'updated']
+    os.utime(page, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+    assert process_files(str(tmp_path), ['app/teacher/page.tsx'], manifest) == {'app/teacher/page.tsx': ('unchanged', None)}
+    assert manifest['app/teacher/page.tsx'][:3] == [size, mtime_ns + 10**9, digest]
+
+def test_codemod_version_follows_the_lexer(monkeypatch):
+    version = update_all_pages.codemod_version()
+    monkeypatch.setattr(update_all_pages, 'lexer_version', lambda: '0' * 40)
+    assert update_all_pages.codemod_version() != version
+
+def test_tree_watcher_picks_up_new_files(tmp_path):
+    (tmp_path / 'app' / 'teacher').mkdir(parents=True)
+    (tmp_path / 'app' / 'teacher' / 'page.tsx').write_text(PAGE, encoding='utf-8')
+    watcher = TreeWatcher(str(tmp_path), ['app/**/*.tsx'], ['app/**/node_modules/**'])
+    assert watcher.poll() == []
+
+    company = tmp_path / 'app' / 'company'
+    company.mkdir()
+    (company / 'page.tsx').write_text(PAGE, encoding='utf-8')
+    (company / 'notes.md').write_text('not a page', encoding='utf-8')
+    # Directory mtimes can be coarse: make sure the parent is seen as changed
+    stat = os.stat(tmp_path / 'app')
+    os.utime(tmp_path / 'app', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert watcher.poll() == ['app/company/page.tsx']
+
+    (company / 'jobs').mkdir()
+    (company / 'jobs' / 'page.tsx').write_text(PAGE, encoding='utf-8')
+    stat = os.stat(company)
+    os.utime(company, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert watcher.poll() == ['app/company/jobs/page.tsx']
+    assert watcher.poll() == []
+
+def test_longest_text_wins():
+    engine = ReplacementEngine({'عرض': 'common.view', 'عرض جميع الإشعارات': 'common.showAllNotifications'})
+    content = '''export default function Page() {
+  return <div><a title="عرض">عرض جميع الإشعارات</a><span> عرض </span></div>;
+}
+'''
+    updated = update_all_pages.update_content(content, engine)
+    assert '<a title={t("common.view")}>{t("common.showAllNotifications")}</a>' in updated
+    assert '<span> {t("common.view")} </span>' in updated
+
+PREFILTER_CASES = [
+    PAGE,
+    'export const label = "Save";\n',
+    'import { useLanguage } from "@/hooks/useLanguage";\nconst x = "حفظ";\n',
+    "import { useLanguage } from '@/hooks/useLanguage';\nconst x = 'حفظ';\n",
+    '// تعليق\nexport default 1;\n',
+    'const persian = "ی";\n',
+    'const hebrew = "שלום"; const accents = "éàü";\n',
+    'const edge = "؀ۿ";\n',
+]
+
+def test_prefilter_matches_should_update_file(tmp_path):
+    padding = '// ' + 'x' * 1000 + '\n'
+    for i, content in enumerate(PREFILTER_CASES):
+        for size, prefix in (('small', ''), ('large', padding * (update_all_pages.MMAP_THRESHOLD // len(padding) + 1))):
+            path = tmp_path / f'{size}{i}.tsx'
+            path.write_text(prefix + content, encoding='utf-8')
+            assert (path.stat().st_size >= update_all_pages.MMAP_THRESHOLD) == (size == 'large')
+            assert update_all_pages.may_need_update(str(path)) == update_all_pages.should_update_file(prefix + content), \
+                (size, content)
+
+def test_find_files_prunes_excluded_directories(tmp_path, monkeypatch):
+    for relative in ('app/teacher/page.tsx', 'app/teacher/courses/[id]/page.tsx', 'app/teacher/layout.tsx',
+                     'app/student/page.tsx', 'app/student/node_modules/pkg/page.tsx', 'app/admin/page.tsx',
+                     'components/page.tsx'):
+        (tmp_path / relative).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / relative).write_text(PAGE, encoding='utf-8')
+    scanned = []
+    scandir = os.scandir
+    monkeypatch.setattr(os, 'scandir', lambda path: scanned.append(os.path.relpath(path, tmp_path)) or scandir(path))
+
+    files = update_all_pages.find_files(str(tmp_path), ['app/teacher/**/page.tsx', 'app/student/**/page.tsx'],
+                                        ['**/node_modules/**'])
+    assert files == ['app/student/page.tsx', 'app/teacher/courses/[id]/page.tsx', 'app/teacher/page.tsx']
+    # Walks start at the include prefixes; node_modules, admin and components are never listed
+    assert sorted(scanned) == ['app/student', 'app/teacher', 'app/teacher/courses', 'app/teacher/courses/[id]']
+
+def test_reverse_index_cache_follows_the_locale(tmp_path):
+    locale = tmp_path / 'ar.json'
+    locale.write_text(json.dumps({'common': {'save': 'حفظ', 'html': '<b>حفظ</b>'}}, ensure_ascii=False), encoding='utf-8')
+    index, digest = update_all_pages.load_reverse_index(str(locale))
+    assert index == {'حفظ': ['common.save']}
+    cache = tmp_path / '.ar.json.index.json'
+    assert json.loads(cache.read_text(encoding='utf-8')) == {'locale_sha1': digest, 'index': index}
+
+    # An unchanged locale is served from the cache
+    cache.write_text(json.dumps({'locale_sha1': digest, 'index': {'cached': ['x.y']}}), encoding='utf-8')
+    assert update_all_pages.load_reverse_index(str(locale)) == ({'cached': ['x.y']}, digest)
+
+    locale.write_text(json.dumps({'company': {'save': 'حفظ'}, 'common': {'save': 'حفظ'}}, ensure_ascii=False),
+                      encoding='utf-8')
+    index, new_digest = update_all_pages.load_reverse_index(str(locale))
+    assert new_digest != digest and index == {'حفظ': ['company.save', 'common.save']}
+    assert json.loads(cache.read_text(encoding='utf-8'))['locale_sha1'] == new_digest
+
+def test_key_choice_order():
+    index = {
+        'حفظ': ['teacher.save', 'common.save', 'company.save'],
+        'الوظائف': ['jobs.title', 'common.jobs', 'company.myJobs'],
+        'نشر': ['jobs.publish', 'common.publish'],
+        'مسودة': ['jobs.draft', 'teacher.draft'],
+    }
+    engine = ReplacementEngine({'الوظائف': 'company.myJobs', 'حفظ': 'common.save'}, index)
+    # A namespace from the route beats everything, most specific first
+    assert engine.lookup(('teacher',)) == {'حفظ': 'teacher.save', 'الوظائف': 'company.myJobs',
+                                           'نشر': 'common.publish', 'مسودة': 'teacher.draft'}
+    assert engine.lookup(('companyJobs', 'jobs', 'company'))['الوظائف'] == 'jobs.title'
+    # Then the REPLACEMENTS entry, then a common.* key, then the first key in the locale
+    assert engine.lookup() == {'حفظ': 'common.save', 'الوظائف': 'company.myJobs',
+                               'نشر': 'common.publish', 'مسودة': 'jobs.draft'}